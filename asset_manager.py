@@ -5,6 +5,9 @@ from dataclasses import dataclass
 
 import pygame
 
+from surface_cache import load_groups, save_groups, source_files
+from telemetry import cache_stats
+
 
 _TOWER_ROOT = os.path.abspath(
 	os.path.join(os.path.dirname(__file__), "assets", "TOWER CLASSES FINAL")
@@ -288,6 +291,7 @@ _TOWER_FOLDER_BY_TYPE: dict[str, str] = {
 
 
 _TOWER_CACHE: dict[str, TowerSprites] = {}
+_TOWER_CACHE_STATS = cache_stats("tower")
 
 
 def _empty_dirs() -> dict[str, list[pygame.Surface]]:
@@ -304,6 +308,14 @@ def _ensure_dir_fallbacks(frames_by_dir: dict[str, list[pygame.Surface]]) -> dic
 
 
 def _load_goblin(folder: str) -> TowerSprites:
+	# Equal-split frames are cached on disk (see surface_cache.py).
+	sources = source_files(folder)
+	cached = load_groups("goblin", ("split", 3, 4), sources)
+	if cached is not None:
+		idle = {d: cached.get(f"idle/{d}", []) for d in ("down", "up", "left", "right")}
+		attack = {d: cached.get(f"attack/{d}", []) for d in ("down", "up", "left", "right")}
+		return TowerSprites(idle=idle, attack=attack, projectile=[], supports_directions=True)
+
 	idle = _empty_dirs()
 	attack = _empty_dirs()
 	mapping = {
@@ -327,12 +339,12 @@ def _load_goblin(folder: str) -> TowerSprites:
 			attack[d] = _split_horizontal_equal(attack_img, 4) or [attack_img]
 		else:
 			attack[d] = []
-	return TowerSprites(
-		idle=_ensure_dir_fallbacks(idle),
-		attack=_ensure_dir_fallbacks(attack),
-		projectile=[],
-		supports_directions=True,
-	)
+	idle = _ensure_dir_fallbacks(idle)
+	attack = _ensure_dir_fallbacks(attack)
+	groups = {f"idle/{d}": v for d, v in idle.items()}
+	groups.update({f"attack/{d}": v for d, v in attack.items()})
+	save_groups("goblin", ("split", 3, 4), sources, groups)
+	return TowerSprites(idle=idle, attack=attack, projectile=[], supports_directions=True)
 
 
 def _load_wizard(folder: str) -> TowerSprites:
@@ -355,6 +367,22 @@ def _load_archer(folder: str) -> TowerSprites:
 
 
 def _load_knight(folder: str) -> TowerSprites:
+	# Content-normalized frames are cached on disk (see surface_cache.py).
+	sources = source_files(folder)
+	cached = load_groups("knight", ("content-normalized",), sources)
+	if cached is not None:
+		idle_norm = cached.get("idle", [])
+		attack_norm = cached.get("attack", [])
+	else:
+		idle_norm, attack_norm = _build_knight_frames(folder)
+		save_groups("knight", ("content-normalized",), sources, {"idle": idle_norm, "attack": attack_norm})
+
+	idle = {"down": idle_norm, "up": idle_norm, "left": idle_norm, "right": idle_norm}
+	attack = {"down": attack_norm, "up": attack_norm, "left": attack_norm, "right": attack_norm}
+	return TowerSprites(idle=idle, attack=attack, projectile=[], supports_directions=False)
+
+
+def _build_knight_frames(folder: str) -> tuple[list[pygame.Surface], list[pygame.Surface]]:
 	idle_dir = os.path.join(folder, "war idle")
 	idle_frames = []
 	if os.path.isdir(idle_dir):
@@ -413,10 +441,7 @@ def _load_knight(folder: str) -> TowerSprites:
 
 	idle_norm = _normalize_frames_bottom_center_to(idle_scaled, canvas_w=canvas_w, canvas_h=canvas_h)
 	attack_norm = _normalize_frames_bottom_center_to(attack_scaled, canvas_w=canvas_w, canvas_h=canvas_h)
-
-	idle = {"down": idle_norm, "up": idle_norm, "left": idle_norm, "right": idle_norm}
-	attack = {"down": attack_norm, "up": attack_norm, "left": attack_norm, "right": attack_norm}
-	return TowerSprites(idle=idle, attack=attack, projectile=[], supports_directions=False)
+	return idle_norm, attack_norm
 
 
 def _load_fire_warrior(folder: str) -> TowerSprites:
@@ -492,8 +517,11 @@ def get_tower_sprites(tower_type: str, *, tower_size: int) -> TowerSprites:
 		return TowerSprites(idle=_empty_dirs(), attack=_empty_dirs(), projectile=[], supports_directions=False)
 
 	cache_key = f"{tower_type}@{tower_size}"
-	if cache_key in _TOWER_CACHE:
-		return _TOWER_CACHE[cache_key]
+	sprites = _TOWER_CACHE.get(cache_key)
+	if sprites is not None:
+		_TOWER_CACHE_STATS.hits += 1
+		return sprites
+	_TOWER_CACHE_STATS.misses += 1
 
 	folder = os.path.join(_TOWER_ROOT, folder_name)
 	if not os.path.isdir(folder):
@@ -3,20 +3,10 @@ import pygame
 import math
 from settings import TILE_SIZE, get_pixel_font
 
-def handle_death(enemy, coin_manager, tilemap):
-    if enemy.dead_handled: 
-        return
-    
-    # Only drop coins if the enemy was actually killed (health <= 0)
-    if enemy.health > 0:
-        enemy.dead_handled = True
-        return
-    
-    tx = enemy.tile_x
-    ty = enemy.tile_y
-
+def drop_coins(coin_manager, tx, ty, enemy_type):
+    """Throw the coins a killed enemy drops from tile (tx, ty)."""
     # Determine coin drop based on enemy type
-    if hasattr(enemy, 'enemy_type') and enemy.enemy_type == "boss":
+    if enemy_type == "boss":
         # Boss always drops 5-7 coins worth 10 TL each
         num_coins = random.randint(5, 7)
     else:
@@ -26,7 +16,7 @@ def handle_death(enemy, coin_manager, tilemap):
     # Spawn coins with parabolic animation - each coin gets random value
     for _ in range(num_coins):
         # Randomize value for each coin individually
-        if hasattr(enemy, 'enemy_type') and enemy.enemy_type == "boss":
+        if enemy_type == "boss":
             value = 10  # Boss coins always worth 10
         else:
             value = random.randint(5, 10)  # Regular coins random 5-10
@@ -41,199 +31,231 @@ def handle_death(enemy, coin_manager, tilemap):
         # Add animated coin that will drop to the target position
         coin_manager.add_animated_coin(tx, ty, coin_tx, coin_ty, value)
 
-    enemy.dead_handled = True
+# Particle kinds for CoinParticles
+KIND_COIN = 0  # coin flying in an arc to the tile it lands on
+KIND_TEXT = 1  # "+value" popup drifting upward and fading out
+
+COIN_FLIGHT_DURATION = 0.6  # seconds
+COIN_ARC_HEIGHT = -80  # How high the coin goes (pixels, negative = up)
+TEXT_DURATION = 1.0  # seconds to drift and fade
+TEXT_DRIFT_SPEED = 30  # pixels per second upward
+TEXT_ALPHA_STEPS = 16  # pre-rendered fade levels per value
+
+
+# Pooled particles for flying coins and floating value text.
+# Every particle is one index into a set of parallel lists, so updating is a
+# single pass over plain floats and finished particles are removed by
+# swapping the last particle into their slot (no list.pop(i) shifting).
+class CoinParticles:
+    def __init__(self):
+        self.start_x = []
+        self.start_y = []
+        self.target_x = []
+        self.target_y = []
+        self.elapsed = []
+        self.kind = []
+        self.value = []
+        self.tile = []  # (tx, ty) the coin lands on / text was spawned at
+
+        self._coin_sprite = None
+        self._glyphs = {}  # {value: [Surface per alpha step]}
+
+    def __len__(self):
+        return len(self.kind)
+
+    def count(self, kind):
+        return sum(1 for k in self.kind if k == kind)
+
+    def spawn(self, kind, start_x, start_y, target_x, target_y, value, tile):
+        self.start_x.append(start_x)
+        self.start_y.append(start_y)
+        self.target_x.append(target_x)
+        self.target_y.append(target_y)
+        self.elapsed.append(0.0)
+        self.kind.append(kind)
+        self.value.append(value)
+        self.tile.append(tile)
+
+    def _swap_remove(self, i):
+        last = len(self.kind) - 1
+        for arr in (self.start_x, self.start_y, self.target_x, self.target_y,
+                    self.elapsed, self.kind, self.value, self.tile):
+            arr[i] = arr[last]
+            arr.pop()
 
-# Coin with parabolic animation
-class AnimatedCoin:
-    def __init__(self, start_tx, start_ty, end_tx, end_ty, value):
-        self.start_tx = start_tx
-        self.start_ty = start_ty
-        self.end_tx = end_tx
-        self.end_ty = end_ty
-        self.value = value
-        
-        # Animation parameters
-        self.duration = 0.6  # Duration in seconds
-        self.elapsed = 0.0
-        self.completed = False
-        
-        # Current position
-        self.x = start_tx * TILE_SIZE + TILE_SIZE // 2
-        self.y = start_ty * TILE_SIZE + TILE_SIZE // 2
-        
-        # Target position in pixels
-        self.target_x = end_tx * TILE_SIZE + TILE_SIZE // 2
-        self.target_y = end_ty * TILE_SIZE + TILE_SIZE // 2
-    
     def update(self, dt):
-        if self.completed:
-            return
-        
-        self.elapsed += dt
-        progress = min(1.0, self.elapsed / self.duration)
-        
-        if progress >= 1.0:
-            self.completed = True
-            self.x = self.target_x
-            self.y = self.target_y
-            return
-        
-        # Parabolic trajectory
-        # Horizontal: linear interpolation
-        self.x = self.start_tx * TILE_SIZE + TILE_SIZE // 2
-        self.x += (self.target_x - (self.start_tx * TILE_SIZE + TILE_SIZE // 2)) * progress
-        
-        # Vertical: parabolic (goes up then down)
-        # Peak is at progress = 0.5
-        self.y = self.start_ty * TILE_SIZE + TILE_SIZE // 2
-        vertical_distance = self.target_y - (self.start_ty * TILE_SIZE + TILE_SIZE // 2)
-        
-        # Parabolic formula: creates arc upward then downward
-        arc_height = -80  # How high the coin goes
-        vertical_offset = arc_height * (4 * progress * (1 - progress))
-        
-        self.y += vertical_distance * progress + vertical_offset
-    
-    def draw(self, surface, offset: tuple[int, int] = (0, 0)):
-        GOLD = (255, 215, 0)
-        DARK_GOLD = (184, 134, 11)
-        size = TILE_SIZE // 3
-        ox, oy = offset
-        
-        # Draw coin as circle
-        pygame.draw.circle(surface, GOLD, (int(self.x) + ox, int(self.y) + oy), size // 2)
-        pygame.draw.circle(surface, DARK_GOLD, (int(self.x) + ox, int(self.y) + oy), size // 2, 2)
-        
-        # Draw value text if landed
-        if self.completed:
+        """Advance all particles. Returns [(tx, ty, value)] for coins that landed."""
+        landed = []
+        elapsed = self.elapsed
+        kind = self.kind
+        for i in range(len(elapsed)):
+            elapsed[i] += dt
+
+        # Walk backwards so a swapped-in particle has already been checked.
+        i = len(elapsed) - 1
+        while i >= 0:
+            duration = COIN_FLIGHT_DURATION if kind[i] == KIND_COIN else TEXT_DURATION
+            if elapsed[i] >= duration:
+                if kind[i] == KIND_COIN:
+                    tx, ty = self.tile[i]
+                    landed.append((tx, ty, self.value[i]))
+                self._swap_remove(i)
+            i -= 1
+        return landed
+
+    def _get_coin_sprite(self):
+        if self._coin_sprite is None:
+            size = TILE_SIZE // 3
+            r = size // 2
+            sprite = pygame.Surface((r * 2 + 1, r * 2 + 1), pygame.SRCALPHA)
+            pygame.draw.circle(sprite, (255, 215, 0), (r, r), r)
+            pygame.draw.circle(sprite, (184, 134, 11), (r, r), r, 2)
+            self._coin_sprite = sprite
+        return self._coin_sprite
+
+    def _get_glyph(self, value, alpha_step):
+        steps = self._glyphs.get(value)
+        if steps is None:
             font = get_pixel_font(16)
-            text = font.render(str(self.value), True, GOLD)
-            surface.blit(text, (int(self.x) + ox - 8, int(self.y) + oy - 8))
-
-# Floating text that drifts upward and fades
-class FloatingText:
-    def __init__(self, tx, ty, value):
-        self.x = tx * TILE_SIZE + TILE_SIZE // 2
-        self.y = ty * TILE_SIZE + TILE_SIZE // 2
-        self.value = value
-        
-        # Animation parameters
-        self.duration = 1.0  # seconds to drift and fade
-        self.elapsed = 0.0
-        self.completed = False
-        self.drift_speed = 30  # pixels per second upward
-    
-    def update(self, dt):
-        if self.completed:
-            return
-        
-        self.elapsed += dt
-        if self.elapsed >= self.duration:
-            self.completed = True
-            return
-        
-        # Drift upward
-        self.y -= self.drift_speed * dt
-    
+            base = font.render(str(value), True, (255, 215, 0))  # Gold
+            steps = []
+            for k in range(TEXT_ALPHA_STEPS):
+                glyph = base.copy()
+                glyph.set_alpha(int(255 * (k + 1) / TEXT_ALPHA_STEPS))
+                steps.append(glyph)
+            self._glyphs[value] = steps
+        return steps[alpha_step]
+
     def draw(self, surface, offset: tuple[int, int] = (0, 0)):
-        if self.completed:
+        if not self.kind:
             return
-        
-        # Calculate opacity (fade out)
-        progress = self.elapsed / self.duration
-        alpha = int(255 * (1 - progress))  # Fade from 255 to 0
-        
-        # Create text surface with fade
-        font = get_pixel_font(16)
-        text_surface = font.render(str(self.value), True, (255, 215, 0))  # Gold
-        text_surface.set_alpha(alpha)
-        
         ox, oy = offset
-        # Draw at current position with offset
-        surface.blit(text_surface, (int(self.x) + ox - 8, int(self.y) + oy - 8))
+        coin = self._get_coin_sprite()
+        coin_half = coin.get_width() // 2
+        blits = []
+        for i in range(len(self.kind)):
+            t = self.elapsed[i]
+            if self.kind[i] == KIND_COIN:
+                # Horizontal: linear interpolation. Vertical: linear plus an
+                # arc that peaks at progress = 0.5.
+                p = min(1.0, t / COIN_FLIGHT_DURATION)
+                sx = self.start_x[i]
+                sy = self.start_y[i]
+                x = sx + (self.target_x[i] - sx) * p
+                y = sy + (self.target_y[i] - sy) * p + COIN_ARC_HEIGHT * (4 * p * (1 - p))
+                blits.append((coin, (int(x) + ox - coin_half, int(y) + oy - coin_half)))
+            else:
+                p = min(1.0, t / TEXT_DURATION)
+                alpha_step = min(TEXT_ALPHA_STEPS - 1, int((1.0 - p) * TEXT_ALPHA_STEPS))
+                glyph = self._get_glyph(self.value[i], alpha_step)
+                y = self.start_y[i] - TEXT_DRIFT_SPEED * t
+                blits.append((glyph, (int(self.start_x[i]) + ox - 8, int(y) + oy - 8)))
+        surface.blits(blits, doreturn=False)
+
+
+# A pile of landed coins on a single tile
+class CoinStack:
+    def __init__(self):
+        self.count = 0
+        self.value = 0
+
+    def add(self, value, count=1):
+        self.count += count
+        self.value += value
+
 
 # CoinManager with animation support
 class CoinManager:
     def __init__(self):
-        self.coins = {}  # {(tx, ty): value} - static coins
-        self.animated_coins = []  # List of AnimatedCoin objects
-        self.floating_texts = []  # List of FloatingText objects
-    
+        self.coins = {}  # {(tx, ty): CoinStack} - landed coins, stacked per tile
+        self.particles = CoinParticles()  # flying coins + floating value text
+        self._count_labels = {}  # {count: Surface} - cached "xN" labels for stacks
+
+    def _add_to_stack(self, tx, ty, value, count=1):
+        stack = self.coins.get((tx, ty))
+        if stack is None:
+            stack = CoinStack()
+            self.coins[(tx, ty)] = stack
+        stack.add(value, count)
+
     def add_coin_at_tile(self, tx, ty, value):
-        """Add a static coin at a tile"""
-        if (tx, ty) not in self.coins:
-            self.coins[(tx, ty)] = value
+        """Add a static coin at a tile (stacks with coins already there)"""
+        self._add_to_stack(tx, ty, value)
     
     def add_animated_coin(self, start_tx, start_ty, end_tx, end_ty, value):
         """Add a coin with parabolic animation"""
-        coin = AnimatedCoin(start_tx, start_ty, end_tx, end_ty, value)
-        self.animated_coins.append(coin)
+        half = TILE_SIZE // 2
+        self.particles.spawn(
+            KIND_COIN,
+            start_tx * TILE_SIZE + half,
+            start_ty * TILE_SIZE + half,
+            end_tx * TILE_SIZE + half,
+            end_ty * TILE_SIZE + half,
+            value,
+            (end_tx, end_ty),
+        )
+
+    def add_floating_text(self, tx, ty, value):
+        """Add a value popup that drifts upward and fades"""
+        x = tx * TILE_SIZE + TILE_SIZE // 2
+        y = ty * TILE_SIZE + TILE_SIZE // 2
+        self.particles.spawn(KIND_TEXT, x, y, x, y, value, (tx, ty))
     
     def update(self, dt):
         """Update all animated coins and floating text"""
-        for coin in self.animated_coins:
-            coin.update(dt)
-        
-        # Update floating text
-        for text in self.floating_texts:
-            text.update(dt)
-        
-        # Move completed coins to static coins
-        completed = []
-        for i, coin in enumerate(self.animated_coins):
-            if coin.completed:
-                self.coins[(coin.end_tx, coin.end_ty)] = coin.value
-                completed.append(i)
-        
-        # Remove completed animated coins (in reverse order to maintain indices)
-        for i in reversed(completed):
-            self.animated_coins.pop(i)
-        
-        # Remove completed floating text
-        self.floating_texts = [t for t in self.floating_texts if not t.completed]
+        # Move landed coins onto the stack of the tile they landed on
+        for tx, ty, value in self.particles.update(dt):
+            self._add_to_stack(tx, ty, value)
     
     def collect_at_tile(self, tx, ty):
-        value = self.coins.pop((tx, ty), 0)
-        if value > 0:
-            # Spawn floating text at collection point
-            self.floating_texts.append(FloatingText(tx, ty, value))
-        return value
+        stack = self.coins.pop((tx, ty), None)
+        if stack is None or stack.value <= 0:
+            return 0
+        # Spawn floating text at collection point
+        self.add_floating_text(tx, ty, stack.value)
+        return stack.value
 
     def collect_nearby(self, tx, ty, radius=1):
         """Collect and remove all coins within Chebyshev distance `radius` of (tx,ty).
-        Returns the total value collected."""
-        total = 0
-        # gather keys to remove to avoid modifying dict during iteration
-        to_remove = []
-        for (cx, cy), val in list(self.coins.items()):
-            if max(abs(cx - tx), abs(cy - ty)) <= radius:
-                total += val
-                to_remove.append((cx, cy))
-                # Spawn floating text for each collected coin
-                self.floating_texts.append(FloatingText(cx, cy, val))
-
-        for k in to_remove:
-            self.coins.pop(k, None)
+        Returns the total value collected.
 
+        Only the (2*radius+1)^2 tiles around the player are looked up, so the
+        cost doesn't depend on how many coins are lying around the map."""
+        if not self.coins:
+            return 0
+        total = 0
+        for cy in range(ty - radius, ty + radius + 1):
+            for cx in range(tx - radius, tx + radius + 1):
+                total += self.collect_at_tile(cx, cy)
         return total
+
+    def _get_count_label(self, count):
+        label = self._count_labels.get(count)
+        if label is None:
+            font = get_pixel_font(12)
+            label = font.render(f"x{count}", True, (255, 255, 255))
+            self._count_labels[count] = label
+        return label
     
     def draw(self, surface, offset: tuple[int, int] = (0, 0)):
         GOLD = (255, 215, 0)
+        DARK_GOLD = (184, 134, 11)
         size = TILE_SIZE // 3
         ox, oy = offset
         
-        # Draw static coins
-        for (tx, ty), value in self.coins.items():
+        # Draw static coins: one sprite per tile, a second coin peeks out
+        # behind it when several coins share the tile.
+        for (tx, ty), stack in self.coins.items():
             x = tx * TILE_SIZE + (TILE_SIZE - size) // 2 + ox
             y = ty * TILE_SIZE + (TILE_SIZE - size) // 2 + oy
-            pygame.draw.rect(surface, GOLD, (x, y, size, size))
-            pygame.draw.rect(surface, (184, 134, 11), (x, y, size, size), 1)
+            if stack.count > 1:
+                pygame.draw.rect(surface, DARK_GOLD, (x + 3, y - 3, size, size))
+                pygame.draw.rect(surface, GOLD, (x, y, size, size))
+                pygame.draw.rect(surface, DARK_GOLD, (x, y, size, size), 1)
+                surface.blit(self._get_count_label(stack.count), (x + size, y + size - 4))
+            else:
+                pygame.draw.rect(surface, GOLD, (x, y, size, size))
+                pygame.draw.rect(surface, DARK_GOLD, (x, y, size, size), 1)
         
-        # Draw animated coins
-        for coin in self.animated_coins:
-            coin.draw(surface, offset=offset)
-        
-        # Draw floating text
-        for text in self.floating_texts:
-            text.draw(surface, offset=offset)
-
+        # Draw flying coins and floating text
+        self.particles.draw(surface, offset=offset)
@@ -0,0 +1,73 @@
+"""Compile level files (level.txt / levels/*.json) into the binary .lvl format.
+
+The game prefers `<level>.lvl` over the text/JSON source whenever the .lvl is
+at least as new, so re-run this after editing a level (or just delete the
+stale .lvl).
+
+Usage:
+    python convert_level.py level.txt levels/*.json [--encoding zlib|rle|raw]
+    python convert_level.py levels/castle.json -o build/castle.lvl --name "Castle"
+"""
+import argparse
+import os
+import sys
+
+from level_io import (
+    binary_level_path_for,
+    load_level_from_json,
+    load_level_from_txt,
+    read_level_bin,
+    save_level_to_bin,
+)
+
+
+def _load_source(path: str) -> list[list[int]] | None:
+    missing: list[list[int]] = []
+    if path.lower().endswith(".json"):
+        grid = load_level_from_json(path, fallback=missing, normalize_to_expected=False)
+    else:
+        grid = load_level_from_txt(path, fallback=missing)
+    return None if grid is missing else grid
+
+
+def convert(src: str, dst: str, *, encoding: str = "zlib", name: str | None = None) -> int:
+    """Convert one level. Returns the size of the written file in bytes."""
+    grid = _load_source(src)
+    if grid is None:
+        raise ValueError(f"{src}: not a valid rectangular level")
+    metadata = {"name": (name or os.path.splitext(os.path.basename(src))[0]).encode("utf-8")}
+    save_level_to_bin(dst, grid, encoding=encoding, metadata=metadata)
+
+    # Read it back so a broken file is caught here and not in the game.
+    level = read_level_bin(dst)
+    if level.rows() != grid:
+        raise ValueError(f"{dst}: round-trip mismatch")
+    return os.path.getsize(dst)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Convert level.txt / JSON levels to binary .lvl files.")
+    parser.add_argument("inputs", nargs="+", help="level files to convert")
+    parser.add_argument("-o", "--output", help="output path (only with a single input; default: <input>.lvl)")
+    parser.add_argument("--encoding", choices=("zlib", "rle", "raw"), default="zlib", help="body encoding")
+    parser.add_argument("--name", help="display name stored in the file (default: file stem)")
+    args = parser.parse_args(argv)
+
+    if args.output and len(args.inputs) != 1:
+        parser.error("-o/--output needs exactly one input")
+
+    failed = 0
+    for src in args.inputs:
+        dst = args.output or binary_level_path_for(src)
+        try:
+            size = convert(src, dst, encoding=args.encoding, name=args.name)
+        except (OSError, ValueError) as exc:
+            print(f"Error: {exc}", file=sys.stderr)
+            failed += 1
+            continue
+        print(f"{src} -> {dst} ({size} bytes, {args.encoding})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
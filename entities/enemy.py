@@ -3,11 +3,18 @@ import math
 import pygame
 from settings import TILE_SIZE, RED, GREEN, BLACK
 from render_utils import draw_ellipse_shadow
+from surface_cache import load_groups, save_groups, source_files
+from telemetry import cache_stats
 
 
-# Cache loaded animation frames across all Enemy instances.
+# Cache loaded animation frames across all enemies.
 # Key: (wave_num, enemy_type)
 _ANIM_CACHE: dict[tuple[int, str], dict[str, list[pygame.Surface]]] = {}
+_ANIM_CACHE_STATS = cache_stats("anim")
+
+# Frames scaled to a draw size, shared by every enemy of that (wave, type).
+# Key: (wave_num, enemy_type, size)
+_SCALED_CACHE: dict[tuple[int, str, int], dict[str, list[pygame.Surface]]] = {}
 
 
 def _infer_grid_cell_size(w: int, h: int) -> int:
@@ -336,232 +343,160 @@ def _load_enemy_frames(wave_num: int, enemy_type: str) -> dict[str, list[pygame.
 
     return {"down": [], "up": [], "left": [], "right": []}
 
-class Enemy:
-    def __init__(self, path_points, health, speed, reward, color_grade=0, enemy_type="standard", wave_num: int | None = None):
-        self.path = path_points
-        # Index of the current path point we have reached. Next target is path_index + 1.
-        self.path_index = 0
-        self.enemy_type = enemy_type  # "standard", "fast_weak", "slow_strong", or "boss"
-        self.wave_num = int(wave_num) if wave_num is not None else 1
-
-        # Animation state
-        self.direction = "down"  # up/down/left/right
-        self._anim_timer = 0.0
-        self._anim_frame = 0
-        self._anim_speed = 0.12
-
-        # Continuous position (pixels, at path centers)
-        start_x, start_y = self.path[0]
-        self.pos_x = float(start_x)
-        self.pos_y = float(start_y)
-
-        # Tile position (integers) kept for other systems (e.g., coin drops)
-        self.tile_x = int(self.pos_x // TILE_SIZE)
-        self.tile_y = int(self.pos_y // TILE_SIZE)
-
-        # Movement speed in tiles/second; keep the existing "3x faster" tuning.
-        self.speed = float(speed) * 3.0
-        self.base_speed = self.speed
-
-        self.health = health
-        self.max_health = health
-        self.reward = reward
-        self.finished = False
-        self.dead_handled = False
-        self.killed_by_tower = False
-        self.slow_timer = 0
-        self.stun_timer = 0
-        self.has_been_stunned = False
-
-        # Set color and size based on enemy type
-        if enemy_type == "fast_weak":
-            # Fast weak enemies: yellow/lime color (small circles)
-            self.color = (200, 255, 0)  # Yellow-green
-            self.radius = TILE_SIZE // 5  # Smaller
-        elif enemy_type == "slow_strong":
-            # Slow strong enemies: purple/magenta color (larger squares)
-            self.color = (200, 50, 200)  # Purple
-            self.radius = TILE_SIZE // 2  # Much larger
-        elif enemy_type == "boss":
-            # Boss enemies: golden/orange color (very large)
-            self.color = (255, 165, 0)  # Orange-gold
-            self.radius = TILE_SIZE  # Very large (2x TILE_SIZE diameter)
-        else:
-            # Standard enemies: red
-            self.color = (
-                max(50, RED[0] - color_grade * 30),
-                RED[1],
-                RED[2]
-            )
-            self.radius = TILE_SIZE // 3
-        
-
-        # Rect for collisions
-        size = self.radius * 2
-        self.rect = pygame.Rect(
-            int(self.pos_x) - self.radius,
-            int(self.pos_y) - self.radius,
-            size,
-            size
-        )
-
-        # Load animation frames for this wave/type (cached)
-        key = (self.wave_num, self.enemy_type.lower())
-        if key not in _ANIM_CACHE:
-            _ANIM_CACHE[key] = _load_enemy_frames(self.wave_num, self.enemy_type)
-        # IMPORTANT: don't mutate the global cache with per-enemy scaling.
-        raw = _ANIM_CACHE[key]
-        self._frames_by_dir = {
-            "down": list(raw.get("down", [])),
-            "up": list(raw.get("up", [])),
-            "left": list(raw.get("left", [])),
-            "right": list(raw.get("right", [])),
-        }
-
-        # Pre-scale frames to an appropriate draw size for this enemy.
-        # User request: rats + horse soldiers should be ~4x bigger.
-        if self.enemy_type == "fast_weak":
-            # Make fast-weak clearly smaller than the others.
-            self._sprite_draw_size = int(TILE_SIZE * 2)
-        elif self.enemy_type in ("standard", "slow_strong"):
-            self._sprite_draw_size = int(TILE_SIZE * 4)
-        else:
-            self._sprite_draw_size = max(TILE_SIZE, int(self.radius * 3.0))
-        for d in ("down", "up", "left", "right"):
-            if self._frames_by_dir.get(d):
-                self._frames_by_dir[d] = _scale_frames(self._frames_by_dir[d], self._sprite_draw_size)
-
-    def update(self, dt):
-        if self.finished or self.path_index >= len(self.path) - 1:
-            self.finished = True
-            return
-
-        # Update stun timer
-        if self.stun_timer > 0:
-            self.stun_timer -= dt
-            # Don't move while stunned
-            self.rect.center = (int(self.pos_x), int(self.pos_y))
-            return
-
-        # Update slow timer
-        if self.slow_timer > 0:
-            self.slow_timer -= dt
-            self.speed = self.base_speed * 0.6
-        else:
-            self.speed = self.base_speed
-
-        # Smooth continuous movement along the path.
-        # Convert tiles/sec -> pixels/sec.
-        pixels_per_sec = max(0.0, self.speed) * TILE_SIZE
-        remaining = pixels_per_sec * max(0.0, dt)
-
-        while remaining > 0.0 and self.path_index < len(self.path) - 1:
-            tx, ty = self.path[self.path_index + 1]
-            dx = float(tx) - self.pos_x
-            dy = float(ty) - self.pos_y
-            dist = math.hypot(dx, dy)
-
-            # Update direction based on where we're heading.
-            if abs(dx) > abs(dy):
-                self.direction = "right" if dx > 0 else "left"
-            elif abs(dy) > 0:
-                self.direction = "down" if dy > 0 else "up"
-
-            if dist <= 1e-6:
-                self.path_index += 1
-                continue
-
-            if dist <= remaining:
-                self.pos_x = float(tx)
-                self.pos_y = float(ty)
-                self.path_index += 1
-                remaining -= dist
-            else:
-                step = remaining / dist
-                self.pos_x += dx * step
-                self.pos_y += dy * step
-                remaining = 0.0
-
-        # Update rect and tile coords
-        self.rect.center = (int(self.pos_x), int(self.pos_y))
-        self.tile_x = int(self.pos_x // TILE_SIZE)
-        self.tile_y = int(self.pos_y // TILE_SIZE)
-
-        # Update animation
-        self._anim_timer += dt
-        # Slightly speed up animation for faster enemies
-        speed_factor = max(0.6, min(2.0, self.speed / 3.0))
-        frame_time = max(0.06, self._anim_speed / speed_factor)
-        frames = self._frames_by_dir.get(self.direction, []) if hasattr(self, "_frames_by_dir") else []
-        if frames and self._anim_timer >= frame_time:
-            self._anim_timer = 0.0
-            self._anim_frame = (self._anim_frame + 1) % len(frames)
-
-        if self.health <= 0:
-            self.finished = True
-
-    def draw(self, surface, offset: tuple[int, int] = (0, 0)):
-        ox, oy = offset
-        rect = self.rect.move(ox, oy)
-        drew_sprite = False
-        frames = self._frames_by_dir.get(self.direction, []) if hasattr(self, "_frames_by_dir") else []
-        if frames:
-            frame = frames[self._anim_frame % len(frames)]
-            if frame is not None:
-                dst = frame.get_rect(center=rect.center)
-                # Remove shadows for the standard rats.
-                if self.enemy_type != "standard":
-                    shadow_center = (dst.centerx, dst.bottom - int(dst.height * 0.18))
-                    shadow_size = (int(dst.width * 0.55), max(6, int(dst.height * 0.16)))
-                    draw_ellipse_shadow(surface, center=shadow_center, size=shadow_size, alpha=80, offset=(0, 2))
-                surface.blit(frame, dst)
-                drew_sprite = True
-
-        # Fallback to old shapes if sprite assets are missing.
-        if not drew_sprite:
-            # Ground shadow for shape fallback
-            shadow_center = (rect.centerx, rect.centery + int(self.radius * 0.6))
-            shadow_size = (int(self.radius * 2.1), max(6, int(self.radius * 0.9)))
-            draw_ellipse_shadow(surface, center=shadow_center, size=shadow_size, alpha=70, offset=(0, 0))
-            if self.enemy_type == "fast_weak":
-                pygame.draw.circle(surface, self.color, rect.center, self.radius)
-            elif self.enemy_type == "slow_strong":
-                size = self.radius * 2
-                r2 = pygame.Rect(rect.centerx - self.radius, rect.centery - self.radius, size, size)
-                pygame.draw.rect(surface, self.color, r2)
-            elif self.enemy_type == "boss":
-                size = self.radius * 2
-                r2 = pygame.Rect(rect.centerx - self.radius, rect.centery - self.radius, size, size)
-                pygame.draw.rect(surface, self.color, r2)
+
+def get_enemy_frames(wave_num: int, enemy_type: str) -> dict[str, list[pygame.Surface]]:
+    """Return the raw (unscaled) frames for (wave_num, enemy_type), loading them once."""
+    key = (int(wave_num), enemy_type.lower())
+    frames = _ANIM_CACHE.get(key)
+    if frames is not None:
+        _ANIM_CACHE_STATS.hits += 1
+        return frames
+    _ANIM_CACHE_STATS.misses += 1
+    frames = _ANIM_CACHE[key] = _load_enemy_frames(key[0], key[1])
+    return frames
+
+
+def enemy_sprite_draw_size(enemy_type: str) -> int:
+    """Draw size (px) enemy frames are scaled to for a given enemy type."""
+    # User request: rats + horse soldiers should be ~4x bigger.
+    if enemy_type == "fast_weak":
+        # Make fast-weak clearly smaller than the others.
+        return int(TILE_SIZE * 2)
+    if enemy_type in ("standard", "slow_strong"):
+        return int(TILE_SIZE * 4)
+    if enemy_type == "boss":
+        # Boss radius is TILE_SIZE.
+        return max(TILE_SIZE, int(TILE_SIZE * 3.0))
+    return max(TILE_SIZE, int((TILE_SIZE // 3) * 3.0))
+
+
+def get_scaled_enemy_frames(wave_num: int, enemy_type: str, size: int) -> dict[str, list[pygame.Surface]]:
+    """Return frames for (wave_num, enemy_type) scaled to `size`, scaling them once."""
+    key = (int(wave_num), enemy_type.lower(), int(size))
+    scaled = _SCALED_CACHE.get(key)
+    if scaled is not None:
+        return scaled
+
+    # On-disk cache of the scaled frames (see surface_cache.py).
+    sources = source_files(_pick_wave_root(key[0]))
+    scaled = load_groups("enemy", key, sources)
+    if scaled is not None:
+        _SCALED_CACHE[key] = scaled
+        return scaled
+
+    raw = get_enemy_frames(wave_num, enemy_type)
+    scaled = {}
+    for d in ("down", "up", "left", "right"):
+        frames = raw.get(d, [])
+        scaled[d] = _scale_frames(frames, key[2]) if frames else []
+    save_groups("enemy", key, sources, scaled)
+    _SCALED_CACHE[key] = scaled
+    return scaled
+
+
+def enemy_look(enemy_type: str, color_grade: int = 0) -> tuple[tuple[int, int, int], int]:
+    """(fallback color, collision radius) for an enemy type."""
+    if enemy_type == "fast_weak":
+        # Fast weak enemies: yellow/lime color (small circles)
+        return (200, 255, 0), TILE_SIZE // 5
+    if enemy_type == "slow_strong":
+        # Slow strong enemies: purple/magenta color (larger squares)
+        return (200, 50, 200), TILE_SIZE // 2
+    if enemy_type == "boss":
+        # Boss enemies: golden/orange color (very large, 2x TILE_SIZE diameter)
+        return (255, 165, 0), TILE_SIZE
+    # Standard enemies: red
+    return (max(50, RED[0] - color_grade * 30), RED[1], RED[2]), TILE_SIZE // 3
+
+
+def spawn_enemy(world, path_points, health, speed, reward, color_grade=0, enemy_type="standard", wave_num: int | None = None) -> int:
+    """Add an enemy entity to `world` (see world/ecs.py). Returns its id.
+
+    Enemies walk `path_points` (pixel centers); `speed` is in tiles/second
+    before the game's usual 3x tuning.
+    """
+    wave_num = int(wave_num) if wave_num is not None else 1
+    color, radius = enemy_look(enemy_type, color_grade)
+    start_x, start_y = path_points[0]
+    speed = float(speed) * 3.0
+    # Animation frames for this wave/type, pre-scaled to the enemy's draw
+    # size; the cached dict is shared (read-only) by every enemy like it.
+    frames = get_scaled_enemy_frames(wave_num, enemy_type, enemy_sprite_draw_size(enemy_type))
+    return world.spawn(
+        path=path_points,
+        path_index=0,  # last path point reached; next target is path_index + 1
+        pos_x=float(start_x),
+        pos_y=float(start_y),
+        tile_x=int(start_x // TILE_SIZE),
+        tile_y=int(start_y // TILE_SIZE),
+        speed=speed,
+        base_speed=speed,
+        health=health,
+        max_health=health,
+        reward=reward,
+        enemy_type=enemy_type,  # "standard", "fast_weak", "slow_strong", or "boss"
+        wave_num=wave_num,
+        color=color,
+        radius=radius,
+        finished=False,
+        killed_by_tower=False,
+        slow_timer=0.0,
+        stun_timer=0.0,
+        has_been_stunned=False,
+        direction="down",
+        anim_timer=0.0,
+        anim_frame=0,
+        frames=frames,
+    )
+
+
+def draw_enemy(surface, cx, cy, enemy_type, radius, color, frames, direction, anim_frame, health, max_health, stun_timer):
+    """Draw one enemy centered at screen position (cx, cy)."""
+    drew_sprite = False
+    dir_frames = frames.get(direction)
+    if dir_frames:
+        frame = dir_frames[anim_frame % len(dir_frames)]
+        if frame is not None:
+            dst = frame.get_rect(center=(cx, cy))
+            # Remove shadows for the standard rats.
+            if enemy_type != "standard":
+                shadow_center = (dst.centerx, dst.bottom - int(dst.height * 0.18))
+                shadow_size = (int(dst.width * 0.55), max(6, int(dst.height * 0.16)))
+                draw_ellipse_shadow(surface, center=shadow_center, size=shadow_size, alpha=80, offset=(0, 2))
+            surface.blit(frame, dst)
+            drew_sprite = True
+
+    # Fallback to old shapes if sprite assets are missing.
+    if not drew_sprite:
+        # Ground shadow for shape fallback
+        shadow_center = (cx, cy + int(radius * 0.6))
+        shadow_size = (int(radius * 2.1), max(6, int(radius * 0.9)))
+        draw_ellipse_shadow(surface, center=shadow_center, size=shadow_size, alpha=70, offset=(0, 0))
+        if enemy_type in ("slow_strong", "boss"):
+            size = radius * 2
+            r2 = pygame.Rect(cx - radius, cy - radius, size, size)
+            pygame.draw.rect(surface, color, r2)
+            if enemy_type == "boss":
                 pygame.draw.rect(surface, (255, 255, 0), r2, 3)
-            else:
-                pygame.draw.circle(surface, self.color, rect.center, self.radius)
-
-        # Health bar
-        bar_width = 30
-        if self.enemy_type == "boss":
-            bar_width = 60  # Larger health bar for boss
-        
-        bar_height = 5
-        x = rect.centerx - bar_width // 2
-        y = rect.top - 10
-
-        pygame.draw.rect(surface, BLACK, (x, y, bar_width, bar_height))
-
-        if self.max_health > 0:
-            health_ratio = self.health / self.max_health
-            pygame.draw.rect(
-                surface,
-                GREEN,
-                (x, y, bar_width * health_ratio, bar_height)
-            )
-
-        # Draw stun indicator (stars above enemy)
-        if self.stun_timer > 0:
-            star_size = 6
-            star_y = rect.top - 20
-            # Draw stars indicating stun
-            for i in range(2):
-                star_x = rect.centerx - 10 + i * 20
-                pygame.draw.circle(surface, (255, 255, 100), (star_x, star_y), star_size)
-                pygame.draw.circle(surface, (255, 255, 255), (star_x, star_y), star_size - 2)
+        else:
+            pygame.draw.circle(surface, color, (cx, cy), radius)
+
+    # Health bar
+    bar_width = 60 if enemy_type == "boss" else 30  # Larger health bar for boss
+    bar_height = 5
+    x = cx - bar_width // 2
+    y = cy - radius - 10
+
+    pygame.draw.rect(surface, BLACK, (x, y, bar_width, bar_height))
+    if max_health > 0:
+        health_ratio = health / max_health
+        pygame.draw.rect(surface, GREEN, (x, y, bar_width * health_ratio, bar_height))
+
+    # Draw stun indicator (stars above enemy)
+    if stun_timer > 0:
+        star_size = 6
+        star_y = cy - radius - 20
+        for i in range(2):
+            star_x = cx - 10 + i * 20
+            pygame.draw.circle(surface, (255, 255, 100), (star_x, star_y), star_size)
+            pygame.draw.circle(surface, (255, 255, 255), (star_x, star_y), star_size - 2)
@@ -1,6 +1,6 @@
 import pygame
 import os
-from settings import WHITE, TILES_X, TILES_Y, TILE_SIZE, PLAYER_SPRITE_SCALE
+from settings import WHITE, TILE_SIZE, PLAYER_SPRITE_SCALE
 from entities.entity import Entity
 from inventory import Inventory
 from render_utils import draw_ellipse_shadow
@@ -266,7 +266,7 @@ class Player(Entity):
                 ny = self.tile_y + dy
                 
                 # Check boundaries and blocked tiles
-                if 0 <= nx < TILES_X and 0 <= ny < TILES_Y and not tilemap.is_blocked(nx, ny):
+                if 0 <= nx < tilemap.width and 0 <= ny < tilemap.height and not tilemap.is_blocked(nx, ny):
                     self.set_tile(nx, ny)
                     self._play_footstep()
                     # Collect coins after moving (within 1 tile)
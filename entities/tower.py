@@ -1,20 +1,24 @@
 import os
 import pygame
 from entities.entity import Entity
-from entities.projectile import Projectile
+from entities.projectile import spawn_projectile
 from settings import RED, GREEN, BLUE, TILE_SIZE
 from asset_manager import get_tower_sprites
 from render_utils import draw_ellipse_shadow
+from telemetry import cache_stats
 
 
 _SFX_CACHE: dict[str, pygame.mixer.Sound | None] = {}
+_SFX_CACHE_STATS = cache_stats("sfx")
 
 
 def _get_sfx(filename: str, *, volume: float) -> pygame.mixer.Sound | None:
     """Load a wav from assets/sounds once and reuse it."""
     key = f"{filename}|{volume:.3f}"
     if key in _SFX_CACHE:
+        _SFX_CACHE_STATS.hits += 1
         return _SFX_CACHE[key]
+    _SFX_CACHE_STATS.misses += 1
 
     try:
         if not pygame.mixer.get_init():
@@ -48,6 +52,25 @@ def _play_sfx(filename: str, *, volume: float) -> None:
     except Exception:
         pass
 
+
+def tower_sprite_draw_size(tower_type: str) -> int:
+    """Draw size (px) tower sprites are scaled to for a given tower type."""
+    # Towers render larger than a single tile. Goblin sheets are larger and
+    # look too small if forced into a 64px height.
+    # Also tune a few classes to match their art proportions.
+    if tower_type == "goblin":
+        return int(TILE_SIZE * 3)      # bigger
+    if tower_type == "bloodmage":
+        return int(TILE_SIZE * 3)      # bigger
+    if tower_type == "wizard":
+        return int(TILE_SIZE * 1.5)    # smaller
+    if tower_type == "elf":
+        return int(TILE_SIZE * 1.75)   # a bit smaller
+    if tower_type == "firewarrior":
+        return int(TILE_SIZE * 2.5)    # bigger
+    return int(TILE_SIZE * 2)
+
+
 class Tower(Entity):
     def __init__(self, tile_pos, tower_type):
         super().__init__(tile_pos)
@@ -124,26 +147,18 @@ class Tower(Entity):
         if self.type == "knight":
             # Knight attack should feel fast/snappy.
             self._attack_frame_time = 0.045
-        # Towers render larger than a single tile. Goblin sheets are larger and
-        # look too small if forced into a 64px height.
-        # Also tune a few classes to match their art proportions.
-        if self.type == "goblin":
-            self._sprite_draw_size = int(TILE_SIZE * 3)      # bigger
-        elif self.type == "bloodmage":
-            self._sprite_draw_size = int(TILE_SIZE * 3)      # bigger
-        elif self.type == "wizard":
-            self._sprite_draw_size = int(TILE_SIZE * 1.5)    # smaller
-        elif self.type == "elf":
-            self._sprite_draw_size = int(TILE_SIZE * 1.75)   # a bit smaller
-        elif self.type == "firewarrior":
-            self._sprite_draw_size = int(TILE_SIZE * 2.5)    # bigger
-        else:
-            self._sprite_draw_size = int(TILE_SIZE * 2)
+        self._sprite_draw_size = tower_sprite_draw_size(self.type)
 
         # Lock an idle-facing direction to avoid jittering flips when no target.
         self._path_facing_locked = False
 
-    def update(self, dt, enemies, projectiles, coin_manager=None, tilemap=None):
+    def update(self, dt, world, target, events, tilemap=None):
+        """Advance timers/animation and attack `target` (enemy id or None).
+
+        The target is picked by targeting_system (world/systems.py); melee
+        hits are queued on `events` (world/events.py) and land when the
+        tick's events are resolved.
+        """
         self.timer += dt
         if self.attack_timer > 0:
             self.attack_timer -= dt
@@ -152,11 +167,9 @@ class Tower(Entity):
         # - Only goblin has true directional POV assets.
         # - For other towers, keep a stable "faces the path" direction so sprites
         #   don't flip back/forth as targets move.
-        target = self.find_target(enemies)
-        attacking = self.attack_timer > 0
-        if self.type == "goblin" and target:
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+        if self.type == "goblin" and target is not None:
+            dx = world.get(target, "pos_x") - self.rect.centerx
+            dy = world.get(target, "pos_y") - self.rect.centery
             self.direction = self._pick_direction(dx, dy)
             self._path_facing_locked = False
         elif (not self._path_facing_locked) and tilemap is not None:
@@ -164,8 +177,8 @@ class Tower(Entity):
             self._path_facing_locked = True
         
         if self.timer >= self.fire_delay:
-            if target:
-                self.attack_target(target, projectiles, coin_manager, tilemap)
+            if target is not None:
+                self.attack_target(world, target, events)
                 self.timer = 0.0
 
         # Update animation (idle during cooldown; attack only while attack_timer > 0)
@@ -219,22 +232,7 @@ class Tower(Entity):
             return self.direction
         return self._pick_direction(nx - cx, ny - cy)
 
-    def find_target(self, enemies):
-        best_target = None
-        min_dist = float('inf')
-        
-        for e in enemies:
-            dx = e.rect.centerx - self.rect.centerx
-            dy = e.rect.centery - self.rect.centery
-            dist_sq = dx * dx + dy * dy
-            
-            if dist_sq <= self.range * self.range:
-                if dist_sq < min_dist:
-                    min_dist = dist_sq
-                    best_target = e
-        return best_target
-
-    def attack_target(self, target, projectiles, coin_manager=None, tilemap=None):
+    def attack_target(self, world, target, events):
         melee_types = {'goblin', 'elf', 'knight', 'firewarrior'}
 
         # Decide how long to display attack animation.
@@ -246,8 +244,8 @@ class Tower(Entity):
 
         if self.type in melee_types:
             # Melee towers use instant attack instead of projectile
-            target.health -= self.damage
-            target.killed_by_tower = True
+            # (knight stuns the enemy on its first hit only)
+            events.hit(target, self.damage, self.type, stun=self.stun_duration)
             self.attack_timer = min_show
 
             # Melee hit SFX
@@ -257,25 +255,6 @@ class Tower(Entity):
                 _play_sfx("26_sword_hit_1.wav", volume=0.20)
             elif self.type == 'firewarrior':
                 _play_sfx("10_human_special_atk_1.wav", volume=0.22)
-
-            # Extra boss damage feedback
-            if getattr(target, 'enemy_type', '').lower() == 'boss':
-                _play_sfx("21_orc_damage_3.wav", volume=0.14)
-            
-            # Knight stuns the enemy only on first hit
-            if self.type == 'knight' and not target.has_been_stunned:
-                target.stun_timer = self.stun_duration
-                target.has_been_stunned = True
-            
-            # If enemy dies, handle it
-            if target.health <= 0:
-                target.finished = True
-                if coin_manager and tilemap:
-                    try:
-                        from coins import handle_death
-                        handle_death(target, coin_manager, tilemap)
-                    except Exception:
-                        pass
         else:
             # Other towers use projectiles
             self.attack_timer = min_show
@@ -289,18 +268,15 @@ class Tower(Entity):
                 # Use an electric shot SFX.
                 _play_sfx("Retro Weapon Electric 05.wav", volume=0.20)
 
-            projectiles.append(
-                Projectile(
-                    self.rect.centerx,
-                    self.rect.centery,
-                    target,
-                    damage=self.damage,
-                    slow_duration=self.slow_duration,
-                    projectile_speed=self.projectile_speed,
-                    source_type=self.type,
-                    coin_manager=coin_manager,
-                    tilemap=tilemap
-                )
+            spawn_projectile(
+                world,
+                self.rect.centerx,
+                self.rect.centery,
+                target,
+                damage=self.damage,
+                slow_duration=self.slow_duration,
+                projectile_speed=self.projectile_speed,
+                source_type=self.type,
             )
 
     def draw(self, surface, offset: tuple[int, int] = (0, 0)):
@@ -1,6 +1,6 @@
 import pygame
 from entities.entity import Entity
-from entities.projectile import Projectile
+from entities.projectile import spawn_projectile
 from settings import BLUE, TILE_SIZE
 from asset_manager import get_tower_sprites
 from render_utils import draw_ellipse_shadow
@@ -42,22 +42,21 @@ class Troop(Entity):
         if st == "knight":
             self._attack_frame_time = 0.045
 
-    def update(self, dt, enemies, projectiles, coin_manager=None, tilemap=None):
+    def update(self, dt, world, target, events, tilemap=None):
         self.timer += dt
         if self.attack_timer > 0:
             self.attack_timer -= dt
 
-        target = self.find_target(enemies)
-        if target:
-            dx = target.rect.centerx - self.rect.centerx
-            dy = target.rect.centery - self.rect.centery
+        if target is not None:
+            dx = world.get(target, "pos_x") - self.rect.centerx
+            dy = world.get(target, "pos_y") - self.rect.centery
             self.direction = self._pick_direction(dx, dy)
         elif tilemap is not None:
             self.direction = self._pick_direction_to_path(tilemap)
 
         if self.timer >= self.fire_delay:
-            if target:
-                self.attack_target(target, projectiles, coin_manager, tilemap)
+            if target is not None:
+                self.attack_target(world, target, events)
                 self.timer = 0.0
 
         attacking = self.attack_timer > 0
@@ -116,36 +115,17 @@ class Troop(Entity):
             return self.direction
         return self._pick_direction(nx - cx, ny - cy)
 
-    def find_target(self, enemies):
-        best_target = None
-        min_dist = float('inf')
-        
-        # Simple closest target logic
-        for e in enemies:
-            dx = e.rect.centerx - self.rect.centerx
-            dy = e.rect.centery - self.rect.centery
-            dist_sq = dx * dx + dy * dy
-            
-            if dist_sq <= self.range * self.range:
-                if dist_sq < min_dist:
-                    min_dist = dist_sq
-                    best_target = e
-        return best_target
-
-    def attack_target(self, target, projectiles, coin_manager=None, tilemap=None):
+    def attack_target(self, world, target, events):
         # Default behavior: Shoot Projectile
         self.attack_timer = 0.22
-        projectiles.append(
-            Projectile(
-                self.rect.centerx,
-                self.rect.centery,
-                target,
-                damage=self.damage,
-                slow_duration=self.slow_duration,
-                source_type=self._get_sprite_type(),
-                coin_manager=coin_manager,
-                tilemap=tilemap
-            )
+        spawn_projectile(
+            world,
+            self.rect.centerx,
+            self.rect.centery,
+            target,
+            damage=self.damage,
+            slow_duration=self.slow_duration,
+            source_type=self._get_sprite_type(),
         )
 
     def draw(self, surface, offset: tuple[int, int] = (0, 0)):
@@ -3,24 +3,50 @@ import os
 import os
 import math
 import random
+import time
 from settings import *
 from camera import Camera
 from shop import Shop
 from shopkeeper import Shopkeeper
 from casino import Casino
 from casino_keeper import CasinoKeeper
-from coins import CoinManager, handle_death
+from coins import CoinManager
+from preload import Preloader, WorldPrebuild
+from presenter import Presenter
+from level_index import LevelIndex
+from level_selector import LevelBrowser
+from savegame import (
+    AUTOSAVE_PATH, QUICKSAVE_PATH, SaveError, SaveWriter, capture, check_level, read_save, restore,
+)
+from spectator import SpectatorServer
+from telemetry import Telemetry
 
-from level_io import load_level_from_txt, load_level_from_json
+from level_io import LEVEL_BIN_EXTENSION, load_level
 
+from entities.enemy import enemy_look
 from entities.player import Player
 from entities.troop import Troop
 from entities.castle import Castle
 from world.tilemap import TileMap
+from world.level_cache import derived_path_for
+from world.ecs import World
+from world.endless import EndlessStats
+from world.events import CombatEvents, TickStats
+from world.sim_process import ENEMY_TYPES, SimProcess, apply_tower_states, render_frame
+from world.systems import (
+    ENEMY,
+    PROJECTILE,
+    enemy_count,
+    movement_system,
+    render_system,
+    resolve_events,
+    targeting_system,
+)
 from world.wave_manager import WaveManager
+from world.wave_script import load_wave_script, wave_script_path_for
 
 
-DEFAULT_LEVEL = [
+_BUILTIN_LEVEL = [
     [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
     [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
     [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
@@ -53,15 +79,13 @@ DEFAULT_LEVEL = [
     [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
 ]
 
-# If you used the level editor, it saves to `level.txt`. Load it if present,
-# otherwise fall back to the hardcoded default above.
+# If you used the level editor, it saves to `level.txt`. Load it (at
+# whatever size it was made) if present, otherwise fall back to the
+# hardcoded default above.
 _level_txt_path = os.path.join(os.path.dirname(__file__), "level.txt")
-DEFAULT_LEVEL = load_level_from_txt(
-    _level_txt_path,
-    fallback=DEFAULT_LEVEL,
-    expected_width=TILES_X,
-    expected_height=TILES_Y,
-)
+DEFAULT_LEVEL = load_level(_level_txt_path, fallback=_BUILTIN_LEVEL, fill=TILE_GRASS)
+# The built-in map has no file, so nothing (derived cache, waves) is tied to one.
+_DEFAULT_LEVEL_PATH = None if DEFAULT_LEVEL is _BUILTIN_LEVEL else _level_txt_path
 
 
 def _collect_level_options() -> list[tuple[str, str]]:
@@ -74,8 +98,15 @@ def _collect_level_options() -> list[tuple[str, str]]:
 
     levels_dir = os.path.join(base_dir, "levels")
     try:
-        for name in sorted(os.listdir(levels_dir)):
-            if not name.lower().endswith(".json"):
+        names = sorted(os.listdir(levels_dir))
+        json_stems = {os.path.splitext(n)[0] for n in names if n.lower().endswith(".json")}
+        for name in names:
+            stem, ext = os.path.splitext(name)
+            ext = ext.lower()
+            # A .lvl next to a .json is just its compiled form; list it once.
+            if ext == LEVEL_BIN_EXTENSION and stem in json_stems:
+                continue
+            if ext not in (".json", LEVEL_BIN_EXTENSION) or name.lower().endswith(".waves.json"):
                 continue
             path = os.path.join(levels_dir, name)
             label = os.path.splitext(name)[0]
@@ -86,6 +117,26 @@ def _collect_level_options() -> list[tuple[str, str]]:
     return options
 
 
+# Wait this long after the menu selection changes before building its world,
+# so scrolling through the list doesn't start a build per row.
+WORLD_PREBUILD_DELAY = 0.25
+
+
+# Fast-forward: each frame the simulation (waves, towers, enemies, coins)
+# advances dt * game_speed, split into sub-steps of about one 1x frame so 8x
+# plays out like eight 1x frames. The player, camera and input run once per
+# frame on real time whatever the speed.
+GAME_SPEEDS = (1, 2, 4, 8)
+SIM_STEP = 1 / FPS
+MAX_SIM_SUBSTEPS = 32
+# Smoothing for the per-frame cost averages behind the max-speed estimate.
+PERF_SMOOTHING = 0.1
+
+
+def _release_prebuilt_world(built: dict) -> None:
+    built["tilemap"].release()
+
+
 class Game:
     def __init__(self):
         # Detect display size
@@ -116,7 +167,10 @@ class Game:
         )
         pygame.display.set_caption(TITLE)
 
-        self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        # Frames are drawn into one of two back buffers and scaled/flipped to
+        # the window on a worker thread while the next one is drawn.
+        self.presenter = Presenter((SCREEN_WIDTH, SCREEN_HEIGHT), threaded=PRESENT_IN_THREAD)
+        self.screen = self.presenter.back_buffer
         self.window_size = self.window.get_size()
 
         self.clock = pygame.time.Clock()
@@ -132,7 +186,7 @@ class Game:
         self.announcement_font = get_pixel_font(60)
 
         # App state
-        self.state = "menu"  # menu | playing | paused
+        self.state = "loading"  # loading | menu | playing | paused
 
         # Menu
         self.menu_time = 0.0
@@ -159,14 +213,74 @@ class Game:
         self.pause_button_rect = pygame.Rect(SCREEN_WIDTH - 130, 12, 118, 36)
         self.menu_play_rect = pygame.Rect(SCREEN_WIDTH // 2 - 140, int(SCREEN_HEIGHT * 0.62), 280, 58)
         self.menu_exit_rect = pygame.Rect(SCREEN_WIDTH // 2 - 140, int(SCREEN_HEIGHT * 0.62) + 70, 280, 46)
-        self.menu_levels_rect = pygame.Rect(SCREEN_WIDTH // 2 - 240, int(SCREEN_HEIGHT * 0.25), 480, 260)
+        self.menu_levels_rect = pygame.Rect(SCREEN_WIDTH // 2 - 420, int(SCREEN_HEIGHT * 0.25), 440, 260)
+        self.menu_preview_rect = pygame.Rect(SCREEN_WIDTH // 2 + 40, int(SCREEN_HEIGHT * 0.25), 380, 260)
+
+        # Level details/thumbnails are indexed off the main thread.
+        self.level_index = LevelIndex([path for path, _label in self.level_options])
+        self.level_index.start()
+        self.level_browser = LevelBrowser(
+            self.menu_levels_rect, self.menu_preview_rect, self.level_options, self.level_index
+        )
+        # Fast-forward state and the cost averages used to estimate how fast
+        # this machine can run the simulation before falling behind.
+        self.game_speed = 1
+        self._sim_cost_per_step = 0.0  # seconds of real time per 1x-sized sim step
+        self._draw_cost = 0.0  # seconds per draw()
+
+        # Endless mode (TAB in the menu): waves keep coming past the script,
+        # and the run records peak entity counts / frame budget overruns.
+        self.endless_mode = False
+        self.endless_stats: EndlessStats | None = None
+
+        # Quick save (F5) / resume (F9) and the per-wave autosave. The game
+        # thread only copies state; encoding and writing happen on a worker.
+        self.save_writer = SaveWriter()
+        self.level_path: str | None = None
+        self.last_capture_time = 0.0  # seconds the last snapshot cost this thread
+
+        # Optional child process running waves/combat (world/sim_process.py);
+        # started when a level starts playing.
+        self.sim_in_process = SIM_IN_PROCESS
+        self.sim_process: SimProcess | None = None
+        self._sim_dropped_reported = False
+
+        # Frame-time/entity/cache telemetry and game events, written as JSONL
+        # on a worker thread (telemetry.py).
+        self.telemetry: Telemetry | None = None
+        if TELEMETRY:
+            self.telemetry = Telemetry(settings={
+                "fps": FPS,
+                "sim_in_process": self.sim_in_process,
+                "present_in_thread": PRESENT_IN_THREAD,
+                "screen": [SCREEN_WIDTH, SCREEN_HEIGHT],
+            })
+        self._telemetry_seen = (0, False, False)  # wave, game over, won
+
+        # Live stream of the match for spectator_viewer.py (spectator.py).
+        self.spectator: SpectatorServer | None = None
+        if SPECTATE:
+            self.start_spectator()
+
+        # World for the highlighted level, built while the menu is open.
+        self._world_prebuild: WorldPrebuild | None = None
+        self._world_prebuild_wait = 0.0
+
         self.pause_resume_rect = pygame.Rect(SCREEN_WIDTH // 2 - 160, SCREEN_HEIGHT // 2 - 20, 320, 52)
         self.pause_menu_rect = pygame.Rect(SCREEN_WIDTH // 2 - 160, SCREEN_HEIGHT // 2 + 52, 320, 52)
 
-        # World/gameplay state is initialized now, but gameplay doesn't update until Play.
-        self._init_world(DEFAULT_LEVEL)
+        self.game_over = False
+        self.game_won = False
+        self.game_over_timer = 0.0
+
+        # Decode every sprite sheet/tile/sound up front on a worker thread so
+        # gameplay never loads assets mid-fight. The menu opens when it's done.
+        self.preloader = Preloader()
+        self.preloader.start()
 
-        # Ensure we begin on the menu.
+    def _finish_loading(self) -> None:
+        # World/gameplay state is initialized now, but gameplay doesn't update until Play.
+        self._init_world(DEFAULT_LEVEL, _DEFAULT_LEVEL_PATH)
         self._to_menu(reset_message=False)
 
     def _to_menu(self, *, reset_message: bool = True) -> None:
@@ -181,14 +295,79 @@ class Game:
     def _to_paused(self) -> None:
         self.state = "paused"
 
-    def _init_world(self, level_grid):
-        # World
-        self.tilemap = TileMap(level_grid)
+    @staticmethod
+    def _build_tilemap(level_grid, level_path: str | None) -> TileMap:
+        # Derived map data (decor layout, distance field, path) is cached next
+        # to the level file when there is one.
+        derived_path = derived_path_for(level_path) if level_path and os.path.exists(level_path) else None
+        return TileMap(level_grid, derived_path=derived_path)
+
+    @staticmethod
+    def _build_keepers(tilemap: TileMap) -> tuple[Shopkeeper, CasinoKeeper]:
+        shop_tile = tilemap.get_shop_tile() or (12, 20)
+        casino_tile = tilemap.get_casino_tile() or (14, 20)
+        return (
+            Shopkeeper(tile_pos=shop_tile, tile_size=TILE_SIZE),
+            CasinoKeeper(tile_pos=casino_tile, tile_size=TILE_SIZE),
+        )
+
+    @staticmethod
+    def _prebuild_world(path: str) -> dict:
+        """Worker-thread half of starting a level.
+
+        Parses the level and builds everything that loads files or derives
+        map data: the TileMap (with its visual layers and enemy path), the
+        player and the shop/casino buildings.
+        """
+        grid = load_level(path, fallback=DEFAULT_LEVEL, fill=TILE_GRASS)
+        # The fallback grid mustn't be cached as this level's derived data.
+        tilemap = Game._build_tilemap(grid, None if grid is DEFAULT_LEVEL else path)
+        tilemap.ensure_visual_layers()
+        tilemap.get_path_points()
+        shopkeeper, casino_keeper = Game._build_keepers(tilemap)
+        return {
+            "grid": grid,
+            "tilemap": tilemap,
+            "player": Player(tile_pos=(1, 1)),
+            "shopkeeper": shopkeeper,
+            "casino_keeper": casino_keeper,
+        }
+
+    def _update_world_prebuild(self, dt: float) -> None:
+        if not self.level_options:
+            return
+        path = self.level_options[self.selected_level_index][0]
+        prebuild = self._world_prebuild
+        if prebuild is not None:
+            if prebuild.path == path:
+                return
+            prebuild.discard()
+            self._world_prebuild = None
+            self._world_prebuild_wait = WORLD_PREBUILD_DELAY
+        self._world_prebuild_wait -= dt
+        if self._world_prebuild_wait <= 0:
+            self._world_prebuild = WorldPrebuild(path, self._prebuild_world, _release_prebuilt_world)
+
+    def _init_world(self, level_grid, level_path: str | None = None, *, prebuilt: dict | None = None):
+        # Parts already built by _prebuild_world are used as-is.
+        start = time.perf_counter()
+        prebuilt = prebuilt or {}
+        self.level_path = level_path
+        self._stop_sim_process()
+
+        # World (build the new map before releasing the old one so the shared
+        # tile/decor assets stay loaded across level switches)
+        old_tilemap = getattr(self, "tilemap", None)
+        self.tilemap = prebuilt.get("tilemap") or self._build_tilemap(level_grid, level_path)
+        if old_tilemap is not None:
+            old_tilemap.release()
+        if self.spectator is not None:
+            self._spectate_level()
 
         # Camera
         self.camera_enabled = True
-        world_w = TILES_X * TILE_SIZE
-        world_h = TILES_Y * TILE_SIZE
+        world_w = self.tilemap.width * TILE_SIZE
+        world_h = self.tilemap.height * TILE_SIZE
         self.camera = Camera(
             world_size=(world_w, world_h),
             screen_size=(SCREEN_WIDTH, SCREEN_HEIGHT),
@@ -201,10 +380,16 @@ class Game:
         self._camera_surface = pygame.Surface((vw, vh))
 
         # Entities
-        self.player = Player(tile_pos=(1, 1))
-        self.enemies = []
+        self.player = prebuilt.get("player") or Player(tile_pos=(1, 1))
+        # Enemies and projectiles are entities in an archetype store, updated
+        # by the systems in world/systems.py; towers stay plain objects.
+        self.world = World()
         self.towers = []
-        self.projectiles = []
+        # Combat events queued during a tick and resolved once at its end
+        # (world/events.py); the stats cover the last tick and the whole run.
+        self.combat_events = CombatEvents()
+        self.tick_stats = TickStats()
+        self.run_stats = TickStats()
 
         # Coin system
         self.coin_manager = CoinManager()
@@ -227,10 +412,17 @@ class Game:
         self.game_over_timer = 0.0  # For fade and animation effects
 
         # Wave system
-        self.wave_manager = WaveManager(self.tilemap)
+        # Levels can ship their own waves as `<level>.waves.json`.
+        waves = load_wave_script(wave_script_path_for(level_path), fallback=None) if level_path else None
+        self._end_endless_run()
+        self.wave_manager = WaveManager(self.tilemap, waves, endless=self.endless_mode)
+        self.endless_stats = EndlessStats() if self.endless_mode else None
         self.current_wave = 0
         self.max_waves = self.wave_manager.max_waves
         self.wave_manager.start_wave(self.current_wave + 1)
+        # Build the map's decor/shading layers while the wave-1 announcement
+        # plays; until they're ready the map draws with plain tiles.
+        self.tilemap.prepare_visual_layers_async()
 
         # Game state
         self.game_over = False
@@ -238,15 +430,20 @@ class Game:
         # Tower placement cooldown
         self.placement_cooldown = 0.0
 
+        # Each level starts at normal speed
+        self.game_speed = 1
+
         # Shop system
         self.shop = Shop(SCREEN_WIDTH, SCREEN_HEIGHT)
-        shop_tile = self.tilemap.get_shop_tile() or (12, 20)
-        self.shopkeeper = Shopkeeper(tile_pos=shop_tile, tile_size=TILE_SIZE)
 
         # Casino system
         self.casino = Casino(SCREEN_WIDTH, SCREEN_HEIGHT)
-        casino_tile = self.tilemap.get_casino_tile() or (14, 20)
-        self.casino_keeper = CasinoKeeper(tile_pos=casino_tile, tile_size=TILE_SIZE)
+
+        if "shopkeeper" in prebuilt:
+            self.shopkeeper = prebuilt["shopkeeper"]
+            self.casino_keeper = prebuilt["casino_keeper"]
+        else:
+            self.shopkeeper, self.casino_keeper = self._build_keepers(self.tilemap)
 
         # Startup message - will be activated after first wave announcement
         self.startup_message_timer = 0.0
@@ -256,6 +453,14 @@ class Game:
         # Damage flash animation
         self.damage_flash_timer = 0.0
 
+        if self.telemetry is not None:
+            self.telemetry.event(
+                "level_load", level=os.path.basename(level_path or ""), prebuilt=bool(prebuilt),
+                ms=round((time.perf_counter() - start) * 1000, 3), width=self.tilemap.width,
+                height=self.tilemap.height,
+            )
+            self._telemetry_seen = (0, False, False)
+
     def _load_selected_level_and_play(self) -> None:
         if not self.level_options:
             self.menu_message = "No levels found."
@@ -266,30 +471,34 @@ class Game:
         base_dir = os.path.dirname(__file__)
         fallback = DEFAULT_LEVEL
 
-        # Load
-        if path.lower().endswith(".json"):
-            grid = load_level_from_json(
-                path,
-                fallback=fallback,
-                expected_width=TILES_X,
-                expected_height=TILES_Y,
-                normalize_to_expected=True,
-                fill=TILE_GRASS,
-            )
-        else:
-            grid = load_level_from_txt(
-                path,
-                fallback=fallback,
-                expected_width=TILES_X,
-                expected_height=TILES_Y,
-            )
-
-        # If loading failed, show a brief message.
-        if grid is fallback and path != os.path.join(base_dir, "level.txt"):
-            self.menu_message = "Invalid level file; loaded default."
-            self.menu_message_timer = 2.0
+        # Use the world built in the background while this level was
+        # highlighted (waiting for it if it's still going), else build now.
+        prebuild, self._world_prebuild = self._world_prebuild, None
+        built = None
+        if prebuild is not None:
+            if prebuild.path == path:
+                built = prebuild.take()
+            else:
+                prebuild.discard()
 
-        self._init_world(grid)
+        # Levels may be any rectangular size (campaign maps are much larger
+        # than one screen); the camera and TileMap adapt to the grid.
+        if built is not None:
+            grid = built["grid"]
+        else:
+            grid = load_level(path, fallback=fallback, fill=TILE_GRASS)
+
+        # If loading failed, show a brief message. The default grid plays
+        # without a level path, so nothing (derived cache, waves, saves) is
+        # tied to the broken file.
+        level_path = path
+        if grid is fallback:
+            level_path = None
+            if path != os.path.join(base_dir, "level.txt"):
+                self.menu_message = "Invalid level file; loaded default."
+                self.menu_message_timer = 2.0
+
+        self._init_world(grid, level_path, prebuilt=built)
         self._to_playing()
 
     def _window_to_logical(self, pos: tuple[int, int]) -> tuple[int, int] | None:
@@ -363,6 +572,7 @@ class Game:
                 self.running = False
 
             elif event.type == pygame.VIDEORESIZE:
+                self.presenter.wait_idle()
                 self.window = pygame.display.set_mode(
                     (event.w, event.h),
                     pygame.RESIZABLE
@@ -373,6 +583,7 @@ class Game:
                 # Global keybinds
                 # F11 or F for fullscreen toggle
                 if event.key == pygame.K_F11 or event.key == pygame.K_f:
+                    self.presenter.wait_idle()
                     self.fullscreen = not self.fullscreen
                     if self.fullscreen:
                         self.window = pygame.display.set_mode(
@@ -405,18 +616,38 @@ class Game:
                     import settings
                     settings.SHOW_GRID = not settings.SHOW_GRID
 
+                # Loading state
+                if self.state == "loading":
+                    if event.key == pygame.K_ESCAPE:
+                        self.running = False
+                    continue
+
                 # Menu state
                 if self.state == "menu":
                     if event.key == pygame.K_ESCAPE:
                         self.running = False
                     elif event.key in (pygame.K_RETURN, pygame.K_KP_ENTER, pygame.K_SPACE):
                         self._load_selected_level_and_play()
+                    elif event.key == pygame.K_TAB:
+                        self.endless_mode = not self.endless_mode
+                    elif event.key == pygame.K_F9:
+                        self.resume_game()
                     elif event.key == pygame.K_UP:
                         if self.level_options:
                             self.selected_level_index = (self.selected_level_index - 1) % len(self.level_options)
+                            self.level_browser.ensure_visible(self.selected_level_index)
                     elif event.key == pygame.K_DOWN:
                         if self.level_options:
                             self.selected_level_index = (self.selected_level_index + 1) % len(self.level_options)
+                            self.level_browser.ensure_visible(self.selected_level_index)
+                    elif event.key in (pygame.K_PAGEUP, pygame.K_PAGEDOWN):
+                        if self.level_options:
+                            step = self.level_browser.visible_rows
+                            if event.key == pygame.K_PAGEUP:
+                                step = -step
+                            last = len(self.level_options) - 1
+                            self.selected_level_index = max(0, min(last, self.selected_level_index + step))
+                            self.level_browser.ensure_visible(self.selected_level_index)
                     continue
 
                 # Paused state
@@ -430,6 +661,17 @@ class Game:
                     self._to_paused()
                     continue
 
+                # F5 quick save, F9 back to the newest save
+                if event.key == pygame.K_F5:
+                    self.save_game(QUICKSAVE_PATH)
+                elif event.key == pygame.K_F9:
+                    self.resume_game()
+                    continue
+
+                # TAB cycles fast-forward (1x / 2x / 4x / 8x)
+                if event.key == pygame.K_TAB:
+                    self._cycle_game_speed()
+
                 # C key toggles camera effects (follow/zoom/shake)
                 if event.key == pygame.K_c:
                     self.camera_enabled = not self.camera_enabled
@@ -451,7 +693,14 @@ class Game:
                         slot_num = event.key - pygame.K_1 + 1
                         self.player.inventory.select_slot(slot_num)
 
+            elif event.type == pygame.MOUSEWHEEL:
+                if self.state == "menu":
+                    self.level_browser.scroll_by(-event.y)
+
             elif event.type == pygame.MOUSEBUTTONDOWN:
+                if self.state == "loading":
+                    continue
+
                 # Menu clicks
                 if self.state == "menu":
                     lpos = self._window_to_logical(event.pos)
@@ -467,15 +716,9 @@ class Game:
                         self.running = False
                         continue
 
-                    if self.menu_levels_rect.collidepoint(lx, ly):
-                        # Pick a row based on click position
-                        item_h = 30
-                        padding_top = 10
-                        local_y = ly - self.menu_levels_rect.y - padding_top
-                        if local_y >= 0:
-                            idx = local_y // item_h
-                            if 0 <= idx < len(self.level_options):
-                                self.selected_level_index = int(idx)
+                    row = self.level_browser.row_at((lx, ly))
+                    if row is not None:
+                        self.selected_level_index = row
                     continue
 
                 # Paused clicks
@@ -507,9 +750,16 @@ class Game:
     # Update
     # -----------------------------
     def update(self, dt):
+        if self.state == "loading":
+            self.menu_time += dt
+            if self.preloader.done:
+                self._finish_loading()
+            return
+
         # Menu animations only
         if self.state == "menu":
             self.menu_time += dt
+            self._update_world_prebuild(dt)
             if self.menu_message_timer > 0:
                 self.menu_message_timer -= dt
                 if self.menu_message_timer <= 0:
@@ -555,58 +805,71 @@ class Game:
             self.casino.update(dt, self.player)
             return
 
-        # Pause game during wave announcements
-        if self.wave_manager.show_announcement:
-            self.wave_manager.update(dt, self.enemies)
-            return
+        if self.sim_in_process and self.sim_process is None:
+            self._start_sim_process()
+
+        # The player, camera and tower placement run on real time; waves
+        # are paused for the player during announcements.
+        if not self.wave_manager.show_announcement:
+            self._update_player(dt)
+
+        # Advance the simulation in sub-steps (see GAME_SPEEDS).
+        game_dt = dt * self.game_speed
+        steps = min(MAX_SIM_SUBSTEPS, max(1, round(game_dt / SIM_STEP)))
+        step_dt = game_dt / steps
+        start = time.perf_counter()
+        for _ in range(steps):
+            self._step_playing(step_dt)
+            if self.game_over or self.game_won or self.state != "playing":
+                break
+        if self.sim_process is not None:
+            self._sync_sim_frame()
+        else:
+            self._record_sim_cost((time.perf_counter() - start) / steps)
+        if self.spectator is not None:
+            self.spectator.publish(self)
 
+    def _update_player(self, dt):
+        """Player, camera, contact damage and tower placement (once per frame, real dt)."""
         self.player.update(dt, self.tilemap, self.coin_manager, self)
 
         # Camera follow
         if self.camera_enabled:
             self.camera.update(dt, target_pos=self.player.rect.center)
         
-        # Update animated coins
-        self.coin_manager.update(dt)
-        
         # Check collision with enemies for damage
-        for enemy in self.enemies:
-            dx = self.player.rect.centerx - enemy.rect.centerx
-            dy = self.player.rect.centery - enemy.rect.centery
-            dist = (dx*dx + dy*dy) ** 0.5
-            
-            # If player collides with enemy (within combined radius)
-            if dist < (self.player.radius + enemy.radius + 10):
-                if self.player.damage_cooldown <= 0:
-                    # Calculate damage based on wave and enemy strength
-                    base_damage = 5 + (self.wave_manager.current_wave - 1) * 3
-                    
-                    # Enemy type multipliers
-                    if enemy.enemy_type == "boss":
-                        damage = base_damage * 3
-                    elif enemy.enemy_type == "slow_strong":
-                        damage = base_damage * 2
-                    elif enemy.enemy_type == "fast_weak":
-                        damage = base_damage * 0.75
-                    else:
-                        damage = base_damage
-                    
-                    self.player.health -= damage
-                    self.player.damage_cooldown = 0.5
-                    self.damage_flash_timer = 0.3  # Flash for 0.3 seconds
+        px, py = self.player.rect.center
+        for enemy_type in self._enemies_touching(px, py, self.player.radius + 10):
+            if self.player.damage_cooldown <= 0:
+                # Calculate damage based on wave and enemy strength
+                base_damage = 5 + (self.wave_manager.current_wave - 1) * 3
+                
+                # Enemy type multipliers
+                if enemy_type == "boss":
+                    damage = base_damage * 3
+                elif enemy_type == "slow_strong":
+                    damage = base_damage * 2
+                elif enemy_type == "fast_weak":
+                    damage = base_damage * 0.75
+                else:
+                    damage = base_damage
+                
+                self.player.health -= damage
+                self.player.damage_cooldown = 0.5
+                self.damage_flash_timer = 0.3  # Flash for 0.3 seconds
+
+                if self.camera_enabled:
+                    # Mild hit shake
+                    self.camera.add_shake(0.22)
+                
+                # Game over if player health reaches 0
+                if self.player.health <= 0:
+                    self.game_over = True
 
                     if self.camera_enabled:
-                        # Mild hit shake
-                        self.camera.add_shake(0.22)
-                    
-                    # Game over if player health reaches 0
-                    if self.player.health <= 0:
-                        self.game_over = True
-
-                        if self.camera_enabled:
-                            # Slightly stronger death shake
-                            self.camera.add_shake(0.55)
-        
+                        # Slightly stronger death shake
+                        self.camera.add_shake(0.55)
+    
         # Update damage cooldown
         if self.player.damage_cooldown > 0:
             self.player.damage_cooldown -= dt
@@ -629,6 +892,8 @@ class Game:
                     if not self.tilemap.is_blocked(tx, ty) and not self.tilemap.is_path(tx, ty):
                         from entities.tower import Tower
                         self.towers.append(Tower((tx, ty), selected_tower))
+                        if self.sim_process is not None:
+                            self.sim_process.place_tower(tx, ty, selected_tower)
                         # Placement SFX ("troop" placement in UX)
                         try:
                             if pygame.mixer.get_init():
@@ -649,51 +914,50 @@ class Game:
                         if self.player.inventory.get_selected_tower() is None:
                             self.player.inventory.selected_slot = None
 
-        # Enemies
-        self.wave_manager.update(dt, self.enemies)
-        
-        # Check if wave is complete (all enemies dead/reached castle) and start next
-        if self.wave_manager.check_wave_complete(self.enemies):
-            if self.wave_manager.current_wave < self.wave_manager.max_waves:
-                self.wave_manager.start_wave(self.wave_manager.current_wave + 1)
+    def _step_playing(self, dt):
+        """One simulation step of the playing state."""
+        # Pause game during wave announcements
+        if self.wave_manager.show_announcement:
+            if self.sim_process is not None:
+                self.sim_process.step(dt)
             else:
-                # All waves completed - victory!
-                self.game_won = True
-                self.game_over_timer = 0.0
-        
-        for enemy in self.enemies:
-            enemy.update(dt)
+                self.wave_manager.update(dt, self.world)
+            return
 
-        # Towers
-        for tower in self.towers:
-            tower.update(dt, self.enemies, self.projectiles, self.coin_manager, self.tilemap)
-
-        # Projectiles
-        for projectile in self.projectiles:
-            projectile.update(dt)
-
-        # Handle enemies that reached the castle
-        for enemy in self.enemies:
-            if enemy.finished and enemy.health > 0:
-                # enemy reached the castle
-                # Boss enemies instantly lose the game
-                if enemy.enemy_type == "boss":
-                    self.game_over = True
-                else:
-                    self.castle_hp -= 1
+        # Update animated coins
+        self.coin_manager.update(dt)
 
-        # Cleanup
-        self.projectiles = [p for p in self.projectiles if p.alive]
-        
-        # Process dead enemies and spawn coins
-        alive_enemies = []
-        for e in self.enemies:
-            if not e.finished and e.health > 0:
-                alive_enemies.append(e)
-            else:
-                # Enemy died, drop coins
-                handle_death(e, self.coin_manager, self.tilemap)
-        self.enemies = alive_enemies
+        if self.sim_process is not None:
+            # Waves and combat run in the child; fold in what it has
+            # finished so far (world/sim_process.py).
+            self.sim_process.step(dt)
+            self.tick_stats = self._collect_sim_results()
+        else:
+            # Enemies
+            self.wave_manager.update(dt, self.world)
+
+            # Check if wave is complete (all enemies dead/reached castle) and start next
+            if self.wave_manager.check_wave_complete(self.world):
+                if self.wave_manager.has_next_wave():
+                    self.wave_manager.start_wave(self.wave_manager.current_wave + 1)
+                    self.save_game(AUTOSAVE_PATH)
+                else:
+                    # All waves completed - victory!
+                    self.game_won = True
+                    self.game_over_timer = 0.0
+
+            # Enemies/projectiles move and towers attack, queueing combat events;
+            # then the tick's damage, kills, coin drops and leaks are resolved
+            # in one batch (see world/systems.py).
+            movement_system(self.world, dt, self.combat_events)
+            targeting_system(self.world, self.towers, dt, self.combat_events, self.tilemap)
+            self.tick_stats = resolve_events(self.world, self.combat_events, self.coin_manager)
+        self.run_stats.add(self.tick_stats)
+
+        # Enemies that reached the castle; a boss instantly loses the game
+        self.castle_hp -= self.tick_stats.leaks
+        if self.tick_stats.boss_leaks:
+            self.game_over = True
 
         # Check game over
         if self.castle_hp <= 0:
@@ -712,6 +976,250 @@ class Game:
                 except Exception:
                     pass
 
+    def _enemies_touching(self, x: float, y: float, reach: float):
+        """Type of every enemy whose radius + `reach` covers (x, y)."""
+        if self.sim_process is not None:
+            for ex, ey, _health, _max_health, _stun, kind, *_rest in self.sim_process.frame.enemies:
+                enemy_type = ENEMY_TYPES[kind]
+                dx = x - int(ex)
+                dy = y - int(ey)
+                limit = enemy_look(enemy_type)[1] + reach
+                if dx * dx + dy * dy < limit * limit:
+                    yield enemy_type
+            return
+        for arch in self.world.query(*ENEMY):
+            c = arch.columns
+            pos_x = c["pos_x"]
+            pos_y = c["pos_y"]
+            radius = c["radius"]
+            for i in range(len(arch)):
+                dx = x - int(pos_x[i])
+                dy = y - int(pos_y[i])
+                limit = radius[i] + reach
+                if dx * dx + dy * dy < limit * limit:
+                    yield c["enemy_type"][i]
+
+    def _start_sim_process(self) -> None:
+        tiles = [list(row) for row in self.tilemap.tiles]
+        self.sim_process = SimProcess(tiles, self.level_path, self.wave_manager.waves, self.endless_mode)
+        self._sim_dropped_reported = False
+
+    def _stop_sim_process(self) -> None:
+        sim, self.sim_process = getattr(self, "sim_process", None), None
+        if sim is not None:
+            sim.close()
+
+    def _collect_sim_results(self) -> TickStats:
+        """One TickStats for everything the simulation process reported."""
+        total = TickStats()
+        for stats, drops, wave, won in self.sim_process.results():
+            total.add(stats)
+            for drop in drops:
+                self.coin_manager.add_animated_coin(*drop)
+            if wave != self.wave_manager.current_wave:
+                self.wave_manager.start_wave(wave)
+            if won and not self.game_won:
+                self.game_won = True
+                self.game_over_timer = 0.0
+        return total
+
+    def _sync_sim_frame(self) -> None:
+        """Pick up the child's latest render state (once per frame)."""
+        if not self.sim_process.alive:
+            # The match's enemies lived in the child, so it can't carry on
+            # here; later matches simulate in this process.
+            self._stop_sim_process()
+            self.sim_in_process = False
+            self._to_menu(reset_message=False)
+            self._save_message("The simulation process stopped; simulating in-game from now on.")
+            return
+        frame = self.sim_process.read_frame()
+        if frame.dropped and not self._sim_dropped_reported:
+            self._sim_dropped_reported = True
+            print(f"Simulation frame full: {frame.dropped} enemies/projectiles not drawn")
+        apply_tower_states(frame, self.towers)
+        wave_manager = self.wave_manager
+        if frame.wave == wave_manager.current_wave:
+            wave_manager.show_announcement = frame.announcing
+            wave_manager.announcement_timer = frame.announcement_timer
+            wave_manager.spawning = frame.spawning
+        if frame.step_cost > 0:
+            self._record_sim_cost(frame.step_cost)
+
+    def start_spectator(self, port: int = SPECTATOR_PORT) -> bool:
+        """Stream matches to spectator viewers on localhost."""
+        try:
+            self.spectator = SpectatorServer(SPECTATOR_HOST, port).start()
+        except OSError as exc:
+            print(f"Spectator stream unavailable: {exc}")
+            return False
+        print(f"Spectators: python spectator_viewer.py --port {self.spectator.port}")
+        if getattr(self, "tilemap", None) is not None:
+            self._spectate_level()
+        return True
+
+    def _spectate_level(self) -> None:
+        tilemap = self.tilemap
+        self.spectator.set_level(tilemap.width, tilemap.height, tilemap.grid.ids)
+
+    def _record_sim_cost(self, per_step: float) -> None:
+        if self._sim_cost_per_step <= 0.0:
+            self._sim_cost_per_step = per_step
+        else:
+            self._sim_cost_per_step += (per_step - self._sim_cost_per_step) * PERF_SMOOTHING
+
+    def _record_frame(self, frame_time: float, draw_cost: float) -> None:
+        """Per-frame timing for the max-speed estimate and endless stats."""
+        if self.state != "playing":
+            return
+        self._draw_cost += (draw_cost - self._draw_cost) * PERF_SMOOTHING
+        if self.endless_stats is None:
+            return
+        if self.game_over or self.game_won:
+            self._end_endless_run()
+            return
+        self.endless_stats.record(self.wave_manager.current_wave, frame_time, self._entity_counts())
+
+    def _entity_counts(self) -> dict[str, int]:
+        if self.state in ("loading", "menu"):
+            return {}
+        frame = self.sim_process.frame if self.sim_process is not None else None
+        counts = {
+            "enemies": len(frame.enemies) if frame else enemy_count(self.world),
+            "projectiles": len(frame.projectiles) if frame else self.world.count(*PROJECTILE),
+            "towers": len(self.towers),
+            "coin_stacks": len(self.coin_manager.coins),
+        }
+        counts["total"] = sum(counts.values())
+        if frame and frame.dropped:
+            counts["undrawn"] = frame.dropped  # over the shared-memory caps (world/sim_process.py)
+        return counts
+
+    def _record_telemetry(self, frame_time: float) -> None:
+        """Per-frame telemetry, plus events for wave starts and the end of a match."""
+        telemetry = self.telemetry
+        if self.state in ("playing", "paused"):
+            seen = (self.wave_manager.current_wave, self.game_over, self.game_won)
+            if seen != self._telemetry_seen:
+                if seen[0] != self._telemetry_seen[0]:
+                    telemetry.event("wave_start", wave=seen[0], endless=self.endless_mode)
+                if seen[1] and not self._telemetry_seen[1]:
+                    telemetry.event("game_over", wave=seen[0])
+                if seen[2] and not self._telemetry_seen[2]:
+                    telemetry.event("victory", wave=seen[0])
+                self._telemetry_seen = seen
+        telemetry.frame(frame_time, self.state, self._entity_counts)
+
+    def _end_endless_run(self) -> None:
+        """Write the endless run's stats (.cache/endless_stats.json)."""
+        stats = self.endless_stats
+        if stats is None:
+            return
+        self.endless_stats = None
+        stats.present = self.presenter.stats.summary()
+        stats.save()
+        summary = stats.summary()
+        print(
+            f"Endless run: reached wave {summary['last_wave']}, "
+            f"peak {summary['peaks'].get('total', 0)} entities, "
+            f"first wave over {summary['frame_budget_ms']} ms: {summary['first_slow_wave']}"
+        )
+
+    def save_game(self, path: str = QUICKSAVE_PATH) -> None:
+        """Snapshot the running game and write it to `path` in the background."""
+        if self.game_over or self.game_won:
+            return
+        if self.sim_in_process:
+            self._save_message("Saving isn't available with the simulation process.")
+            return
+        start = time.perf_counter()
+        snapshot = capture(self)
+        self.last_capture_time = time.perf_counter() - start
+        self.save_writer.request(path, snapshot)
+        if self.telemetry is not None:
+            self.telemetry.event(
+                "save", path=os.path.basename(path), capture_ms=round(self.last_capture_time * 1000, 3)
+            )
+
+    def resume_game(self, path: str | None = None) -> bool:
+        """Load `path` (default: the newest of the quick save and autosave)."""
+        if self.sim_in_process:
+            self._save_message("Resuming isn't available with the simulation process.")
+            return False
+        self.save_writer.wait_idle()
+        if path is None:
+            saves = [p for p in (QUICKSAVE_PATH, AUTOSAVE_PATH) if os.path.exists(p)]
+            if not saves:
+                self._save_message("No saved game.")
+                return False
+            path = max(saves, key=os.path.getmtime)
+        try:
+            save = read_save(path)
+            level_path = save["level_path"]
+            if not level_path or not os.path.exists(level_path):
+                raise SaveError(f"level not found: {level_path}")
+            grid = load_level(level_path, fallback=DEFAULT_LEVEL, fill=TILE_GRASS)
+            if grid is DEFAULT_LEVEL:
+                raise SaveError(f"level can't be loaded: {level_path}")
+            check_level(save, grid)
+        except SaveError as exc:
+            # Nothing has been torn down yet: the current match carries on.
+            self._save_message(f"Can't resume: {exc}")
+            return False
+        self.endless_mode = save["endless"]
+        self._init_world(grid, level_path)
+        try:
+            restore(self, save)
+        except SaveError as exc:
+            # The match in progress is already gone; don't leave a half-restored one.
+            self._to_menu(reset_message=False)
+            self._save_message(f"Can't resume: {exc}")
+            return False
+
+        # The level intro only plays on a fresh start.
+        self.startup_message_active = self.wave_manager.current_wave > 1
+        for i, (option_path, _label) in enumerate(self.level_options):
+            if os.path.abspath(option_path) == os.path.abspath(level_path):
+                self.selected_level_index = i
+        self._to_playing()
+        return True
+
+    def _report_saves(self, *, quitting: bool = False) -> None:
+        """Tell the player how finished background saves went (autosaves only if they failed)."""
+        for path, error in self.save_writer.results():
+            if error:
+                text = f"Save failed: {error}"
+            elif path == QUICKSAVE_PATH:
+                text = "Game saved."
+            else:
+                continue
+            if quitting:
+                print(text)
+            else:
+                self._save_message(text)
+
+    def _save_message(self, text: str) -> None:
+        if self.state == "menu":
+            self.menu_message = text
+            self.menu_message_timer = 2.0
+        else:
+            print(text)
+
+    def max_sustainable_speed(self) -> float:
+        """How many 1x frames of simulation fit in one frame next to drawing.
+
+        Above this game speed the frame takes longer than 1 / FPS and the
+        game falls behind real time.
+        """
+        if self._sim_cost_per_step <= 0.0:
+            return float(GAME_SPEEDS[-1])
+        budget = 1.0 / FPS - self._draw_cost
+        return max(0.0, budget / self._sim_cost_per_step)
+
+    def _cycle_game_speed(self) -> None:
+        i = GAME_SPEEDS.index(self.game_speed) if self.game_speed in GAME_SPEEDS else 0
+        self.game_speed = GAME_SPEEDS[(i + 1) % len(GAME_SPEEDS)]
+
     # -----------------------------
     # Draw
     # -----------------------------
@@ -745,39 +1253,10 @@ class Game:
         for tower in self.towers:
             tower.draw(surface, offset=offset)
 
-        for enemy in self.enemies:
-            enemy.draw(surface, offset=offset)
-
-            # Draw health indicator above boss enemies
-            if enemy.enemy_type == "boss":
-                rect = enemy.rect.move(ox, oy)
-                # Full health bar for boss
-                bar_width = 60
-                bar_height = 8
-                bar_x = rect.centerx - bar_width // 2
-                bar_y = rect.top - 20
-
-                # Background bar
-                pygame.draw.rect(surface, BLACK, (bar_x, bar_y, bar_width, bar_height))
-
-                # Health bar
-                if enemy.max_health > 0:
-                    health_ratio = max(0, enemy.health / enemy.max_health)
-                    health_color = (0, 255, 0) if health_ratio > 0.5 else (255, 255, 0) if health_ratio > 0.2 else (255, 0, 0)
-                    pygame.draw.rect(surface, health_color, (bar_x, bar_y, bar_width * health_ratio, bar_height))
-
-                # Border
-                pygame.draw.rect(surface, WHITE, (bar_x, bar_y, bar_width, bar_height), 2)
-
-            # Draw warning indicator for slow enemies
-            if enemy.enemy_type == "slow_strong":
-                rect = enemy.rect.move(ox, oy)
-                # Small warning icon
-                pygame.draw.circle(surface, (200, 50, 200), (rect.centerx + 15, rect.centery - 15), 5)
-                pygame.draw.circle(surface, (255, 255, 255), (rect.centerx + 15, rect.centery - 15), 5, 1)
-
-        for projectile in self.projectiles:
-            projectile.draw(surface, offset=offset)
+        if self.sim_process is not None:
+            render_frame(self.sim_process.frame, surface, offset)
+        else:
+            render_system(self.world, surface, offset)
 
         # Draw coins
         self.coin_manager.draw(surface, offset=offset)
@@ -788,6 +1267,14 @@ class Game:
     def draw(self):
         self.screen.fill(BG_COLOR)
 
+        # -----------------------------
+        # Loading
+        # -----------------------------
+        if self.state == "loading":
+            self._draw_loading()
+            self._present()
+            return
+
         # -----------------------------
         # Menu
         # -----------------------------
@@ -853,9 +1340,18 @@ class Game:
             self.screen.blit(game_over_text, (SCREEN_WIDTH // 2 - game_over_text.get_width() // 2, SCREEN_HEIGHT // 2))
 
         # Draw wave
-        wave_text = self.font.render(f"Wave: {self.current_wave + 1}/{self.max_waves}", True, WHITE)
+        if self.wave_manager.endless:
+            wave_text = self.font.render(f"Wave: {self.wave_manager.current_wave} (endless)", True, WHITE)
+        else:
+            wave_text = self.font.render(f"Wave: {self.current_wave + 1}/{self.max_waves}", True, WHITE)
         self.screen.blit(wave_text, (10, 30))
 
+        # Fast-forward speed and the estimated max speed this machine keeps up with
+        max_speed = self.max_sustainable_speed()
+        speed_color = RED if self.game_speed > max_speed else WHITE
+        speed_text = self.font.render(f"Speed: {self.game_speed}x  (TAB, max ~{max_speed:.0f}x)", True, speed_color)
+        self.screen.blit(speed_text, (10, 30 + wave_text.get_height() + 4))
+
         # Game over
         if self.game_over:
             over_text = self.font.render("GAME OVER", True, RED)
@@ -1017,28 +1513,29 @@ class Game:
 
 
     def _present(self):
-        window_w, window_h = self.window.get_size()
-        scale = min(
-            window_w / SCREEN_WIDTH,
-            window_h / SCREEN_HEIGHT
-        )
-
-        scaled_w = int(SCREEN_WIDTH * scale)
-        scaled_h = int(SCREEN_HEIGHT * scale)
+        # Hand the finished frame to the present thread and draw the next
+        # one into the other buffer.
+        self.screen = self.presenter.submit()
 
-        scaled_surface = pygame.transform.scale(
-            self.screen,
-            (scaled_w, scaled_h)
-        )
+    def _draw_loading(self):
+        self.screen.fill(BG_COLOR)
 
-        # Center the game (letterboxing)
-        x_offset = (window_w - scaled_w) // 2
-        y_offset = (window_h - scaled_h) // 2
+        title_font = get_pixel_font(84)
+        title = title_font.render("NO WAY THROUGH", True, (255, 255, 0))
+        self.screen.blit(title, (SCREEN_WIDTH // 2 - title.get_width() // 2, int(SCREEN_HEIGHT * 0.30)))
 
-        self.window.fill(BLACK)
-        self.window.blit(scaled_surface, (x_offset, y_offset))
+        # Progress bar
+        bar_w, bar_h = int(SCREEN_WIDTH * 0.5), 26
+        bar_x = SCREEN_WIDTH // 2 - bar_w // 2
+        bar_y = int(SCREEN_HEIGHT * 0.55)
+        progress = self.preloader.get_progress()
+        pygame.draw.rect(self.screen, BLACK, (bar_x, bar_y, bar_w, bar_h))
+        pygame.draw.rect(self.screen, BUTTON_SELECTED_COLOR, (bar_x, bar_y, int(bar_w * progress), bar_h))
+        pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_w, bar_h), 2)
 
-        pygame.display.flip()
+        label = f"Loading {self.preloader.current_label}..." if self.preloader.current_label else "Loading..."
+        t = get_pixel_font(22).render(label, True, TEXT_COLOR)
+        self.screen.blit(t, (SCREEN_WIDTH // 2 - t.get_width() // 2, bar_y + bar_h + 14))
 
     def _draw_menu(self):
         # Background
@@ -1057,30 +1554,20 @@ class Game:
         sub = get_pixel_font(26).render("Select a level, then press Play", True, TEXT_COLOR)
         self.screen.blit(sub, (SCREEN_WIDTH // 2 - sub.get_width() // 2, 170 + bob))
 
-        # Levels box
-        pygame.draw.rect(self.screen, UI_BG_COLOR, self.menu_levels_rect, border_radius=10)
-        pygame.draw.rect(self.screen, WHITE, self.menu_levels_rect, 2, border_radius=10)
-
-        item_font = get_pixel_font(24)
-        padding_x = 14
-        padding_y = 10
-        item_h = 30
-
-        for i, (_path, label) in enumerate(self.level_options[:8]):
-            y = self.menu_levels_rect.y + padding_y + i * item_h
-            x = self.menu_levels_rect.x + padding_x
-
-            is_selected = i == self.selected_level_index
-            if is_selected:
-                highlight = pygame.Rect(self.menu_levels_rect.x + 8, y - 3, self.menu_levels_rect.w - 16, item_h)
-                pygame.draw.rect(self.screen, BUTTON_SELECTED_COLOR, highlight, border_radius=6)
-
-            t = item_font.render(label, True, BLACK if is_selected else TEXT_COLOR)
-            self.screen.blit(t, (x, y))
+        # Levels list + preview
+        self.level_browser.draw(self.screen, self.selected_level_index)
 
         hint = get_pixel_font(20).render("Up/Down to change, Enter to Play", True, TEXT_COLOR)
         self.screen.blit(hint, (SCREEN_WIDTH // 2 - hint.get_width() // 2, self.menu_levels_rect.bottom + 10))
 
+        mode = "Mode: ENDLESS (TAB)" if self.endless_mode else "Mode: Campaign (TAB)"
+        mode_color = (255, 200, 60) if self.endless_mode else TEXT_COLOR
+        mode_text = get_pixel_font(20).render(mode, True, mode_color)
+        self.screen.blit(
+            mode_text,
+            (SCREEN_WIDTH // 2 - mode_text.get_width() // 2, self.menu_levels_rect.bottom + 14 + hint.get_height()),
+        )
+
         # Play button (pulse)
         mouse = self._window_to_logical(pygame.mouse.get_pos())
         hover = mouse is not None and self.menu_play_rect.collidepoint(mouse)
@@ -1126,14 +1613,33 @@ class Game:
     def run(self):
         while self.running:
             dt = self.clock.tick(FPS) / 1000
+            frame_start = time.perf_counter()
             self.handle_events()
+            self._report_saves()
             
             # Only update game logic if not game over/won
             if not self.game_over and not self.game_won:
                 self.update(dt)
             
+            draw_start = time.perf_counter()
             self.draw()
+            frame_end = time.perf_counter()
+            self._record_frame(frame_end - frame_start, frame_end - draw_start)
+            if self.telemetry is not None:
+                self._record_telemetry(frame_end - frame_start)
             
             # Exit after 5 seconds of game over/victory animation
             if (self.game_over or self.game_won) and self.game_over_timer > 5.0:
                 self.running = False
+
+        # Quitting mid-run still keeps the endless stats.
+        self._end_endless_run()
+        self._stop_sim_process()
+        if self.spectator is not None:
+            self.spectator.close()
+        if self.telemetry is not None:
+            self.telemetry.close()
+        self.presenter.wait_idle()
+        # A quick save made just before quitting is still on the writer thread.
+        self.save_writer.wait_idle()
+        self._report_saves(quitting=True)
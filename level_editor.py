@@ -1,163 +1,619 @@
-import pygame
+"""Tile level editor.
+
+Usage:
+    python level_editor.py [level.txt | levels/foo.json | levels/foo.lvl] [--new 120x80]
+
+Controls:
+    1-7                    pick tile (grass, wall, path, start, finish, shop, casino)
+    B / R / F              brush / rectangle / flood fill
+    Left mouse             paint with the current tool
+    Right/middle drag      pan (arrow keys work too)
+    Mouse wheel, + / -     zoom
+    G                      toggle the grid
+    Ctrl+Z / Ctrl+Y        undo / redo (Ctrl+Shift+Z also redoes)
+    S                      save (also autosaved every 30 s while there are changes)
+
+The map lives in a world/tile_grid.TileGrid (edits keep its masks in step,
+flood fill is TileGrid.region) and the view draws chunks of
+world/tilemap.CHUNK_TILES tiles like the game does. The view renders it once into chunk
+surfaces at the current zoom and afterwards only repaints the tiles an edit
+touched; the grid is a baked overlay and the window is only redrawn when
+something actually changed. Saving runs on a worker thread from a snapshot
+of the map, so painting never waits for the disk.
+"""
+import argparse
+import math
 import os
+import sys
+import threading
+from array import array
+from collections import deque
+
+import pygame
+
 from settings import *
-from level_io import load_level_from_txt, save_level_to_txt
-
-pygame.init()
-
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-pygame.display.set_caption("Tile Level Editor")
-
-clock = pygame.time.Clock()
-
-# Tile previews
-tileset_dir = os.path.join(os.path.dirname(__file__), "assets", "tiles")
-try:
-    TILE_IMG_GRASS = pygame.image.load(os.path.join(tileset_dir, "grass.png")).convert_alpha()
-    TILE_IMG_PATH = pygame.image.load(os.path.join(tileset_dir, "PATH MAIN.png")).convert_alpha()
-except Exception:
-    TILE_IMG_GRASS = None
-    TILE_IMG_PATH = None
-
-# Grid data
-base_dir = os.path.dirname(__file__)
-level_path = os.path.join(base_dir, "level.txt")
-
-default_tiles = [
-    [TILE_GRASS for _ in range(TILES_X)]
-    for _ in range(TILES_Y)
-]
-
-tiles = load_level_from_txt(
-    level_path,
-    fallback=default_tiles,
-    expected_width=TILES_X,
-    expected_height=TILES_Y,
-)
-
-current_tile = TILE_WALL  # default brush
-mouse_held = False  # Track if mouse button is held
-dirty = False  # Track unsaved changes
-
-
-def save_level() -> None:
-    save_level_to_txt(level_path, tiles)
-    print(f"Level saved to {level_path}")
-
-running = True
-while running:
-    clock.tick(60)
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            if dirty:
-                save_level()
-            running = False
-
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_1:
-                current_tile = TILE_GRASS
-            elif event.key == pygame.K_2:
-                current_tile = TILE_WALL
-            elif event.key == pygame.K_3:
-                current_tile = TILE_PATH
-            elif event.key == pygame.K_4:
-                current_tile = TILE_START
-            elif event.key == pygame.K_5:
-                current_tile = TILE_FINISH
-            elif event.key == pygame.K_6:
-                current_tile = TILE_SHOP
-            elif event.key == pygame.K_7:
-                current_tile = TILE_CASINO
-
-            elif event.key == pygame.K_s:
-                save_level()
-                dirty = False
-
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            mouse_held = True  # Start drawing
-        elif event.type == pygame.MOUSEBUTTONUP:
-            mouse_held = False  # Stop drawing
-
-        elif event.type == pygame.MOUSEMOTION:
-            if mouse_held:  # Only draw when holding the mouse
-                mx, my = pygame.mouse.get_pos()
-                tx = mx // TILE_SIZE
-                ty = my // TILE_SIZE
-
-                if 0 <= tx < TILES_X and 0 <= ty < TILES_Y:
-                    tiles[ty][tx] = current_tile
-                    dirty = True
-
-    # Also draw on initial click
-    if mouse_held:
-        mx, my = pygame.mouse.get_pos()
-        tx = mx // TILE_SIZE
-        ty = my // TILE_SIZE
-
-        if 0 <= tx < TILES_X and 0 <= ty < TILES_Y:
-            tiles[ty][tx] = current_tile
-            dirty = True
-
-    # DRAW
-    screen.fill((0, 0, 0))
-
-    for y in range(TILES_Y):
-        for x in range(TILES_X):
-            tid = tiles[y][x]
-            # In the editor, show START/FINISH with distinct colors
-            if tid == TILE_START:
-                color = (0, 255, 255)  # cyan for spawn
-                pygame.draw.rect(
-                    screen,
-                    color,
-                    (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                )
-            elif tid == TILE_FINISH:
-                color = (255, 60, 60)  # red for finish/castle
-                pygame.draw.rect(
-                    screen,
-                    color,
-                    (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                )
-            elif tid == TILE_SHOP:
-                color = (255, 165, 0)  # orange for shop
-                pygame.draw.rect(
-                    screen,
-                    color,
-                    (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                )
-            elif tid == TILE_CASINO:
-                color = (200, 50, 255)  # purple for casino
-                pygame.draw.rect(
-                    screen,
-                    color,
-                    (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                )
-            else:
-                if tid == TILE_GRASS and TILE_IMG_GRASS is not None:
-                    screen.blit(TILE_IMG_GRASS, (x * TILE_SIZE, y * TILE_SIZE))
-                elif tid == TILE_PATH and TILE_IMG_PATH is not None:
-                    screen.blit(TILE_IMG_PATH, (x * TILE_SIZE, y * TILE_SIZE))
-                else:
-                    color = TILE_COLORS[tid]
-                    pygame.draw.rect(
-                        screen,
-                        color,
-                        (x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
-                    )
-
-    # Grid
-    for x in range(TILES_X + 1):
-        pygame.draw.line(screen, (60, 60, 60),
-                         (x * TILE_SIZE, 0),
-                         (x * TILE_SIZE, SCREEN_HEIGHT), 1)
-
-    for y in range(TILES_Y + 1):
-        pygame.draw.line(screen, (60, 60, 60),
-                         (0, y * TILE_SIZE),
-                         (SCREEN_WIDTH, y * TILE_SIZE), 1)
-
-    pygame.display.flip()
-
-pygame.quit()
+from level_io import load_level, save_level
+from world.tile_grid import TileGrid
+from world.tilemap import CHUNK_TILES
+
+
+ZOOM_STEPS = (0.25, 0.375, 0.5, 0.75, 1.0, 1.5, 2.0)
+MIN_GRID_TILE_PX = 12  # hide the grid when tiles get smaller than this
+UNDO_LIMIT = 200
+AUTOSAVE_INTERVAL = 30.0  # seconds
+PAN_SPEED = 900  # screen pixels per second (arrow keys)
+EDITOR_BG_COLOR = (0, 0, 0)
+EDITOR_GRID_COLOR = (60, 60, 60)
+
+TOOL_BRUSH = "brush"
+TOOL_RECT = "rect"
+TOOL_FILL = "fill"
+
+TILE_KEYS = {
+    pygame.K_1: TILE_GRASS,
+    pygame.K_2: TILE_WALL,
+    pygame.K_3: TILE_PATH,
+    pygame.K_4: TILE_START,
+    pygame.K_5: TILE_FINISH,
+    pygame.K_6: TILE_SHOP,
+    pygame.K_7: TILE_CASINO,
+}
+TILE_NAMES = {
+    TILE_GRASS: "grass",
+    TILE_WALL: "wall",
+    TILE_PATH: "path",
+    TILE_CASTLE: "castle",
+    TILE_START: "start",
+    TILE_FINISH: "finish",
+    TILE_SHOP: "shop",
+    TILE_CASINO: "casino",
+}
+
+# In the editor, show START/FINISH/SHOP/CASINO with distinct colors
+EDITOR_TILE_COLORS = {
+    **TILE_COLORS,
+    TILE_START: (0, 255, 255),  # cyan for spawn
+    TILE_FINISH: (255, 60, 60),  # red for finish/castle
+    TILE_SHOP: (255, 165, 0),  # orange for shop
+    TILE_CASINO: (200, 50, 255),  # purple for casino
+}
+
+
+class EditorLevel:
+    """A TileGrid being edited, with undo/redo stored as compact diffs.
+
+    Every edit (one brush stroke, rectangle or fill) becomes a single
+    history entry: the changed cell indices as an `array('I')`, their old
+    tile ids as bytes, and the one tile id that was painted. Cells touched
+    since the view last drew are queued in `changed`.
+    """
+
+    def __init__(self, rows: list[list[int]]):
+        self.height = len(rows)
+        self.width = len(rows[0])
+        self.grid = TileGrid(rows, self.width, self.height)
+        self.cells = self.grid.ids  # flat tile ids (read-only outside EditorLevel)
+        self.changed: list[int] = []
+        self.revision = 0  # bumped by every committed edit, undo and redo
+        self._undo: deque[tuple[array, bytes, int]] = deque(maxlen=UNDO_LIMIT)
+        self._redo: list[tuple[array, bytes, int]] = []
+        self._edit: dict[int, int] | None = None  # cell index -> old tile id
+        self._tile = TILE_GRASS
+
+    def rows(self, cells: bytes | None = None) -> list[list[int]]:
+        cells = self.cells if cells is None else cells
+        w = self.width
+        return [list(cells[y * w:(y + 1) * w]) for y in range(self.height)]
+
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    # ------------------------------------------------------------------
+    # Edits
+    # ------------------------------------------------------------------
+    def begin(self, tile_id: int) -> None:
+        self._edit = {}
+        self._tile = tile_id
+
+    def end(self) -> None:
+        edit, self._edit = self._edit, None
+        if not edit:
+            return
+        self._undo.append((array("I", edit.keys()), bytes(edit.values()), self._tile))
+        self._redo.clear()
+        self.revision += 1
+
+    def _set(self, indices) -> None:
+        cells = self.cells
+        tile = self._tile
+        indices = [i for i in indices if cells[i] != tile]
+        for i in indices:
+            self._edit.setdefault(i, cells[i])
+        self.grid.set_tiles(indices, tile)
+        self.changed.extend(indices)
+
+    def paint(self, x: int, y: int) -> None:
+        if self.in_bounds(x, y):
+            self._set((y * self.width + x,))
+
+    def paint_line(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Paint every tile on the line (so fast brush strokes leave no gaps)."""
+        dx = abs(x1 - x0)
+        dy = -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        err = dx + dy
+        while True:
+            self.paint(x0, y0)
+            if x0 == x1 and y0 == y1:
+                return
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x0 += sx
+            if e2 <= dx:
+                err += dx
+                y0 += sy
+
+    def paint_rect(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        x0, x1 = sorted((max(0, min(x0, self.width - 1)), max(0, min(x1, self.width - 1))))
+        y0, y1 = sorted((max(0, min(y0, self.height - 1)), max(0, min(y1, self.height - 1))))
+        w = self.width
+        self._set([i for y in range(y0, y1 + 1) for i in range(y * w + x0, y * w + x1 + 1)])
+
+    def flood_fill(self, x: int, y: int) -> None:
+        """Fill the 4-connected region of same-id tiles at (x, y)."""
+        if self.in_bounds(x, y) and self.cells[y * self.width + x] != self._tile:
+            self._set(self.grid.region(x, y))
+
+    # ------------------------------------------------------------------
+    # History
+    # ------------------------------------------------------------------
+    def undo(self) -> bool:
+        if self._edit is not None or not self._undo:
+            return False
+        entry = self._undo.pop()
+        indices, old, _tile = entry
+        self.grid.set_tiles(indices, old)
+        self.changed.extend(indices)
+        self._redo.append(entry)
+        self.revision += 1
+        return True
+
+    def redo(self) -> bool:
+        if self._edit is not None or not self._redo:
+            return False
+        entry = self._redo.pop()
+        indices, _old, tile = entry
+        self.grid.set_tiles(indices, tile)
+        self.changed.extend(indices)
+        self._undo.append(entry)
+        self.revision += 1
+        return True
+
+
+class EditorView:
+    """Chunked, zoomable rendering of an EditorLevel.
+
+    Chunks (CHUNK_TILES square) are rendered at the current zoom when they
+    first become visible and patched tile-by-tile afterwards; a zoom change
+    drops them. The grid is one baked overlay blitted over each chunk.
+    """
+
+    def __init__(self, level: EditorLevel, screen_size: tuple[int, int]):
+        self.level = level
+        self.screen_w, self.screen_h = screen_size
+        self.zoom_index = ZOOM_STEPS.index(1.0)
+        self.cam_x = 0.0  # tile coordinate at the screen's top-left corner
+        self.cam_y = 0.0
+        self.show_grid = True
+        self._source_images = self._load_tile_images()
+        self._chunks: dict[tuple[int, int], pygame.Surface] = {}
+        self._rescale()
+
+    @staticmethod
+    def _load_tile_images() -> dict[int, pygame.Surface]:
+        tileset_dir = os.path.join(os.path.dirname(__file__), "assets", "tiles")
+        images: dict[int, pygame.Surface] = {}
+        for tile_id, name in ((TILE_GRASS, "grass.png"), (TILE_PATH, "PATH MAIN.png")):
+            try:
+                images[tile_id] = pygame.image.load(os.path.join(tileset_dir, name)).convert_alpha()
+            except Exception:
+                pass
+        return images
+
+    @property
+    def tile_px(self) -> int:
+        return max(4, int(TILE_SIZE * ZOOM_STEPS[self.zoom_index]))
+
+    def _rescale(self) -> None:
+        px = self.tile_px
+        self._tiles: dict[int, pygame.Surface] = {}
+        for tile_id, color in EDITOR_TILE_COLORS.items():
+            surf = pygame.Surface((px, px))
+            surf.fill(color)
+            image = self._source_images.get(tile_id)
+            if image is not None:
+                surf.blit(pygame.transform.scale(image, (px, px)), (0, 0))
+            self._tiles[tile_id] = surf.convert()
+        self._missing_tile = pygame.Surface((px, px)).convert()
+        self._missing_tile.fill((255, 0, 255))
+
+        size = CHUNK_TILES * px
+        self._grid = pygame.Surface((size, size), pygame.SRCALPHA)
+        for k in range(CHUNK_TILES):
+            pygame.draw.line(self._grid, EDITOR_GRID_COLOR, (k * px, 0), (k * px, size - 1))
+            pygame.draw.line(self._grid, EDITOR_GRID_COLOR, (0, k * px), (size - 1, k * px))
+        self._chunks.clear()
+
+    # ------------------------------------------------------------------
+    # Camera
+    # ------------------------------------------------------------------
+    def screen_to_tile(self, pos: tuple[int, int]) -> tuple[int, int]:
+        px = self.tile_px
+        return math.floor(self.cam_x + pos[0] / px), math.floor(self.cam_y + pos[1] / px)
+
+    def tile_to_screen(self, x: float, y: float) -> tuple[int, int]:
+        px = self.tile_px
+        return round((x - self.cam_x) * px), round((y - self.cam_y) * px)
+
+    def pan_pixels(self, dx: float, dy: float) -> None:
+        px = self.tile_px
+        self.cam_x += dx / px
+        self.cam_y += dy / px
+        self._clamp_camera()
+
+    def zoom(self, steps: int, anchor: tuple[int, int]) -> bool:
+        """Zoom in/out around a screen point; False if already at the limit."""
+        index = max(0, min(len(ZOOM_STEPS) - 1, self.zoom_index + steps))
+        if index == self.zoom_index:
+            return False
+        old_px = self.tile_px
+        ax = self.cam_x + anchor[0] / old_px
+        ay = self.cam_y + anchor[1] / old_px
+        self.zoom_index = index
+        self._rescale()
+        px = self.tile_px
+        self.cam_x = ax - anchor[0] / px
+        self.cam_y = ay - anchor[1] / px
+        self._clamp_camera()
+        return True
+
+    def _clamp_camera(self) -> None:
+        # Keep at least a quarter of the screen on the map.
+        px = self.tile_px
+        margin_x = self.screen_w * 0.75 / px
+        margin_y = self.screen_h * 0.75 / px
+        self.cam_x = max(-margin_x, min(self.cam_x, self.level.width - self.screen_w / px + margin_x))
+        self.cam_y = max(-margin_y, min(self.cam_y, self.level.height - self.screen_h / px + margin_y))
+
+    # ------------------------------------------------------------------
+    # Canvas
+    # ------------------------------------------------------------------
+    def _tile_surface(self, tile_id: int) -> pygame.Surface:
+        return self._tiles.get(tile_id, self._missing_tile)
+
+    def _render_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        level = self.level
+        px = self.tile_px
+        x0 = cx * CHUNK_TILES
+        y0 = cy * CHUNK_TILES
+        cols = min(CHUNK_TILES, level.width - x0)
+        rows = min(CHUNK_TILES, level.height - y0)
+        surf = pygame.Surface((cols * px, rows * px)).convert()
+        cells = level.cells
+        for y in range(rows):
+            base = (y0 + y) * level.width + x0
+            for x in range(cols):
+                surf.blit(self._tile_surface(cells[base + x]), (x * px, y * px))
+        return surf
+
+    def apply_changes(self) -> bool:
+        """Repaint tiles edited since the last call into their cached chunks."""
+        level = self.level
+        if not level.changed:
+            return False
+        px = self.tile_px
+        w = level.width
+        for i in level.changed:
+            y, x = divmod(i, w)
+            chunk = self._chunks.get((x // CHUNK_TILES, y // CHUNK_TILES))
+            if chunk is not None:
+                chunk.blit(self._tile_surface(level.cells[i]), ((x % CHUNK_TILES) * px, (y % CHUNK_TILES) * px))
+        level.changed.clear()
+        return True
+
+    def draw(self, screen: pygame.Surface) -> None:
+        level = self.level
+        px = self.tile_px
+        chunk_px = CHUNK_TILES * px
+        screen.fill(EDITOR_BG_COLOR)
+
+        cx0 = max(0, math.floor(self.cam_x / CHUNK_TILES))
+        cy0 = max(0, math.floor(self.cam_y / CHUNK_TILES))
+        cx1 = min((level.width - 1) // CHUNK_TILES, math.floor((self.cam_x + self.screen_w / px) / CHUNK_TILES))
+        cy1 = min((level.height - 1) // CHUNK_TILES, math.floor((self.cam_y + self.screen_h / px) / CHUNK_TILES))
+        grid = self.show_grid and px >= MIN_GRID_TILE_PX
+        ox = -round(self.cam_x * px)
+        oy = -round(self.cam_y * px)
+        for cy in range(cy0, cy1 + 1):
+            for cx in range(cx0, cx1 + 1):
+                chunk = self._chunks.get((cx, cy))
+                if chunk is None:
+                    chunk = self._render_chunk(cx, cy)
+                    self._chunks[(cx, cy)] = chunk
+                pos = (ox + cx * chunk_px, oy + cy * chunk_px)
+                screen.blit(chunk, pos)
+                if grid:
+                    screen.blit(self._grid, pos, chunk.get_rect())
+
+        # Map border
+        pygame.draw.rect(screen, EDITOR_GRID_COLOR, (ox - 1, oy - 1, level.width * px + 2, level.height * px + 2), 1)
+
+    def draw_tile_outline(self, screen: pygame.Surface, x0: int, y0: int, x1: int, y1: int, color) -> None:
+        x0, x1 = sorted((x0, x1))
+        y0, y1 = sorted((y0, y1))
+        sx, sy = self.tile_to_screen(x0, y0)
+        ex, ey = self.tile_to_screen(x1 + 1, y1 + 1)
+        pygame.draw.rect(screen, color, (sx, sy, ex - sx, ey - sy), 2)
+
+
+class BackgroundSaver:
+    """Save level snapshots on a worker thread; the newest pending one wins."""
+
+    def __init__(self, level: EditorLevel, path: str):
+        self.level = level
+        self.path = path
+        self.saved_revision = level.revision
+        self.requested_revision = level.revision
+        self.error = ""
+        self._pending: tuple[int, bytes] | None = None
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="editor-save", daemon=True)
+        self._thread.start()
+
+    @property
+    def dirty(self) -> bool:
+        return self.level.revision != self.saved_revision
+
+    @property
+    def saving(self) -> bool:
+        return self._busy or self._pending is not None
+
+    def request(self) -> None:
+        """Queue a save of the level as it is right now (a cheap bytes copy)."""
+        if self.level.revision == self.requested_revision:
+            return
+        with self._cond:
+            self._pending = (self.level.revision, bytes(self.level.cells))
+            self.requested_revision = self.level.revision
+            self._cond.notify_all()
+
+    def wait_idle(self) -> None:
+        with self._cond:
+            while self._busy or self._pending is not None:
+                self._cond.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                revision, cells = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                save_level(self.path, self.level.rows(cells))
+                self.saved_revision = revision
+                self.error = ""
+            except (OSError, ValueError) as exc:
+                self.error = str(exc)
+                with self._cond:
+                    if self._pending is None:
+                        # Let the next request() (S or autosave) retry this revision.
+                        self.requested_revision = self.saved_revision
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+
+def _parse_size(text: str) -> tuple[int, int]:
+    try:
+        w, h = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError("size must look like 120x80")
+    if w <= 0 or h <= 0:
+        raise argparse.ArgumentTypeError("size must be positive")
+    return w, h
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Tile level editor.")
+    parser.add_argument(
+        "path",
+        nargs="?",
+        default=os.path.join(os.path.dirname(__file__), "level.txt"),
+        help="level file to edit (.txt, .json or .lvl)",
+    )
+    parser.add_argument("--new", type=_parse_size, metavar="WxH", help="start a new grass map of this size")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+    pygame.display.set_caption("Tile Level Editor")
+    clock = pygame.time.Clock()
+
+    if args.new:
+        w, h = args.new
+        rows = [[TILE_GRASS for _ in range(w)] for _ in range(h)]
+    else:
+        default_tiles = [[TILE_GRASS for _ in range(TILES_X)] for _ in range(TILES_Y)]
+        rows = load_level(args.path, fallback=default_tiles)
+
+    level = EditorLevel(rows)
+    view = EditorView(level, screen.get_size())
+    saver = BackgroundSaver(level, args.path)
+    if args.new:
+        level.revision += 1  # a new map is unsaved until the first save
+
+    hud_font = get_pixel_font(20)
+    hud_text = ""
+    hud_surface: pygame.Surface | None = None
+
+    current_tile = TILE_WALL  # default brush
+    tool = TOOL_BRUSH
+    painting = False
+    last_tile: tuple[int, int] | None = None
+    rect_start: tuple[int, int] | None = None
+    panning = False
+    autosave_timer = 0.0
+    hover = (-1, -1)
+    needs_redraw = True
+
+    running = True
+    while running:
+        dt = clock.tick(60) / 1000
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
+
+            elif event.type == pygame.KEYDOWN:
+                ctrl = event.mod & pygame.KMOD_CTRL
+                if event.key in TILE_KEYS:
+                    current_tile = TILE_KEYS[event.key]
+                elif ctrl and (event.key == pygame.K_y or (event.key == pygame.K_z and event.mod & pygame.KMOD_SHIFT)):
+                    level.redo()
+                elif ctrl and event.key == pygame.K_z:
+                    level.undo()
+                elif event.key == pygame.K_b:
+                    tool = TOOL_BRUSH
+                elif event.key == pygame.K_r:
+                    tool = TOOL_RECT
+                elif event.key == pygame.K_f:
+                    tool = TOOL_FILL
+                elif event.key == pygame.K_g:
+                    view.show_grid = not view.show_grid
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS):
+                    view.zoom(1, (view.screen_w // 2, view.screen_h // 2))
+                elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                    view.zoom(-1, (view.screen_w // 2, view.screen_h // 2))
+                elif event.key == pygame.K_s:
+                    saver.request()
+                needs_redraw = True
+
+            elif event.type == pygame.MOUSEWHEEL:
+                if view.zoom(event.y, pygame.mouse.get_pos()):
+                    needs_redraw = True
+
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if event.button in (2, 3):
+                    panning = True
+                elif event.button == 1:
+                    tx, ty = view.screen_to_tile(event.pos)
+                    if tool == TOOL_BRUSH:
+                        level.begin(current_tile)
+                        level.paint(tx, ty)
+                        painting = True
+                        last_tile = (tx, ty)
+                    elif tool == TOOL_RECT:
+                        rect_start = (tx, ty)
+                    elif tool == TOOL_FILL:
+                        level.begin(current_tile)
+                        level.flood_fill(tx, ty)
+                        level.end()
+                needs_redraw = True
+
+            elif event.type == pygame.MOUSEBUTTONUP:
+                if event.button in (2, 3):
+                    panning = False
+                elif event.button == 1:
+                    if painting:
+                        level.end()
+                        painting = False
+                    elif rect_start is not None:
+                        tx, ty = view.screen_to_tile(event.pos)
+                        level.begin(current_tile)
+                        level.paint_rect(rect_start[0], rect_start[1], tx, ty)
+                        level.end()
+                        rect_start = None
+                needs_redraw = True
+
+            elif event.type == pygame.MOUSEMOTION:
+                if panning:
+                    view.pan_pixels(-event.rel[0], -event.rel[1])
+                    needs_redraw = True
+                tile = view.screen_to_tile(event.pos)
+                if tile != hover:
+                    hover = tile
+                    needs_redraw = True
+                    if painting:
+                        level.paint_line(last_tile[0], last_tile[1], tile[0], tile[1])
+                        last_tile = tile
+
+        # Arrow-key panning
+        keys = pygame.key.get_pressed()
+        kx = (keys[pygame.K_RIGHT] - keys[pygame.K_LEFT]) * PAN_SPEED * dt
+        ky = (keys[pygame.K_DOWN] - keys[pygame.K_UP]) * PAN_SPEED * dt
+        if kx or ky:
+            view.pan_pixels(kx, ky)
+            hover = view.screen_to_tile(pygame.mouse.get_pos())
+            needs_redraw = True
+
+        # Autosave (the snapshot is a bytes copy; the write happens off-thread)
+        autosave_timer += dt
+        if autosave_timer >= AUTOSAVE_INTERVAL:
+            autosave_timer = 0.0
+            if not painting:
+                saver.request()
+
+        if view.apply_changes():
+            needs_redraw = True
+
+        if saver.error:
+            status = f"save failed: {saver.error}"
+        elif saver.saving:
+            status = "saving..."
+        elif saver.dirty:
+            status = "unsaved"
+        else:
+            status = "saved"
+        text = (
+            f"{os.path.basename(args.path)}  {level.width}x{level.height}  "
+            f"tool: {tool}  tile: {TILE_NAMES.get(current_tile, current_tile)}  "
+            f"zoom: {ZOOM_STEPS[view.zoom_index]:g}x  {status}"
+        )
+        if text != hud_text:
+            hud_text = text
+            hud_surface = hud_font.render(text, True, TEXT_COLOR)
+            needs_redraw = True
+
+        if not needs_redraw:
+            continue
+        needs_redraw = False
+
+        view.draw(screen)
+        if rect_start is not None:
+            view.draw_tile_outline(screen, rect_start[0], rect_start[1], hover[0], hover[1], WHITE)
+        elif level.in_bounds(*hover):
+            view.draw_tile_outline(screen, hover[0], hover[1], hover[0], hover[1], WHITE)
+        pygame.draw.rect(screen, UI_BG_COLOR, (0, 0, hud_surface.get_width() + 16, hud_surface.get_height() + 8))
+        screen.blit(hud_surface, (8, 4))
+        pygame.display.flip()
+
+    if painting:
+        level.end()
+    if saver.dirty:
+        saver.request()
+        saver.wait_idle()
+        if saver.error:
+            print(f"Error: could not save {args.path}: {saver.error}", file=sys.stderr)
+        else:
+            print(f"Level saved to {args.path}")
+    pygame.quit()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
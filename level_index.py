@@ -0,0 +1,245 @@
+"""Background index of the level library for the menu's level browser.
+
+For every level option a worker thread records the grid size, the length of
+the enemy route, tower-slot counts and a tiny thumbnail (one tile id per
+thumbnail pixel, priority-downsampled so thin paths survive). Results are
+stored in `.cache/level_index.json` keyed by each file's size and mtime, so
+only new or edited levels are re-read on the next start.
+
+The thread never touches pygame; the browser turns thumbnails into surfaces
+on the main thread when they become visible.
+"""
+import base64
+import json
+import os
+import threading
+from collections import deque
+
+from level_io import load_level
+from settings import (
+    TILE_COLORS,
+    TILE_GRASS,
+    TILE_WALL,
+    TILE_PATH,
+    TILE_CASTLE,
+    TILE_START,
+    TILE_FINISH,
+    TILE_SHOP,
+    TILE_CASINO,
+)
+from world.tile_grid import FLAG_BUILDABLE, FLAG_PATH, TileGrid
+
+
+INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "level_index.json")
+# Bump when the stored fields or the thumbnail encoding change.
+INDEX_VERSION = 1
+
+THUMB_MAX_W = 160
+THUMB_MAX_H = 100
+
+# When a thumbnail pixel covers several tiles, keep the most telling one.
+_THUMB_PRIORITY = {
+    TILE_GRASS: 0,
+    TILE_WALL: 1,
+    TILE_PATH: 2,
+    TILE_SHOP: 3,
+    TILE_CASINO: 3,
+    TILE_START: 4,
+    TILE_FINISH: 4,
+    TILE_CASTLE: 5,
+}
+
+# In game start/finish/shop/casino look like path or grass; set them apart.
+THUMB_COLORS = {
+    **TILE_COLORS,
+    TILE_START: (90, 200, 255),
+    TILE_FINISH: (230, 70, 70),
+    TILE_SHOP: (240, 200, 60),
+    TILE_CASINO: (200, 90, 220),
+}
+
+
+def _file_key(path: str) -> list[int] | None:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, st.st_mtime_ns]
+
+
+def _route_length(grid: TileGrid, tiles: list[list[int]]) -> int:
+    """Shortest start -> finish walk over path tiles (in tiles), 0 if none."""
+    start = finish = None
+    for y, row in enumerate(tiles):
+        for x, tile_id in enumerate(row):
+            if tile_id == TILE_START and start is None:
+                start = (x, y)
+            elif tile_id == TILE_FINISH and finish is None:
+                finish = (x, y)
+    if start is None:
+        return 0
+
+    dist = {start: 1}
+    q = deque([start])
+    farthest = 1
+    while q:
+        x, y = q.popleft()
+        d = dist[(x, y)]
+        if (x, y) == finish:
+            return d
+        farthest = max(farthest, d)
+        for n in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if n not in dist and grid.has_flag(n[0], n[1], FLAG_PATH):
+                dist[n] = d + 1
+                q.append(n)
+    # No finish tile: the route ends wherever the path runs out.
+    return farthest
+
+
+def _thumbnail(tiles: list[list[int]], width: int, height: int) -> tuple[int, int, bytes]:
+    step = max(1, -(-width // THUMB_MAX_W), -(-height // THUMB_MAX_H))
+    tw = -(-width // step)
+    th = -(-height // step)
+    out = bytearray(tw * th)
+    best = bytearray(tw * th)
+    for y, row in enumerate(tiles):
+        base = (y // step) * tw
+        for x, tile_id in enumerate(row):
+            i = base + x // step
+            prio = _THUMB_PRIORITY.get(tile_id, 0) + 1
+            if prio > best[i]:
+                best[i] = prio
+                out[i] = tile_id & 0xFF
+    return tw, th, bytes(out)
+
+
+def index_level(path: str) -> dict | None:
+    """Read one level and summarize it; None if it can't be loaded."""
+    missing: list[list[int]] = []
+    tiles = load_level(path, fallback=missing)
+    if tiles is missing or not tiles:
+        return None
+    height = len(tiles)
+    width = len(tiles[0])
+    grid = TileGrid(tiles, width, height)
+    slots = 0
+    slots_by_path = 0
+    for flags, neighbours in zip(grid.flags, grid.neighbours):
+        if flags & FLAG_BUILDABLE:
+            slots += 1
+            if neighbours:
+                slots_by_path += 1
+    tw, th, thumb = _thumbnail(tiles, width, height)
+    return {
+        "width": width,
+        "height": height,
+        "route_length": _route_length(grid, tiles),
+        "tower_slots": slots,
+        "tower_slots_by_path": slots_by_path,
+        "thumb_size": [tw, th],
+        "thumb": base64.b64encode(thumb).decode("ascii"),
+    }
+
+
+class LevelIndex:
+    """Index a list of level paths on a worker thread.
+
+    `get(path)` returns the entry dict once it is ready (else None).
+    `prioritize(paths)` moves those paths to the front of the queue; the
+    browser calls it with the selected and visible rows.
+    """
+
+    def __init__(self, paths: list[str], *, index_path: str = INDEX_PATH):
+        self.paths = list(paths)
+        self.index_path = index_path
+        self.done = not self.paths
+        self._entries: dict[str, dict] = {}
+        self._pending: deque[str] = deque()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.done:
+            return
+        self._thread = threading.Thread(target=self._run, name="level-index", daemon=True)
+        self._thread.start()
+
+    def run_blocking(self) -> None:
+        self._run()
+
+    def get(self, path: str) -> dict | None:
+        entry = self._entries.get(path)
+        if entry is None or entry.get("error"):
+            return None
+        return entry
+
+    def failed(self, path: str) -> bool:
+        entry = self._entries.get(path)
+        return entry is not None and bool(entry.get("error"))
+
+    def prioritize(self, paths: list[str]) -> None:
+        with self._lock:
+            for path in reversed(paths):
+                if path in self._entries:
+                    continue
+                try:
+                    self._pending.remove(path)
+                except ValueError:
+                    continue
+                self._pending.appendleft(path)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _load_cache(self) -> dict:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get("version") != INDEX_VERSION:
+            return {}
+        entries = data.get("entries")
+        return entries if isinstance(entries, dict) else {}
+
+    def _save_cache(self) -> None:
+        payload = {"version": INDEX_VERSION, "entries": dict(self._entries)}
+        tmp_path = self.index_path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(payload, file, separators=(",", ":"))
+            os.replace(tmp_path, self.index_path)
+        except (OSError, TypeError, ValueError):
+            pass
+
+    def _run(self) -> None:
+        cached = self._load_cache()
+        with self._lock:
+            for path in self.paths:
+                entry = cached.get(path)
+                if entry is not None and entry.get("key") == _file_key(path):
+                    self._entries[path] = entry
+                else:
+                    self._pending.append(path)
+        changed = len(self._entries) != len(cached)
+
+        while True:
+            with self._lock:
+                if not self._pending:
+                    break
+                path = self._pending.popleft()
+            key = _file_key(path)
+            try:
+                entry = index_level(path)
+            except Exception:
+                entry = None
+            if entry is None:
+                entry = {"error": True}
+            entry["key"] = key
+            self._entries[path] = entry
+            changed = True
+
+        if changed:
+            self._save_cache()
+        self.done = True
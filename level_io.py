@@ -1,6 +1,35 @@
 import ast
 import json
-from typing import List, Optional
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, List, Optional
+
+
+# ---------------------------------------------------------------------------
+# Binary level format (.lvl)
+#
+#   header   magic "NWLV", version, body encoding, palette size,
+#            width, height, encoded body size, section count
+#   palette  one byte per palette entry: the tile id for that index
+#   body     width * height palette indices, row-major, encoded as
+#            raw bytes, zlib, or RLE (count, value) byte pairs
+#   sections optional metadata: 4-byte tag, u32 size, payload
+# ---------------------------------------------------------------------------
+LEVEL_BIN_EXTENSION = ".lvl"
+LEVEL_BIN_VERSION = 1
+
+ENCODING_RAW = 0
+ENCODING_ZLIB = 1
+ENCODING_RLE = 2
+_ENCODING_NAMES = {"raw": ENCODING_RAW, "zlib": ENCODING_ZLIB, "rle": ENCODING_RLE}
+
+_LEVEL_MAGIC = b"NWLV"
+# magic, version, encoding, palette size, width, height, body size, section count
+_LEVEL_HEADER = struct.Struct("<4sHBBIIIH")
+# tag, payload size
+_LEVEL_SECTION = struct.Struct("<4sI")
 
 
 def _normalize_level_grid(
@@ -149,3 +178,235 @@ def save_level_to_txt(path: str, level: List[List[int]]) -> None:
         for row in level:
             file.write(f"    {row},\n")
         file.write("]\n")
+
+
+def save_level_to_json(path: str, level: List[List[int]]) -> None:
+    """Save a level grid as a JSON list of rows (one row per line)."""
+    with open(path, "w", encoding="utf-8") as file:
+        file.write("[\n")
+        file.write(",\n".join(json.dumps(row, separators=(",", ":")) for row in level))
+        file.write("\n]\n")
+
+
+class BinaryLevel:
+    """A decoded .lvl file.
+
+    `cells` holds width * height tile ids (row-major) as bytes; the file
+    itself is closed once they have been read.
+    """
+
+    def __init__(self, width: int, height: int, cells, metadata: Dict[str, bytes]):
+        self.width = width
+        self.height = height
+        self.cells = cells
+        self.metadata = metadata
+
+    def rows(self) -> List[List[int]]:
+        w = self.width
+        return [list(self.cells[y * w:(y + 1) * w]) for y in range(self.height)]
+
+
+def binary_level_path_for(path: str) -> str:
+    """`levels/foo.json` / `level.txt` -> the matching `.lvl` next to it."""
+    return os.path.splitext(path)[0] + LEVEL_BIN_EXTENSION
+
+
+def _rle_encode(data: bytes) -> bytes:
+    out = bytearray()
+    i = 0
+    n = len(data)
+    while i < n:
+        value = data[i]
+        j = i + 1
+        while j < n and j - i < 255 and data[j] == value:
+            j += 1
+        out.append(j - i)
+        out.append(value)
+        i = j
+    return bytes(out)
+
+
+def _rle_decode(data, expected_size: int) -> bytes:
+    out = bytearray()
+    for k in range(0, len(data) - 1, 2):
+        out += bytes((data[k + 1],)) * data[k]
+    if len(out) != expected_size:
+        raise ValueError("RLE body has the wrong size")
+    return bytes(out)
+
+
+def save_level_to_bin(
+    path: str,
+    level: List[List[int]],
+    *,
+    encoding: str = "zlib",
+    metadata: Optional[Dict[str, bytes]] = None,
+) -> None:
+    """Save a level grid as a binary `.lvl` file (see the format notes above)."""
+    height = len(level)
+    width = len(level[0]) if level else 0
+    if any(len(row) != width for row in level):
+        raise ValueError("level rows must all have the same width")
+
+    palette = sorted({int(cell) for row in level for cell in row})
+    if any(not 0 <= tile_id <= 255 for tile_id in palette):
+        raise ValueError("tile ids must fit in a byte")
+    index_of = {tile_id: i for i, tile_id in enumerate(palette)}
+    body = bytes(index_of[int(cell)] for row in level for cell in row)
+
+    code = _ENCODING_NAMES[encoding]
+    if code == ENCODING_ZLIB:
+        body = zlib.compress(body, 9)
+    elif code == ENCODING_RLE:
+        body = _rle_encode(body)
+
+    sections = []
+    for tag, payload in (metadata or {}).items():
+        encoded_tag = tag.encode("ascii")[:4].ljust(4, b" ")
+        sections.append(_LEVEL_SECTION.pack(encoded_tag, len(payload)) + bytes(payload))
+
+    header = _LEVEL_HEADER.pack(
+        _LEVEL_MAGIC, LEVEL_BIN_VERSION, code, len(palette), width, height, len(body), len(sections)
+    )
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as file:
+        file.write(header)
+        file.write(bytes(palette))
+        file.write(body)
+        for section in sections:
+            file.write(section)
+    os.replace(tmp_path, path)
+
+
+def read_level_bin(path: str) -> BinaryLevel:
+    """Read a `.lvl` file. Raises OSError/ValueError if it is missing or bad."""
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        return _decode_level_bin(view)
+    finally:
+        # Every view into the map has been copied out; release it now rather
+        # than whenever the garbage collector gets to it.
+        view.release()
+        mapped.close()
+
+
+def _decode_body(body: memoryview, code: int, cell_count: int) -> bytes:
+    if code == ENCODING_RAW:
+        cells = bytes(body)
+        if len(cells) != cell_count:
+            raise ValueError("raw body has the wrong size")
+    elif code == ENCODING_ZLIB:
+        cells = zlib.decompress(body)
+        if len(cells) != cell_count:
+            raise ValueError("zlib body has the wrong size")
+    elif code == ENCODING_RLE:
+        cells = _rle_decode(body, cell_count)
+    else:
+        raise ValueError(f"unknown body encoding {code}")
+    return cells
+
+
+def _decode_level_bin(view: memoryview) -> BinaryLevel:
+    try:
+        magic, version, code, palette_size, width, height, body_size, section_count = (
+            _LEVEL_HEADER.unpack_from(view, 0)
+        )
+    except struct.error as exc:
+        raise ValueError("truncated level header") from exc
+    if magic != _LEVEL_MAGIC or version != LEVEL_BIN_VERSION:
+        raise ValueError("not a supported .lvl file")
+
+    offset = _LEVEL_HEADER.size
+    palette = bytes(view[offset:offset + palette_size])
+    offset += palette_size
+    with view[offset:offset + body_size] as body:
+        if len(body) != body_size:
+            raise ValueError("truncated level body")
+        cells = _decode_body(body, code, width * height)
+    offset += body_size
+
+    # Map palette indices back to tile ids (skipped for identity palettes).
+    if palette != bytes(range(palette_size)):
+        table = bytearray(range(256))
+        for i, tile_id in enumerate(palette):
+            table[i] = tile_id
+        cells = cells.translate(bytes(table))
+
+    metadata: Dict[str, bytes] = {}
+    for _ in range(section_count):
+        try:
+            tag, size = _LEVEL_SECTION.unpack_from(view, offset)
+        except struct.error as exc:
+            raise ValueError("truncated metadata section") from exc
+        offset += _LEVEL_SECTION.size
+        metadata[tag.decode("ascii").rstrip()] = bytes(view[offset:offset + size])
+        offset += size
+
+    return BinaryLevel(width, height, cells, metadata)
+
+
+def load_level_from_bin(
+    path: str,
+    *,
+    fallback: List[List[int]],
+    expected_width: Optional[int] = None,
+    expected_height: Optional[int] = None,
+) -> List[List[int]]:
+    """Load a level grid from a binary `.lvl` file.
+
+    Returns `fallback` if the file is missing, invalid, or mismatched size.
+    """
+    try:
+        level = read_level_bin(path)
+    except (OSError, ValueError, zlib.error):
+        return fallback
+    if level.width <= 0 or level.height <= 0:
+        return fallback
+    if expected_height is not None and level.height != expected_height:
+        return fallback
+    if expected_width is not None and level.width != expected_width:
+        return fallback
+    return level.rows()
+
+
+def fresh_binary_level_path(path: str) -> Optional[str]:
+    """The compiled `.lvl` for a level source, if present and not stale."""
+    if path.lower().endswith(LEVEL_BIN_EXTENSION):
+        return path
+    bin_path = binary_level_path_for(path)
+    try:
+        if os.path.getmtime(bin_path) >= os.path.getmtime(path):
+            return bin_path
+    except OSError:
+        pass
+    return None
+
+
+def load_level(path: str, *, fallback: List[List[int]], fill: int = 0) -> List[List[int]]:
+    """Load any level file (.lvl, .json or level.txt style) at its own size.
+
+    A compiled `.lvl` (see convert_level.py) is preferred when it is at least
+    as new as the source: it loads without any text parsing.
+    """
+    bin_path = fresh_binary_level_path(path)
+    if bin_path is not None:
+        grid = load_level_from_bin(bin_path, fallback=fallback)
+        if grid is not fallback or bin_path == path:
+            return grid
+    if path.lower().endswith(".json"):
+        return load_level_from_json(path, fallback=fallback, normalize_to_expected=False, fill=fill)
+    return load_level_from_txt(path, fallback=fallback)
+
+
+def save_level(path: str, level: List[List[int]]) -> None:
+    """Save a level grid in the format implied by the file extension."""
+    lower = path.lower()
+    if lower.endswith(LEVEL_BIN_EXTENSION):
+        save_level_to_bin(path, level)
+    elif lower.endswith(".json"):
+        save_level_to_json(path, level)
+    else:
+        save_level_to_txt(path, level)
+
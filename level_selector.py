@@ -0,0 +1,181 @@
+"""Menu level browser: a virtualized level list plus a thumbnail preview.
+
+Only the rows that fit in the list box are rendered (labels are cached per
+row), so the menu costs the same with five levels or five hundred. Level
+details and thumbnails come from a LevelIndex worker; anything not indexed
+yet shows a placeholder instead of blocking the frame.
+"""
+import base64
+from collections import OrderedDict
+
+import pygame
+
+from level_index import THUMB_COLORS, LevelIndex
+from settings import (
+    BLACK,
+    BUTTON_COLOR,
+    BUTTON_SELECTED_COLOR,
+    TEXT_COLOR,
+    UI_BG_COLOR,
+    WHITE,
+    get_pixel_font,
+)
+
+
+ROW_HEIGHT = 30
+PADDING_X = 14
+PADDING_Y = 10
+SCROLLBAR_W = 8
+THUMB_SURFACE_LIMIT = 32
+
+_THUMB_PALETTE = [THUMB_COLORS.get(i, (0, 0, 0)) for i in range(256)]
+
+
+class LevelBrowser:
+    def __init__(self, list_rect: pygame.Rect, preview_rect: pygame.Rect, options: list[tuple[str, str]], index: LevelIndex):
+        self.list_rect = list_rect
+        self.preview_rect = preview_rect
+        self.options = options
+        self.index = index
+        self.scroll = 0  # first visible row
+        self._item_font = get_pixel_font(24)
+        self._small_font = get_pixel_font(20)
+        self._label_cache: dict[tuple[int, bool], pygame.Surface] = {}
+        self._thumbs: OrderedDict[str, pygame.Surface] = OrderedDict()
+
+    @property
+    def visible_rows(self) -> int:
+        return max(1, (self.list_rect.h - 2 * PADDING_Y) // ROW_HEIGHT)
+
+    # ------------------------------------------------------------------
+    # Input
+    # ------------------------------------------------------------------
+    def ensure_visible(self, row: int) -> None:
+        if row < self.scroll:
+            self.scroll = row
+        elif row >= self.scroll + self.visible_rows:
+            self.scroll = row - self.visible_rows + 1
+        self._clamp_scroll()
+
+    def scroll_by(self, rows: int) -> None:
+        self.scroll += rows
+        self._clamp_scroll()
+
+    def _clamp_scroll(self) -> None:
+        self.scroll = max(0, min(self.scroll, len(self.options) - self.visible_rows))
+
+    def row_at(self, pos: tuple[int, int]) -> int | None:
+        """Row index under a logical-space point, or None."""
+        if not self.list_rect.collidepoint(pos):
+            return None
+        local_y = pos[1] - self.list_rect.y - PADDING_Y
+        if local_y < 0:
+            return None
+        row = self.scroll + local_y // ROW_HEIGHT
+        if row >= self.scroll + self.visible_rows or not 0 <= row < len(self.options):
+            return None
+        return int(row)
+
+    # ------------------------------------------------------------------
+    # Drawing
+    # ------------------------------------------------------------------
+    def draw(self, screen: pygame.Surface, selected: int) -> None:
+        first = self.scroll
+        last = min(len(self.options), first + self.visible_rows)
+
+        # Index what the player is looking at before the rest of the library.
+        wanted = [self.options[selected][0]] if 0 <= selected < len(self.options) else []
+        wanted += [self.options[i][0] for i in range(first, last)]
+        self.index.prioritize(wanted)
+
+        self._draw_list(screen, selected, first, last)
+        self._draw_preview(screen, selected)
+
+    def _label(self, row: int, is_selected: bool) -> pygame.Surface:
+        key = (row, is_selected)
+        surf = self._label_cache.get(key)
+        if surf is None:
+            surf = self._item_font.render(self.options[row][1], True, BLACK if is_selected else TEXT_COLOR)
+            self._label_cache[key] = surf
+        return surf
+
+    def _draw_list(self, screen: pygame.Surface, selected: int, first: int, last: int) -> None:
+        rect = self.list_rect
+        pygame.draw.rect(screen, UI_BG_COLOR, rect, border_radius=10)
+        pygame.draw.rect(screen, WHITE, rect, 2, border_radius=10)
+
+        for row in range(first, last):
+            y = rect.y + PADDING_Y + (row - first) * ROW_HEIGHT
+            is_selected = row == selected
+            if is_selected:
+                highlight = pygame.Rect(rect.x + 8, y - 3, rect.w - 16 - SCROLLBAR_W, ROW_HEIGHT)
+                pygame.draw.rect(screen, BUTTON_SELECTED_COLOR, highlight, border_radius=6)
+            screen.blit(self._label(row, is_selected), (rect.x + PADDING_X, y))
+
+        # Scrollbar (only when the list overflows)
+        total = len(self.options)
+        if total > self.visible_rows:
+            track = pygame.Rect(rect.right - SCROLLBAR_W - 6, rect.y + PADDING_Y, SCROLLBAR_W, rect.h - 2 * PADDING_Y)
+            pygame.draw.rect(screen, BUTTON_COLOR, track, border_radius=4)
+            thumb_h = max(16, track.h * self.visible_rows // total)
+            thumb_y = track.y + (track.h - thumb_h) * self.scroll // max(1, total - self.visible_rows)
+            pygame.draw.rect(screen, WHITE, (track.x, thumb_y, track.w, thumb_h), border_radius=4)
+
+    def _thumbnail(self, path: str, entry: dict) -> pygame.Surface | None:
+        surf = self._thumbs.get(path)
+        if surf is not None:
+            self._thumbs.move_to_end(path)
+            return surf
+        try:
+            tw, th = entry["thumb_size"]
+            ids = base64.b64decode(entry["thumb"])
+            surf = pygame.image.frombuffer(ids, (tw, th), "P")
+        except (KeyError, TypeError, ValueError, pygame.error):
+            return None
+        surf.set_palette(_THUMB_PALETTE)
+
+        # Integer-ish upscale into the preview box keeps tiles crisp.
+        box_w = self.preview_rect.w - 2 * PADDING_X
+        box_h = self.preview_rect.h - 2 * PADDING_Y - 3 * ROW_HEIGHT - 6
+        scale = max(0.01, min(box_w / tw, box_h / th))
+        if scale >= 1:
+            scale = int(scale)
+        size = (max(1, int(tw * scale)), max(1, int(th * scale)))
+        if size != (tw, th):
+            surf = pygame.transform.scale(surf, size)
+
+        self._thumbs[path] = surf
+        while len(self._thumbs) > THUMB_SURFACE_LIMIT:
+            self._thumbs.popitem(last=False)
+        return surf
+
+    def _draw_preview(self, screen: pygame.Surface, selected: int) -> None:
+        rect = self.preview_rect
+        pygame.draw.rect(screen, UI_BG_COLOR, rect, border_radius=10)
+        pygame.draw.rect(screen, WHITE, rect, 2, border_radius=10)
+        if not 0 <= selected < len(self.options):
+            return
+
+        path = self.options[selected][0]
+        entry = self.index.get(path)
+        if entry is None:
+            text = "Unreadable level" if self.index.failed(path) else "Indexing..."
+            msg = self._small_font.render(text, True, TEXT_COLOR)
+            screen.blit(msg, (rect.centerx - msg.get_width() // 2, rect.centery - msg.get_height() // 2))
+            return
+
+        thumb = self._thumbnail(path, entry)
+        y = rect.y + PADDING_Y
+        if thumb is not None:
+            screen.blit(thumb, (rect.centerx - thumb.get_width() // 2, y))
+            y += thumb.get_height() + 6
+
+        lines = (
+            f"{entry['width']} x {entry['height']} tiles",
+            f"Route: {entry['route_length']} tiles",
+            f"Slots: {entry['tower_slots']} / {entry['tower_slots_by_path']} by path",
+        )
+        for line in lines:
+            t = self._small_font.render(line, True, TEXT_COLOR)
+            screen.blit(t, (rect.x + PADDING_X, y))
+            y += t.get_height() + 2
@@ -1,8 +1,26 @@
+import argparse
 import os
 import pygame
 from game import Game
+from settings import SPECTATOR_PORT
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="No Way Through")
+    parser.add_argument(
+        "--sim-process",
+        action="store_true",
+        help="run waves/combat in a child process (uses a second core)",
+    )
+    parser.add_argument(
+        "--spectate",
+        nargs="?",
+        type=int,
+        const=SPECTATOR_PORT,
+        metavar="PORT",
+        help=f"stream the match to spectator_viewer.py on localhost (default port {SPECTATOR_PORT})",
+    )
+    args = parser.parse_args(argv)
 
-def main():
     pygame.init()
 
     
@@ -22,6 +40,10 @@ def main():
         pass
 
     game = Game()
+    if args.sim_process:
+        game.sim_in_process = True
+    if args.spectate is not None and game.spectator is None:
+        game.start_spectator(args.spectate)
     game.run()
     pygame.quit()
 
@@ -0,0 +1,165 @@
+import threading
+
+from settings import TROOP_DATA
+from asset_manager import get_tower_sprites, get_projectile_frames
+from entities.enemy import get_scaled_enemy_frames, enemy_sprite_draw_size
+from entities.tower import tower_sprite_draw_size, _get_sfx as _get_tower_sfx
+from entities.projectile import PROJECTILE_SPRITE_SIZE, _get_sfx as _get_projectile_sfx
+from world.tilemap import tilemap_asset_paths, _load_image
+from world.wave_script import DEFAULT_WAVE_SCRIPT, enemy_types_by_wave, load_wave_script
+
+
+# Enemy types that appear in each wave of the default wave script.
+ENEMY_TYPES_BY_WAVE: dict[int, tuple[str, ...]] = enemy_types_by_wave(
+    load_wave_script(DEFAULT_WAVE_SCRIPT, fallback=[])
+)
+
+# (filename, volume) pairs played by towers / projectiles.
+TOWER_SFX = (
+    ("07_human_atk_sword_2.wav", 0.22),
+    ("26_sword_hit_1.wav", 0.20),
+    ("10_human_special_atk_1.wav", 0.22),
+    ("21_orc_damage_3.wav", 0.14),
+    ("Retro Weapon Arrow 02.wav", 0.22),
+    ("Retro Blop 07.wav", 0.18),
+    ("Retro Weapon Electric 05.wav", 0.20),
+)
+PROJECTILE_SFX = (
+    ("21_orc_damage_3.wav", 0.14),
+)
+
+
+def build_manifest() -> list[tuple[str, object, tuple]]:
+    """List every asset the game loads lazily as (label, loader, args)."""
+    manifest: list[tuple[str, object, tuple]] = []
+
+    for path in tilemap_asset_paths():
+        manifest.append(("tiles & decor", _load_image, (path,)))
+
+    for wave_num, enemy_types in ENEMY_TYPES_BY_WAVE.items():
+        for enemy_type in enemy_types:
+            size = enemy_sprite_draw_size(enemy_type)
+            manifest.append((f"wave {wave_num} {enemy_type}", get_scaled_enemy_frames, (wave_num, enemy_type, size)))
+
+    for tower_type in TROOP_DATA:
+        manifest.append((f"{tower_type} tower", _warm_tower, (tower_type,)))
+
+    for filename, volume in TOWER_SFX:
+        manifest.append(("sounds", _warm_sfx, (_get_tower_sfx, filename, volume)))
+    for filename, volume in PROJECTILE_SFX:
+        manifest.append(("sounds", _warm_sfx, (_get_projectile_sfx, filename, volume)))
+
+    return manifest
+
+
+def _warm_tower(tower_type: str) -> None:
+    get_tower_sprites(tower_type, tower_size=tower_sprite_draw_size(tower_type))
+    get_projectile_frames(tower_type, projectile_size=PROJECTILE_SPRITE_SIZE)
+
+
+def _warm_sfx(getter, filename: str, volume: float) -> None:
+    getter(filename, volume=volume)
+
+
+class Preloader:
+    """Run the preload manifest on a worker thread and report progress.
+
+    The caches being filled are plain dicts, so the game must not spawn
+    enemies/towers until `done` is True.
+    """
+
+    def __init__(self, manifest: list[tuple[str, object, tuple]] | None = None):
+        self.manifest = build_manifest() if manifest is None else manifest
+        self.total = len(self.manifest)
+        self.completed = 0
+        self.current_label = ""
+        self.done = self.total == 0
+        self.failed: list[str] = []
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None or self.done:
+            return
+        self._thread = threading.Thread(target=self._run, name="asset-preload", daemon=True)
+        self._thread.start()
+
+    def run_blocking(self) -> None:
+        """Load everything on the calling thread (headless tools, tests)."""
+        self._run()
+
+    def get_progress(self) -> float:
+        if self.total <= 0:
+            return 1.0
+        return self.completed / self.total
+
+    def _run(self) -> None:
+        for label, loader, args in self.manifest:
+            self.current_label = label
+            try:
+                loader(*args)
+            except Exception:
+                self.failed.append(label)
+            self.completed += 1
+        self.done = True
+
+
+
+class WorldPrebuild:
+    """Speculatively build one level's world on a worker thread.
+
+    `build(path)` runs off the main thread and returns whatever the game
+    needs to start that level; `release(result)` frees a result nobody will
+    use. The menu starts one of these for the highlighted level and
+    `discard()`s it when the selection moves; Play calls `take()`.
+    """
+
+    def __init__(self, path: str, build, release):
+        self.path = path
+        self._build = build
+        self._release = release
+        self._result = None
+        self._done = False
+        self._discarded = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="world-prebuild", daemon=True)
+        self._thread.start()
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def _run(self) -> None:
+        try:
+            result = self._build(self.path)
+        except Exception:
+            result = None
+        with self._lock:
+            self._done = True
+            if not self._discarded:
+                self._result = result
+                return
+        if result is not None:
+            self._release(result)
+
+    def take(self, *, wait: bool = True):
+        """Hand over the built result (waiting for it by default); None if it failed."""
+        if wait:
+            self._thread.join()
+        with self._lock:
+            if not self._done or self._discarded:
+                return None
+            result = self._result
+            self._result = None
+            self._discarded = True
+            return result
+
+    def discard(self) -> None:
+        """Drop the result; if the build is still running it is released when it ends."""
+        with self._lock:
+            if self._discarded:
+                return
+            self._discarded = True
+            result = self._result
+            self._result = None
+        if result is not None:
+            self._release(result)
@@ -0,0 +1,172 @@
+"""Present finished frames on a worker thread.
+
+Game.draw renders each frame into one of two back buffers. `submit` hands
+the finished buffer to the worker, which scales it to the window
+(letterboxed) and flips the display, while the main thread goes on to
+simulate and draw the next frame into the other buffer.
+pygame.transform.scale, blits and the flip release the GIL, so the two
+really run side by side. At most one frame is in flight: submitting frame
+N + 1 first waits for frame N to be on screen.
+
+Anything that replaces the window (set_mode on resize or fullscreen) must
+call `wait_idle` first. An exception in the worker is re-raised by the next
+`submit` or `wait_idle`, so a failed present crashes the game rather than
+leaving it waiting on a frame that never finishes.
+
+PresentStats records how long the worker spent presenting and how long
+the main thread had to wait for it. Their difference is the present time
+hidden behind the next frame's work; `overlap` is that as a share.
+"""
+import threading
+import time
+
+import pygame
+
+from settings import BLACK, SCREEN_HEIGHT, SCREEN_WIDTH
+
+
+def present_to_window(frame: pygame.Surface) -> None:
+    """Scale a logical-resolution frame into the window and flip."""
+    window = pygame.display.get_surface()
+    if window is None:
+        return
+    window_w, window_h = window.get_size()
+    scale = min(
+        window_w / SCREEN_WIDTH,
+        window_h / SCREEN_HEIGHT
+    )
+
+    scaled_w = int(SCREEN_WIDTH * scale)
+    scaled_h = int(SCREEN_HEIGHT * scale)
+
+    scaled_surface = pygame.transform.scale(
+        frame,
+        (scaled_w, scaled_h)
+    )
+
+    # Center the game (letterboxing)
+    x_offset = (window_w - scaled_w) // 2
+    y_offset = (window_h - scaled_h) // 2
+
+    window.fill(BLACK)
+    window.blit(scaled_surface, (x_offset, y_offset))
+
+    pygame.display.flip()
+
+
+class PresentStats:
+    """Totals and last-frame values of present time vs main-thread waiting."""
+
+    def __init__(self):
+        self.frames = 0
+        self.present_time = 0.0  # worker seconds spent scaling + flipping
+        self.wait_time = 0.0  # main-thread seconds blocked in submit()
+        self.last_present = 0.0
+        self.last_wait = 0.0
+
+    @property
+    def hidden_time(self) -> float:
+        return max(0.0, self.present_time - self.wait_time)
+
+    @property
+    def overlap(self) -> float:
+        """Share of present time that ran alongside the next frame (0..1)."""
+        if self.present_time <= 0.0:
+            return 0.0
+        return self.hidden_time / self.present_time
+
+    def summary(self) -> dict:
+        frames = max(1, self.frames)
+        return {
+            "frames": self.frames,
+            "present_ms": round(self.present_time / frames * 1000, 3),
+            "wait_ms": round(self.wait_time / frames * 1000, 3),
+            "hidden_ms": round(self.hidden_time / frames * 1000, 3),
+            "overlap": round(self.overlap, 3),
+        }
+
+
+class Presenter:
+    """Double-buffered frame presentation, on a worker thread if `threaded`."""
+
+    def __init__(self, size: tuple[int, int], *, threaded: bool = True):
+        self.buffers = [pygame.Surface(size), pygame.Surface(size)]
+        self._index = 0
+        self.threaded = threaded
+        self.stats = PresentStats()
+        self._pending: pygame.Surface | None = None
+        self._busy = False
+        self._error: BaseException | None = None  # raised by the worker; re-raised in submit()
+        self._cond = threading.Condition()
+        if threaded:
+            self._thread = threading.Thread(target=self._run, name="present", daemon=True)
+            self._thread.start()
+
+    @property
+    def back_buffer(self) -> pygame.Surface:
+        """The buffer the next frame should be drawn into."""
+        return self.buffers[self._index]
+
+    def submit(self) -> pygame.Surface:
+        """Present the back buffer; returns the buffer for the next frame."""
+        frame = self.buffers[self._index]
+        stats = self.stats
+        if not self.threaded:
+            start = time.perf_counter()
+            present_to_window(frame)
+            stats.last_present = stats.last_wait = time.perf_counter() - start
+            stats.present_time += stats.last_present
+            stats.wait_time += stats.last_wait
+            stats.frames += 1
+            return frame
+
+        start = time.perf_counter()
+        with self._cond:
+            while self._busy or self._pending is not None:
+                self._cond.wait()
+            self._raise_worker_error()
+            self._pending = frame
+            self._cond.notify_all()
+        stats.last_wait = time.perf_counter() - start
+        stats.wait_time += stats.last_wait
+        self._index ^= 1
+        return self.buffers[self._index]
+
+    def wait_idle(self) -> None:
+        with self._cond:
+            while self._busy or self._pending is not None:
+                self._cond.wait()
+            self._raise_worker_error()
+
+    def _raise_worker_error(self) -> None:
+        # Called with the lock held: a failed present surfaces on the main thread.
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        stats = self.stats
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                frame = self._pending
+                self._pending = None
+                self._busy = True
+            start = time.perf_counter()
+            error = None
+            try:
+                present_to_window(frame)
+            except pygame.error:
+                pass  # display went away (shutting down)
+            except Exception as exc:
+                error = exc
+            finally:
+                elapsed = time.perf_counter() - start
+                with self._cond:
+                    stats.last_present = elapsed
+                    stats.present_time += elapsed
+                    stats.frames += 1
+                    self._error = error
+                    self._busy = False
+                    self._cond.notify_all()
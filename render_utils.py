@@ -2,8 +2,11 @@ from __future__ import annotations
 
 import pygame
 
+from telemetry import cache_stats
+
 # Cache small alpha ellipse surfaces to avoid reallocating every frame.
 _SHADOW_CACHE: dict[tuple[int, int, int], pygame.Surface] = {}
+_SHADOW_CACHE_STATS = cache_stats("shadow")
 
 
 def get_ellipse_shadow_surface(width: int, height: int, alpha: int = 90) -> pygame.Surface:
@@ -15,7 +18,9 @@ def get_ellipse_shadow_surface(width: int, height: int, alpha: int = 90) -> pyga
     key = (width, height, alpha)
     surf = _SHADOW_CACHE.get(key)
     if surf is not None:
+        _SHADOW_CACHE_STATS.hits += 1
         return surf
+    _SHADOW_CACHE_STATS.misses += 1
 
     surf = pygame.Surface((width, height), pygame.SRCALPHA)
     pygame.draw.ellipse(surf, (0, 0, 0, alpha), surf.get_rect())
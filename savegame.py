@@ -0,0 +1,489 @@
+"""Quick save / resume of a game in progress.
+
+A save covers the live state `Game._init_world` sets up that changes during
+play: the tiles after tower placements, towers with their timers, enemies
+with path progress and status timers, projectiles, landed and flying coins,
+the player's gold/health/inventory, castle HP and where the wave manager is
+in its timeline. Everything else (camera, shop, keepers, decor layers) is
+rebuilt from the level file on resume.
+
+Saving is split so the game thread only pays for a copy:
+
+    capture(game)   game thread; shallow copies of the ECS columns and a few
+                    scalars. Every copied element is immutable (numbers,
+                    strings, tuples), so the copy is a copy-on-write snapshot
+                    the simulation can keep mutating right away.
+    SaveWriter      worker thread; encodes the snapshot and writes the file.
+
+File format (.sav)
+
+    header   magic "NWSV", version, section count, body size
+    body     zlib of the sections: 4-byte tag, u32 size, payload
+             (tags below; strings are u16 indices into the STRS table)
+"""
+import os
+import struct
+import threading
+import zlib
+
+from settings import TILE_SIZE
+from world.systems import ENEMY, PROJECTILE
+
+SAVE_VERSION = 1
+SAVE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "saves")
+QUICKSAVE_PATH = os.path.join(SAVE_DIR, "quicksave.sav")
+AUTOSAVE_PATH = os.path.join(SAVE_DIR, "autosave.sav")
+
+_SAVE_MAGIC = b"NWSV"
+# magic, version, section count, body size (before zlib)
+_SAVE_HEADER = struct.Struct("<4sHHI")
+# tag, payload size
+_SAVE_SECTION = struct.Struct("<4sI")
+_COUNT = struct.Struct("<I")
+_NO_STRING = 0xFFFF
+
+# level path, castle hp, castle max hp, game speed, placement cooldown, endless
+_GAME = struct.Struct("<HqqBdB")
+# current wave, wave time, timeline cursor, spawning, finished, announcement, announcement timer
+_WAVE = struct.Struct("<IdIBBBd")
+# tile x, tile y, gold, health, max health, damage cooldown, direction, selected slot
+_PLAYER = struct.Struct("<iiqdddHb")
+# tower type, quantity
+_SLOT = struct.Struct("<HB")
+_GRID = struct.Struct("<II")
+# tile x, tile y, type, timer, attack timer, direction
+_TOWER = struct.Struct("<iiHddH")
+# id, path index, x, y, speed, base speed, health, max health, reward, type,
+# sprite wave, flags, slow timer, stun timer, direction, anim timer, anim frame
+_ENEMY = struct.Struct("<IIddddddiHHBddHdH")
+# x, y, target id, speed, damage, slow, source, anim timer, anim frame, last dx, last dy
+_PROJECTILE = struct.Struct("<ddIdddHdHdd")
+# tile x, tile y, count, value
+_STACK = struct.Struct("<iiIq")
+# start x, start y, target x, target y, elapsed, kind, value, tile x, tile y
+_PARTICLE = struct.Struct("<dddddBqii")
+
+_ENEMY_FIELDS = (
+    "path_index", "pos_x", "pos_y", "speed", "base_speed", "health", "max_health", "reward", "enemy_type",
+    "wave_num", "killed_by_tower", "has_been_stunned", "slow_timer", "stun_timer", "direction",
+    "anim_timer", "anim_frame",
+)
+_PROJECTILE_FIELDS = (
+    "x", "y", "target", "proj_speed", "damage", "slow_duration", "source_type", "anim_timer", "anim_frame",
+    "last_dx", "last_dy",
+)
+_PARTICLE_FIELDS = ("start_x", "start_y", "target_x", "target_y", "elapsed", "kind", "value", "tile")
+
+
+class SaveError(ValueError):
+    """The save file is missing, corrupt or doesn't fit the level."""
+
+
+# ---------------------------------------------------------------------------
+# Capture (game thread)
+# ---------------------------------------------------------------------------
+def _columns(world, query: tuple[str, ...], fields: tuple[str, ...]) -> list[tuple[list[int], list[list]]]:
+    return [
+        (list(arch.ids), [list(arch.columns[name]) for name in fields])
+        for arch in world.query(*query)
+    ]
+
+
+def capture(game) -> dict:
+    """Snapshot of `game` that stays valid while the game keeps running."""
+    wm = game.wave_manager
+    player = game.player
+    inventory = player.inventory
+    particles = game.coin_manager.particles
+    return {
+        "level_path": game.level_path or "",
+        "castle_hp": game.castle_hp,
+        "castle_max_hp": game.castle_max_hp,
+        "game_speed": game.game_speed,
+        "placement_cooldown": game.placement_cooldown,
+        "endless": game.endless_mode,
+        "wave": (
+            wm.current_wave, wm.wave_time, wm._cursor, wm.spawning, wm.wave_finished,
+            wm.show_announcement, wm.announcement_timer,
+        ),
+        "player": (
+            player.tile_x, player.tile_y, player.gold, player.health, player.max_health,
+            player.damage_cooldown, player.direction,
+        ),
+        "slots": list(inventory.slots),
+        "quantities": dict(inventory.quantities),
+        "selected_slot": inventory.selected_slot,
+        "grid": (game.tilemap.width, game.tilemap.height, bytes(game.tilemap.grid.ids)),
+        "towers": [(t.tile_x, t.tile_y, t.type, t.timer, t.attack_timer, t.direction) for t in game.towers],
+        "enemies": _columns(game.world, ENEMY, _ENEMY_FIELDS),
+        "projectiles": _columns(game.world, PROJECTILE, _PROJECTILE_FIELDS),
+        "stacks": [(tx, ty, s.count, s.value) for (tx, ty), s in game.coin_manager.coins.items()],
+        "particles": [list(getattr(particles, name)) for name in _PARTICLE_FIELDS],
+    }
+
+
+# ---------------------------------------------------------------------------
+# Encoding (any thread)
+# ---------------------------------------------------------------------------
+class _Strings:
+    def __init__(self):
+        self.table: list[str] = []
+        self._index: dict[str, int] = {}
+
+    def __call__(self, value: str | None) -> int:
+        if value is None:
+            return _NO_STRING
+        index = self._index.get(value)
+        if index is None:
+            index = len(self.table)
+            self.table.append(value)
+            self._index[value] = index
+        return index
+
+    def encode(self) -> bytes:
+        out = [_COUNT.pack(len(self.table))]
+        for value in self.table:
+            raw = value.encode("utf-8")
+            out.append(struct.pack("<H", len(raw)) + raw)
+        return b"".join(out)
+
+
+def _rows(record: struct.Struct, rows) -> bytes:
+    rows = list(rows)
+    return _COUNT.pack(len(rows)) + b"".join(record.pack(*row) for row in rows)
+
+
+def encode_save(snapshot: dict) -> bytes:
+    s = _Strings()
+    sections: list[tuple[bytes, bytes]] = []
+
+    sections.append((b"GAME", _GAME.pack(
+        s(snapshot["level_path"]), snapshot["castle_hp"], snapshot["castle_max_hp"], snapshot["game_speed"],
+        snapshot["placement_cooldown"], snapshot["endless"],
+    )))
+    sections.append((b"WAVE", _WAVE.pack(*snapshot["wave"])))
+
+    tx, ty, gold, health, max_health, cooldown, direction = snapshot["player"]
+    selected = snapshot["selected_slot"]
+    quantities = snapshot["quantities"]
+    player = _PLAYER.pack(
+        tx, ty, gold, health, max_health, cooldown, s(direction), -1 if selected is None else selected
+    )
+    player += _rows(_SLOT, ((s(t), quantities.get(t, 0) if t else 0) for t in snapshot["slots"]))
+    sections.append((b"PLYR", player))
+
+    width, height, ids = snapshot["grid"]
+    sections.append((b"TILE", _GRID.pack(width, height) + ids))
+
+    sections.append((b"TOWR", _rows(_TOWER, (
+        (tx, ty, s(kind), timer, attack_timer, s(direction))
+        for tx, ty, kind, timer, attack_timer, direction in snapshot["towers"]
+    ))))
+
+    enemies = []
+    for ids, cols in snapshot["enemies"]:
+        for eid, (
+            path_index, x, y, speed, base_speed, health, max_health, reward, kind, wave_num,
+            killed, stunned, slow_timer, stun_timer, direction, anim_timer, anim_frame,
+        ) in zip(ids, zip(*cols)):
+            enemies.append((
+                eid, path_index, x, y, speed, base_speed, health, max_health, reward, s(kind), wave_num,
+                bool(killed) | bool(stunned) << 1, slow_timer, stun_timer, s(direction), anim_timer, anim_frame,
+            ))
+    sections.append((b"ENMY", _rows(_ENEMY, enemies)))
+
+    projectiles = []
+    for _ids, cols in snapshot["projectiles"]:
+        for x, y, target, speed, damage, slow, source, anim_timer, anim_frame, last_dx, last_dy in zip(*cols):
+            projectiles.append((x, y, target, speed, damage, slow, s(source), anim_timer, anim_frame, last_dx, last_dy))
+    sections.append((b"PROJ", _rows(_PROJECTILE, projectiles)))
+
+    coins = _rows(_STACK, snapshot["stacks"])
+    coins += _rows(_PARTICLE, (
+        (sx, sy, gx, gy, elapsed, kind, value, tile[0], tile[1])
+        for sx, sy, gx, gy, elapsed, kind, value, tile in zip(*snapshot["particles"])
+    ))
+    sections.append((b"COIN", coins))
+
+    # The string table is filled while packing the rest, so it goes in last.
+    sections.append((b"STRS", s.encode()))
+    body = b"".join(_SAVE_SECTION.pack(tag, len(payload)) + payload for tag, payload in sections)
+    header = _SAVE_HEADER.pack(_SAVE_MAGIC, SAVE_VERSION, len(sections), len(body))
+    return header + zlib.compress(body, 1)
+
+
+def _read_rows(record: struct.Struct, data: bytes, offset: int) -> tuple[list[tuple], int]:
+    (n,) = _COUNT.unpack_from(data, offset)
+    offset += _COUNT.size
+    rows = list(record.iter_unpack(data[offset:offset + n * record.size]))
+    return rows, offset + n * record.size
+
+
+def decode_save(data: bytes) -> dict:
+    """Inverse of encode_save: the snapshot, with strings resolved."""
+    try:
+        magic, version, count, size = _SAVE_HEADER.unpack_from(data, 0)
+        if magic != _SAVE_MAGIC or version != SAVE_VERSION:
+            raise SaveError("not a save file (or from another version)")
+        body = zlib.decompress(data[_SAVE_HEADER.size:])
+        if len(body) != size:
+            raise SaveError("truncated save file")
+
+        sections: dict[bytes, bytes] = {}
+        offset = 0
+        for _ in range(count):
+            tag, length = _SAVE_SECTION.unpack_from(body, offset)
+            offset += _SAVE_SECTION.size
+            sections[tag] = body[offset:offset + length]
+            offset += length
+
+        raw = sections[b"STRS"]
+        (n,) = _COUNT.unpack_from(raw, 0)
+        strings: list[str | None] = []
+        pos = _COUNT.size
+        for _ in range(n):
+            (length,) = struct.unpack_from("<H", raw, pos)
+            pos += 2
+            strings.append(raw[pos:pos + length].decode("utf-8"))
+            pos += length
+
+        def string(index: int) -> str | None:
+            return None if index == _NO_STRING else strings[index]
+
+        level_path, castle_hp, castle_max_hp, game_speed, cooldown, endless = _GAME.unpack(sections[b"GAME"])
+        current_wave, wave_time, cursor, spawning, finished, announcing, timer = _WAVE.unpack(sections[b"WAVE"])
+
+        raw = sections[b"PLYR"]
+        tx, ty, gold, health, max_health, damage_cooldown, direction, selected = _PLAYER.unpack_from(raw, 0)
+        slots, _ = _read_rows(_SLOT, raw, _PLAYER.size)
+
+        width, height = _GRID.unpack_from(sections[b"TILE"], 0)
+        ids = sections[b"TILE"][_GRID.size:]
+        if len(ids) != width * height:
+            raise SaveError("tile data doesn't match the map size")
+
+        towers, _ = _read_rows(_TOWER, sections[b"TOWR"], 0)
+        enemies, _ = _read_rows(_ENEMY, sections[b"ENMY"], 0)
+        projectiles, _ = _read_rows(_PROJECTILE, sections[b"PROJ"], 0)
+        stacks, pos = _read_rows(_STACK, sections[b"COIN"], 0)
+        particles, _ = _read_rows(_PARTICLE, sections[b"COIN"], pos)
+
+        # Resolve the string indices here too, so a bad one is a SaveError.
+        return {
+            "level_path": string(level_path),
+            "castle_hp": castle_hp,
+            "castle_max_hp": castle_max_hp,
+            "game_speed": game_speed,
+            "placement_cooldown": cooldown,
+            "endless": bool(endless),
+            "wave": (current_wave, wave_time, cursor, bool(spawning), bool(finished), bool(announcing), timer),
+            "player": (tx, ty, gold, health, max_health, damage_cooldown, string(direction)),
+            "slots": [(string(kind), quantity) for kind, quantity in slots],
+            "selected_slot": None if selected < 0 else selected,
+            "grid": (width, height, ids),
+            "towers": [(tx, ty, string(kind), t, at, string(d)) for tx, ty, kind, t, at, d in towers],
+            "enemies": [
+                row[:9] + (string(row[9]),) + row[10:14] + (string(row[14]),) + row[15:] for row in enemies
+            ],
+            "projectiles": [row[:6] + (string(row[6]),) + row[7:] for row in projectiles],
+            "stacks": stacks,
+            "particles": particles,
+        }
+    except (KeyError, IndexError, UnicodeDecodeError, struct.error, zlib.error) as exc:
+        raise SaveError(f"corrupt save file: {exc}") from None
+
+
+def read_save(path: str) -> dict:
+    try:
+        with open(path, "rb") as file:
+            return decode_save(file.read())
+    except OSError as exc:
+        raise SaveError(f"can't read {path}: {exc.strerror}") from None
+
+
+# ---------------------------------------------------------------------------
+# Restore (game thread, onto a world freshly built from the same level)
+# ---------------------------------------------------------------------------
+def check_level(save: dict, level_grid) -> None:
+    """Raise SaveError if `level_grid` can't host this save (call before touching the world)."""
+    width, height, _ids = save["grid"]
+    if (len(level_grid[0]) if level_grid else 0, len(level_grid)) != (width, height):
+        raise SaveError("the level has changed size since this save")
+
+
+def restore(game, save: dict) -> None:
+    """Apply a decoded save to `game` right after `_init_world(save's level)`."""
+    from coins import CoinStack
+    from entities.enemy import spawn_enemy
+    from entities.projectile import spawn_projectile
+    from entities.tower import Tower
+
+    tilemap = game.tilemap
+    width, height, ids = save["grid"]
+    if (width, height) != (tilemap.width, tilemap.height):
+        raise SaveError("the level has changed size since this save")
+
+    # Towers, replaying their placements so the tile visuals match; then any
+    # tile that still differs is set directly.
+    for tx, ty, kind, timer, attack_timer, direction in save["towers"]:
+        tower = Tower((tx, ty), kind)
+        tower.timer = timer
+        tower.attack_timer = attack_timer
+        tower.direction = direction
+        game.towers.append(tower)
+        tilemap.apply_tower_placement(tx, ty)
+    grid = tilemap.grid
+    if bytes(grid.ids) != ids:
+        for i, (have, want) in enumerate(zip(grid.ids, ids)):
+            if have != want:
+                tx, ty = i % width, i // width
+                tilemap.tiles[ty][tx] = want
+                grid.set_tile(tx, ty, want)
+                tilemap.invalidate_chunks_around(tx, ty)
+        tilemap._path_points = None
+
+    # Enemies walk the route the wave manager hands out; ids are new, so
+    # projectile targets are mapped across.
+    world = game.world
+    path = game.wave_manager.path_points
+    new_ids: dict[int, int] = {}
+    for (
+        eid, path_index, x, y, speed, base_speed, health, max_health, reward, kind, wave_num,
+        flags, slow_timer, stun_timer, direction, anim_timer, anim_frame,
+    ) in save["enemies"]:
+        new = spawn_enemy(world, path, max_health, base_speed / 3.0, reward, enemy_type=kind, wave_num=wave_num)
+        arch, row = world.locate(new)
+        c = arch.columns
+        c["path_index"][row] = min(path_index, len(path) - 1)
+        c["pos_x"][row] = x
+        c["pos_y"][row] = y
+        c["tile_x"][row] = int(x // TILE_SIZE)
+        c["tile_y"][row] = int(y // TILE_SIZE)
+        c["speed"][row] = speed
+        c["health"][row] = health
+        c["killed_by_tower"][row] = bool(flags & 1)
+        c["has_been_stunned"][row] = bool(flags & 2)
+        c["slow_timer"][row] = slow_timer
+        c["stun_timer"][row] = stun_timer
+        c["direction"][row] = direction
+        c["anim_timer"][row] = anim_timer
+        c["anim_frame"][row] = anim_frame
+        new_ids[eid] = new
+
+    for x, y, target, speed, damage, slow, source, anim_timer, anim_frame, last_dx, last_dy in save["projectiles"]:
+        if target not in new_ids:
+            continue
+        new = spawn_projectile(world, x, y, new_ids[target], damage=damage, slow_duration=slow, source_type=source)
+        arch, row = world.locate(new)
+        c = arch.columns
+        c["proj_speed"][row] = speed
+        c["anim_timer"][row] = anim_timer
+        c["anim_frame"][row] = anim_frame
+        c["last_dx"][row] = last_dx
+        c["last_dy"][row] = last_dy
+
+    # Coins
+    coins = game.coin_manager
+    for tx, ty, count, value in save["stacks"]:
+        stack = CoinStack()
+        stack.add(value, count)
+        coins.coins[(tx, ty)] = stack
+    particles = coins.particles
+    for sx, sy, gx, gy, elapsed, kind, value, tx, ty in save["particles"]:
+        particles.spawn(kind, sx, sy, gx, gy, value, (tx, ty))
+        particles.elapsed[-1] = elapsed
+
+    # Player and inventory
+    player = game.player
+    tx, ty, gold, health, max_health, damage_cooldown, direction = save["player"]
+    player.set_tile(tx, ty)
+    player.pos_x, player.pos_y = player.target_x, player.target_y
+    player.rect.topleft = (player.pos_x, player.pos_y)
+    player.gold = gold
+    player.health = health
+    player.max_health = max_health
+    player.damage_cooldown = damage_cooldown
+    player.direction = direction
+    inventory = player.inventory
+    inventory.slots = [kind for kind, _quantity in save["slots"]]
+    inventory.quantities = {kind: quantity for kind, quantity in save["slots"] if kind}
+    inventory.selected_slot = save["selected_slot"]
+    game.camera.set_target(player.rect.center)
+    game.camera.pos.update(player.rect.center)
+
+    # Wave manager: recompile the saved wave and put the cursor back.
+    wm = game.wave_manager
+    current_wave, wave_time, cursor, spawning, finished, announcing, timer = save["wave"]
+    wm.start_wave(current_wave)
+    wm.wave_time = wave_time
+    wm._cursor = min(cursor, len(wm.timeline))
+    wm.enemies_to_spawn = len(wm.timeline) - wm._cursor
+    wm.spawning = spawning
+    wm.wave_finished = finished
+    wm.show_announcement = announcing
+    wm.announcement_timer = timer
+
+    game.castle_hp = save["castle_hp"]
+    game.castle_max_hp = save["castle_max_hp"]
+    game.placement_cooldown = save["placement_cooldown"]
+    game.game_speed = save["game_speed"]
+
+
+# ---------------------------------------------------------------------------
+# Background writer
+# ---------------------------------------------------------------------------
+class SaveWriter:
+    """Encode and write snapshots on a worker thread; the newest pending one per path wins."""
+
+    def __init__(self):
+        self.error = ""
+        self.last_path = ""
+        self._pending: dict[str, dict] = {}
+        self._done: list[tuple[str, str]] = []  # (path, error or "") per finished write
+        self._busy = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="game-save", daemon=True)
+        self._thread.start()
+
+    @property
+    def saving(self) -> bool:
+        return self._busy or bool(self._pending)
+
+    def request(self, path: str, snapshot: dict) -> None:
+        with self._cond:
+            self._pending[path] = snapshot
+            self._cond.notify_all()
+
+    def wait_idle(self) -> None:
+        with self._cond:
+            while self._busy or self._pending:
+                self._cond.wait()
+
+    def results(self) -> list[tuple[str, str]]:
+        """(path, error) for every write finished since the last call; error is "" on success."""
+        with self._cond:
+            done, self._done = self._done, []
+        return done
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                path, snapshot = self._pending.popitem()
+                self._busy = True
+            tmp_path = path + ".tmp"
+            try:
+                data = encode_save(snapshot)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(tmp_path, "wb") as file:
+                    file.write(data)
+                os.replace(tmp_path, path)
+                self.last_path = path
+                self.error = ""
+            except (OSError, ValueError, struct.error) as exc:
+                self.error = str(exc)
+            with self._cond:
+                self._done.append((path, self.error))
+                self._busy = False
+                self._cond.notify_all()
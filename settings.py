@@ -1,3 +1,5 @@
+import sys
+
 # ===============================
 # Window (LOGICAL resolution)
 # ===============================
@@ -12,6 +14,26 @@ TITLE = "No Way Through"
 # ===============================
 FPS = 60
 
+# Run waves/combat in a child process and only render here
+# (world/sim_process.py; also `python main.py --sim-process`).
+SIM_IN_PROCESS = False
+
+# Scale + flip finished frames on a worker thread (presenter.py). macOS only
+# lets the main thread touch the window.
+PRESENT_IN_THREAD = sys.platform != "darwin"
+
+# Stream the match to spectator_viewer.py on localhost (spectator.py; also
+# `python main.py --spectate`). Snapshots over the budget are sent less often.
+SPECTATE = False
+SPECTATOR_HOST = "127.0.0.1"
+SPECTATOR_PORT = 47460
+SPECTATOR_BUDGET_MS = 0.5
+
+# Per-second frame-time histograms, entity counts, cache hit rates and game
+# events in .cache/telemetry/telemetry.jsonl (telemetry.py;
+# `python telemetry_report.py` summarizes them).
+TELEMETRY = True
+
 # ===============================
 # Pixel Art Font
 # ===============================
@@ -0,0 +1,509 @@
+"""Local spectator stream: mirror a live match on a second screen.
+
+The game publishes a cheap snapshot of the match once per frame
+(`capture_state`); a SpectatorServer running an asyncio loop on its own
+thread picks up the newest one every SEND_INTERVAL and turns it into a
+compact binary stream for every connected viewer (spectator_viewer.py) on
+localhost. The game thread never wakes the loop itself: that hands the
+server the GIL in the middle of a frame.
+
+Stream: messages of (u8 kind, u32 size, payload)
+
+    HELLO     magic "NWSP", version, map width/height, zlib tile ids of the
+              level as it started (towers placed since then come with the
+              towers, and the viewer replays their placement)
+    KEYFRAME  match state, then every enemy, projectile and tower in full
+    DELTA     match state, then per kind: removed ids, new or
+              hard-to-diff entities in full, and small updates for the rest
+
+Positions are sent in 1/4 pixel units; a delta moves an entity by an int16
+step from the position last *sent*, so rounding never accumulates. Updates
+carry a mask of what changed (position, health, look) and nothing else.
+
+The game thread only pays for the snapshot, and if that goes over
+SPECTATOR_BUDGET_MS it publishes every other frame (or less often) instead.
+
+New viewers start with HELLO + KEYFRAME; a keyframe also goes out every
+KEYFRAME_INTERVAL ticks and to any viewer that fell behind. A viewer with
+more than MAX_CLIENT_BACKLOG bytes still queued is sent nothing at all until
+its buffer drains, then gets one keyframe.
+
+Enemy and projectile ids are the entity ids of world/ecs.py (row numbers in
+the simulation-process mode, which has no ids on this side).
+"""
+import asyncio
+import math
+import struct
+import threading
+import time
+import zlib
+
+from settings import SPECTATOR_BUDGET_MS, SPECTATOR_HOST, SPECTATOR_PORT
+from world.sim_process import DIRECTIONS, ENEMY_TYPES, SOURCES
+from world.systems import ENEMY, PROJECTILE
+
+PROTOCOL_VERSION = 1
+KEYFRAME_INTERVAL = 300  # ticks
+SEND_INTERVAL = 1 / 60  # seconds between checks for a new snapshot
+MAX_CLIENT_BACKLOG = 1 << 20  # bytes queued for a viewer before it is skipped
+UNITS_PER_PIXEL = 4
+COST_SMOOTHING = 0.1  # weight of the newest snapshot time in publish_cost
+
+MSG_HELLO = 1
+MSG_KEYFRAME = 2
+MSG_DELTA = 3
+
+UPDATE_POS = 1
+UPDATE_HEALTH = 2
+UPDATE_LOOK = 4
+
+_MESSAGE = struct.Struct("<BI")
+MESSAGE_HEADER_SIZE = _MESSAGE.size
+# magic, version, width, height
+_HELLO = struct.Struct("<4sHII")
+# tick, wave, max waves, gold, castle hp, castle max hp, player x, player y
+_STATE = struct.Struct("<IHHqqqii")
+_COUNT = struct.Struct("<I")
+_ID = struct.Struct("<I")
+# id, x, y, health, max health, type, sprite wave, direction, anim frame
+_ENEMY = struct.Struct("<IiiffBBBB")
+# id, x, y, source
+_PROJECTILE = struct.Struct("<IiiB")
+# index, tile x, tile y, type, direction, anim frame, attacking
+_TOWER = struct.Struct("<HhhBBBB")
+# id, UPDATE_* mask; followed by the fields the mask names
+_UPDATE = struct.Struct("<IB")
+_STEP = struct.Struct("<hh")
+_HEALTH = struct.Struct("<f")
+_LOOK = struct.Struct("<BB")
+
+
+def _unit(value: float) -> int:
+    return int(round(value * UNITS_PER_PIXEL))
+
+
+def _fits_step(dx: int, dy: int) -> bool:
+    return -32768 <= dx <= 32767 and -32768 <= dy <= 32767
+
+
+# ---------------------------------------------------------------------------
+# Capture (game thread)
+# ---------------------------------------------------------------------------
+def capture_state(game, tick: int) -> tuple:
+    """Quantized match state: (state row, enemies, projectiles, towers)."""
+    sim = game.sim_process
+    if sim is not None:
+        frame = sim.frame
+        enemies = {
+            i: (_unit(x), _unit(y), health, max_health, kind, art, direction, frame_no & 0xFF)
+            for i, (x, y, health, max_health, _stun, kind, art, direction, frame_no) in enumerate(frame.enemies)
+        }
+        projectiles = {
+            i: (_unit(x), _unit(y), source)
+            for i, (x, y, _dx, _dy, source, _frame) in enumerate(frame.projectiles)
+        }
+    else:
+        enemies = {}
+        for arch in game.world.query(*ENEMY):
+            c = arch.columns
+            for eid, x, y, health, max_health, kind, art, direction, frame_no in zip(
+                arch.ids, c["pos_x"], c["pos_y"], c["health"], c["max_health"], c["enemy_type"], c["wave_num"],
+                c["direction"], c["anim_frame"],
+            ):
+                enemies[eid] = (
+                    _unit(x), _unit(y), health, max_health, _code(ENEMY_TYPES, kind), art,
+                    _code(DIRECTIONS, direction), frame_no & 0xFF,
+                )
+        projectiles = {}
+        for arch in game.world.query(*PROJECTILE):
+            c = arch.columns
+            for pid, x, y, source in zip(arch.ids, c["x"], c["y"], c["source_type"]):
+                projectiles[pid] = (_unit(x), _unit(y), _code(SOURCES, source))
+
+    towers = [
+        (t.tile_x, t.tile_y, _code(SOURCES, t.type), _code(DIRECTIONS, t.direction), t._anim_frame & 0xFF,
+         t.attack_timer > 0)
+        for t in game.towers
+    ]
+    wm = game.wave_manager
+    px, py = game.player.rect.center
+    state = (
+        tick, wm.current_wave, wm.max_waves, int(game.player.gold), int(game.castle_hp), int(game.castle_max_hp),
+        _unit(px), _unit(py),
+    )
+    return state, enemies, projectiles, towers
+
+
+def _code(table: tuple[str, ...], value: str) -> int:
+    try:
+        return table.index(value)
+    except ValueError:
+        return 0
+
+
+# ---------------------------------------------------------------------------
+# Encoding (server thread)
+# ---------------------------------------------------------------------------
+def _message(kind: int, payload: bytes) -> bytes:
+    return _MESSAGE.pack(kind, len(payload)) + payload
+
+
+def encode_hello(width: int, height: int, tiles: bytes) -> bytes:
+    return _message(MSG_HELLO, _HELLO.pack(b"NWSP", PROTOCOL_VERSION, width, height) + zlib.compress(tiles))
+
+
+def _full_towers(towers, start: int = 0) -> list[bytes]:
+    return [_TOWER.pack(start + i, *tower) for i, tower in enumerate(towers[start:])]
+
+
+def encode_keyframe(snapshot: tuple) -> bytes:
+    state, enemies, projectiles, towers = snapshot
+    out = [_STATE.pack(*state), _COUNT.pack(len(enemies))]
+    out += [_ENEMY.pack(eid, *row) for eid, row in enemies.items()]
+    out.append(_COUNT.pack(len(projectiles)))
+    out += [_PROJECTILE.pack(pid, *row) for pid, row in projectiles.items()]
+    out.append(_COUNT.pack(len(towers)))
+    out += _full_towers(towers)
+    return _message(MSG_KEYFRAME, b"".join(out))
+
+
+def encode_delta(previous: tuple, snapshot: tuple) -> bytes:
+    state, enemies, projectiles, towers = snapshot
+    _state, old_enemies, old_projectiles, old_towers = previous
+    out = [_STATE.pack(*state)]
+
+    # Enemies: removed, full rows, masked updates
+    removed = [eid for eid in old_enemies if eid not in enemies]
+    full: list[bytes] = []
+    updates: list[bytes] = []
+    for eid, row in enemies.items():
+        old = old_enemies.get(eid)
+        if old is None or old[4:6] != row[4:6]:
+            full.append(_ENEMY.pack(eid, *row))
+            continue
+        if old == row:
+            continue
+        dx = row[0] - old[0]
+        dy = row[1] - old[1]
+        if not _fits_step(dx, dy) or row[3] != old[3]:
+            full.append(_ENEMY.pack(eid, *row))
+            continue
+        mask = 0
+        fields = []
+        if dx or dy:
+            mask |= UPDATE_POS
+            fields.append(_STEP.pack(dx, dy))
+        if row[2] != old[2]:
+            mask |= UPDATE_HEALTH
+            fields.append(_HEALTH.pack(row[2]))
+        if row[6:8] != old[6:8]:
+            mask |= UPDATE_LOOK
+            fields.append(_LOOK.pack(row[6], row[7]))
+        updates.append(_UPDATE.pack(eid, mask) + b"".join(fields))
+    out.append(_COUNT.pack(len(removed)) + b"".join(_ID.pack(eid) for eid in removed))
+    out.append(_COUNT.pack(len(full)) + b"".join(full))
+    out.append(_COUNT.pack(len(updates)) + b"".join(updates))
+
+    # Projectiles: removed, full rows, moves
+    removed = [pid for pid in old_projectiles if pid not in projectiles]
+    full = []
+    moves = []
+    for pid, row in projectiles.items():
+        old = old_projectiles.get(pid)
+        dx = dy = 0
+        if old is not None:
+            dx = row[0] - old[0]
+            dy = row[1] - old[1]
+        if old is None or old[2] != row[2] or not _fits_step(dx, dy):
+            full.append(_PROJECTILE.pack(pid, *row))
+        elif dx or dy:
+            moves.append(_ID.pack(pid) + _STEP.pack(dx, dy))
+    out.append(_COUNT.pack(len(removed)) + b"".join(_ID.pack(pid) for pid in removed))
+    out.append(_COUNT.pack(len(full)) + b"".join(full))
+    out.append(_COUNT.pack(len(moves)) + b"".join(moves))
+
+    # Towers only ever get added; send new ones and any whose look changed.
+    changed = [
+        _TOWER.pack(i, *tower)
+        for i, tower in enumerate(towers)
+        if i >= len(old_towers) or old_towers[i] != tower
+    ]
+    out.append(_COUNT.pack(len(changed)) + b"".join(changed))
+    return _message(MSG_DELTA, b"".join(out))
+
+
+# ---------------------------------------------------------------------------
+# Decoding (viewer)
+# ---------------------------------------------------------------------------
+class SpectatorState:
+    """The match as last received; apply() each message in order."""
+
+    def __init__(self):
+        self.width = 0
+        self.height = 0
+        self.tiles = b""
+        self.level_serial = 0  # bumped by every HELLO
+        self.tick = 0
+        self.wave = 0
+        self.max_waves = 0
+        self.gold = 0
+        self.castle_hp = 0
+        self.castle_max_hp = 0
+        self.player = (0.0, 0.0)
+        self.enemies: dict[int, list] = {}  # id -> [x, y, health, max health, type, art, direction, frame]
+        self.projectiles: dict[int, list] = {}  # id -> [x, y, source]
+        self.towers: list[tuple] = []  # (tile x, tile y, type, direction, frame, attacking)
+        self.keyframes = 0
+        self.deltas = 0
+
+    def apply(self, kind: int, payload: bytes) -> None:
+        if kind == MSG_HELLO:
+            magic, version, self.width, self.height = _HELLO.unpack_from(payload, 0)
+            if magic != b"NWSP" or version != PROTOCOL_VERSION:
+                raise ValueError("not a spectator stream (or another version)")
+            self.tiles = zlib.decompress(payload[_HELLO.size:])
+            self.level_serial += 1
+            self.enemies.clear()
+            self.projectiles.clear()
+            self.towers = []
+            return
+        offset = self._read_state(payload)
+        if kind == MSG_KEYFRAME:
+            self.keyframes += 1
+            self.enemies, offset = self._read_full(_ENEMY, payload, offset)
+            self.projectiles, offset = self._read_full(_PROJECTILE, payload, offset)
+            self.towers = []
+            self._read_towers(payload, offset)
+        elif kind == MSG_DELTA:
+            self.deltas += 1
+            offset = self._read_delta(self.enemies, _ENEMY, payload, offset, masked=True)
+            offset = self._read_delta(self.projectiles, _PROJECTILE, payload, offset, masked=False)
+            self._read_towers(payload, offset)
+
+    def _read_state(self, payload: bytes) -> int:
+        (
+            self.tick, self.wave, self.max_waves, self.gold, self.castle_hp, self.castle_max_hp, px, py,
+        ) = _STATE.unpack_from(payload, 0)
+        self.player = (px / UNITS_PER_PIXEL, py / UNITS_PER_PIXEL)
+        return _STATE.size
+
+    @staticmethod
+    def _read_full(record: struct.Struct, payload: bytes, offset: int) -> tuple[dict[int, list], int]:
+        (n,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        rows = {}
+        for row in record.iter_unpack(payload[offset:offset + n * record.size]):
+            rows[row[0]] = list(row[1:])
+        return rows, offset + n * record.size
+
+    def _read_delta(self, items: dict, record: struct.Struct, payload: bytes, offset: int, *, masked: bool) -> int:
+        (n,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        for _ in range(n):
+            items.pop(_ID.unpack_from(payload, offset)[0], None)
+            offset += _ID.size
+        full, offset = self._read_full(record, payload, offset)
+        items.update(full)
+
+        (n,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        for _ in range(n):
+            if masked:
+                eid, mask = _UPDATE.unpack_from(payload, offset)
+                offset += _UPDATE.size
+            else:
+                (eid,) = _ID.unpack_from(payload, offset)
+                offset += _ID.size
+                mask = UPDATE_POS
+            row = items.get(eid)
+            if mask & UPDATE_POS:
+                dx, dy = _STEP.unpack_from(payload, offset)
+                offset += _STEP.size
+                if row is not None:
+                    row[0] += dx
+                    row[1] += dy
+            if mask & UPDATE_HEALTH:
+                (health,) = _HEALTH.unpack_from(payload, offset)
+                offset += _HEALTH.size
+                if row is not None:
+                    row[2] = health
+            if mask & UPDATE_LOOK:
+                direction, frame = _LOOK.unpack_from(payload, offset)
+                offset += _LOOK.size
+                if row is not None:
+                    row[6] = direction
+                    row[7] = frame
+        return offset
+
+    def _read_towers(self, payload: bytes, offset: int) -> None:
+        (n,) = _COUNT.unpack_from(payload, offset)
+        offset += _COUNT.size
+        for index, *tower in _TOWER.iter_unpack(payload[offset:offset + n * _TOWER.size]):
+            if index < len(self.towers):
+                self.towers[index] = tuple(tower)
+            else:
+                self.towers.append(tuple(tower))
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[int, bytes]:
+    kind, size = _MESSAGE.unpack(await reader.readexactly(_MESSAGE.size))
+    return kind, await reader.readexactly(size)
+
+
+# ---------------------------------------------------------------------------
+# Server
+# ---------------------------------------------------------------------------
+class SpectatorServer:
+    """asyncio broadcast server on its own thread; publish() from the game thread."""
+
+    def __init__(self, host: str = SPECTATOR_HOST, port: int = SPECTATOR_PORT):
+        self.host = host
+        self.port = port
+        self.error = ""
+        self.tick = 0
+        self.bytes_sent = 0
+        self.last_publish_time = 0.0  # game-thread seconds of the last snapshot
+        self.publish_cost = 0.0  # smoothed seconds per snapshot
+        self.stride = 1  # frames per snapshot, raised when snapshots go over budget
+        self._skip = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server = None
+        self._clients: dict[asyncio.StreamWriter, bool] = {}  # writer -> needs a keyframe
+        self._hello = b""
+        self._sent: tuple | None = None  # last snapshot broadcast
+        self._keyframe_tick = 0
+        self._pending: tuple | None = None
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="spectator", daemon=True)
+
+    @property
+    def viewers(self) -> int:
+        return len(self._clients)
+
+    def start(self) -> "SpectatorServer":
+        """Start listening; returns once the port is bound (port 0 picks one)."""
+        self._thread.start()
+        self._ready.wait()
+        if self.error:
+            raise OSError(self.error)
+        return self
+
+    def set_level(self, width: int, height: int, tiles: bytes) -> None:
+        """A new level started: viewers reload the map from these tiles."""
+        hello = encode_hello(width, height, bytes(tiles))
+        self._pending = None
+        self._call(self._broadcast_hello, hello)
+
+    def publish(self, game) -> None:
+        """Hand over the match as it is now; the server sends the newest one it finds."""
+        if self._loop is None:
+            return
+        self.tick += 1
+        self._skip -= 1
+        if self._skip > 0:
+            return
+        start = time.perf_counter()
+        self._pending = capture_state(game, self.tick)
+        self.last_publish_time = time.perf_counter() - start
+        self.publish_cost += (self.last_publish_time - self.publish_cost) * COST_SMOOTHING
+        self.stride = max(1, math.ceil(self.publish_cost * 1000 / SPECTATOR_BUDGET_MS))
+        self._skip = self.stride
+
+    def close(self) -> None:
+        loop = self._loop
+        if loop is None:
+            return
+        self._call(self._shutdown)
+        self._thread.join(timeout=2.0)
+
+    def _call(self, callback, *args) -> None:
+        try:
+            self._loop.call_soon_threadsafe(callback, *args)
+        except RuntimeError:
+            pass  # loop already closed
+
+    # -- server thread -----------------------------------------------------
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(asyncio.start_server(self._on_connect, self.host, self.port))
+        except OSError as exc:
+            self.error = str(exc)
+            self._ready.set()
+            loop.close()
+            return
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._loop = loop
+        self._ready.set()
+        loop.call_soon(self._pump)
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        if self._hello:
+            writer.write(self._hello)
+        self._clients[writer] = True
+        if self._sent is not None:
+            self._send_keyframe(writer, self._sent)
+        try:
+            # Viewers don't talk; wait for them to hang up.
+            while await reader.read(1024):
+                pass
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._clients.pop(writer, None)
+            writer.close()
+
+    def _send_keyframe(self, writer: asyncio.StreamWriter, snapshot: tuple) -> None:
+        data = encode_keyframe(snapshot)
+        writer.write(data)
+        self.bytes_sent += len(data)
+        self._clients[writer] = False
+
+    def _broadcast_hello(self, hello: bytes) -> None:
+        self._hello = hello
+        self._sent = None
+        for writer in list(self._clients):
+            writer.write(hello)
+            self._clients[writer] = True
+
+    def _pump(self) -> None:
+        self._flush()
+        self._loop.call_later(SEND_INTERVAL, self._pump)
+
+    def _flush(self) -> None:
+        snapshot, self._pending = self._pending, None
+        if snapshot is None:
+            return
+        previous = self._sent
+        self._sent = snapshot
+        tick = snapshot[0][0]
+        keyframe = previous is None or tick - self._keyframe_tick >= KEYFRAME_INTERVAL
+        if keyframe:
+            self._keyframe_tick = tick
+        delta = None
+        for writer, needs_keyframe in list(self._clients.items()):
+            if writer.is_closing():
+                continue
+            if writer.transport.get_write_buffer_size() > MAX_CLIENT_BACKLOG:
+                # Too far behind: send nothing (keyframes included) until its
+                # buffer drains, then resync with one keyframe.
+                self._clients[writer] = True
+                continue
+            if keyframe or needs_keyframe:
+                self._send_keyframe(writer, snapshot)
+                continue
+            if delta is None:
+                delta = encode_delta(previous, snapshot)
+            writer.write(delta)
+            self.bytes_sent += len(delta)
+
+    def _shutdown(self) -> None:
+        for writer in list(self._clients):
+            writer.close()
+        self._server.close()
+        self._loop.stop()
@@ -0,0 +1,217 @@
+"""Watch a match streamed by `python main.py --spectate` (see spectator.py).
+
+Draws the streamed map, towers, enemies and projectiles with the game's own
+TileMap and sprite code, following the player. With --headless nothing is
+shown: the stream is decoded and drawn off-screen and a line of stats is
+printed every second, which is enough to check a stream end to end.
+
+Usage:
+    python spectator_viewer.py [--host 127.0.0.1] [--port 47460]
+    python spectator_viewer.py --headless --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+if "--headless" in sys.argv[1:]:
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from asset_manager import get_projectile_frames
+from entities.enemy import draw_enemy, enemy_look, enemy_sprite_draw_size, get_scaled_enemy_frames
+from entities.projectile import PROJECTILE_FRAME_TIME, PROJECTILE_SPRITE_SIZE, draw_projectile
+from entities.tower import Tower
+from presenter import present_to_window
+from settings import (
+    BLACK, FPS, SCREEN_HEIGHT, SCREEN_WIDTH, SPECTATOR_HOST, SPECTATOR_PORT, TILE_SIZE, TITLE, WHITE,
+    get_pixel_font,
+)
+from spectator import MESSAGE_HEADER_SIZE, UNITS_PER_PIXEL, SpectatorState, read_message
+from world.sim_process import DIRECTIONS, ENEMY_TYPES, SOURCES
+from world.systems import draw_enemy_marks
+from world.tilemap import TileMap
+
+
+class Viewer:
+    """Turns a SpectatorState into frames."""
+
+    def __init__(self, state, surface):
+        self.state = state
+        self.surface = surface
+        self.font = get_pixel_font(22)
+        self.tilemap: TileMap | None = None
+        self.level_serial = 0
+        self.towers: list[Tower] = []
+        self._projectile_moves: dict[int, tuple[float, float, float, float]] = {}  # id -> x, y, dx, dy
+        self.start = time.perf_counter()
+
+    def _load_level(self) -> None:
+        state = self.state
+        rows = [list(state.tiles[y * state.width:(y + 1) * state.width]) for y in range(state.height)]
+        old = self.tilemap
+        self.tilemap = TileMap(rows)
+        self.tilemap.ensure_visual_layers()
+        if old is not None:
+            old.release()
+        self.level_serial = state.level_serial
+        self.towers = []
+        self._projectile_moves.clear()
+
+    def _sync_towers(self) -> None:
+        towers = self.state.towers
+        if len(towers) < len(self.towers):
+            self.towers = []  # keyframe after a resync: rebuild
+        for tx, ty, kind, _direction, _frame, _attacking in towers[len(self.towers):]:
+            self.towers.append(Tower((tx, ty), SOURCES[kind] or "goblin"))
+            self.tilemap.apply_tower_placement(tx, ty)
+        for tower, (_tx, _ty, _kind, direction, frame, attacking) in zip(self.towers, towers):
+            tower.direction = DIRECTIONS[direction]
+            tower._anim_frame = frame
+            tower.attack_timer = 1.0 if attacking else 0.0
+
+    def draw(self) -> None:
+        state = self.state
+        surface = self.surface
+        surface.fill(BLACK)
+        if not state.level_serial:
+            self._draw_text("Waiting for a match...", SCREEN_WIDTH // 2 - 140, SCREEN_HEIGHT // 2)
+            return
+        if state.level_serial != self.level_serial:
+            self._load_level()
+        self._sync_towers()
+
+        # Follow the player, clamped to the map.
+        px, py = state.player
+        world_w = self.tilemap.width * TILE_SIZE
+        world_h = self.tilemap.height * TILE_SIZE
+        ox = -int(min(max(px - SCREEN_WIDTH / 2, 0), max(0, world_w - SCREEN_WIDTH)))
+        oy = -int(min(max(py - SCREEN_HEIGHT / 2, 0), max(0, world_h - SCREEN_HEIGHT)))
+        offset = (ox, oy)
+
+        self.tilemap.draw(surface, player_bottom=int(py), offset=offset)
+        for tower in self.towers:
+            tower.draw(surface, offset=offset)
+
+        for x, y, health, max_health, kind, art, direction, anim_frame in state.enemies.values():
+            enemy_type = ENEMY_TYPES[kind]
+            color, radius = enemy_look(enemy_type)
+            frames = get_scaled_enemy_frames(art, enemy_type, enemy_sprite_draw_size(enemy_type))
+            cx = x // UNITS_PER_PIXEL + ox
+            cy = y // UNITS_PER_PIXEL + oy
+            draw_enemy(
+                surface, cx, cy, enemy_type, radius, color, frames, DIRECTIONS[direction], anim_frame,
+                health, max_health, 0.0,
+            )
+            draw_enemy_marks(surface, cx, cy, enemy_type, radius, health, max_health)
+
+        # Projectiles face the way they moved since the last frame.
+        anim_frame = int((time.perf_counter() - self.start) / PROJECTILE_FRAME_TIME)
+        moves = {}
+        for pid, (x, y, source) in state.projectiles.items():
+            last = self._projectile_moves.get(pid)
+            dx, dy = 1.0, 0.0
+            if last is not None:
+                dx, dy = x - last[0], y - last[1]
+                if not dx and not dy:
+                    dx, dy = last[2], last[3]
+            moves[pid] = (x, y, dx, dy)
+            frames = get_projectile_frames(SOURCES[source], projectile_size=PROJECTILE_SPRITE_SIZE)
+            draw_projectile(
+                surface, x // UNITS_PER_PIXEL + ox, y // UNITS_PER_PIXEL + oy, frames, anim_frame, dx, dy
+            )
+        self._projectile_moves = moves
+
+        pygame.draw.circle(surface, WHITE, (int(px) + ox, int(py) + oy), 6, 2)
+        wave = f"{state.wave}/{state.max_waves}" if state.max_waves else str(state.wave)
+        self._draw_text(
+            f"Wave {wave}   Money: {state.gold} TL   Castle: {state.castle_hp}/{state.castle_max_hp}   "
+            f"Enemies: {len(state.enemies)}",
+            16, 16,
+        )
+
+    def _draw_text(self, text: str, x: int, y: int) -> None:
+        self.surface.blit(self.font.render(text, True, WHITE), (x, y))
+
+
+async def _receive(reader, state, totals: dict) -> None:
+    try:
+        while True:
+            kind, payload = await read_message(reader)
+            state.apply(kind, payload)
+            totals["bytes"] += MESSAGE_HEADER_SIZE + len(payload)
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+
+async def watch(args) -> int:
+    try:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+    except OSError as exc:
+        print(f"Can't connect to {args.host}:{args.port}: {exc}", file=sys.stderr)
+        return 1
+
+    pygame.init()
+    pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.RESIZABLE)
+    pygame.display.set_caption(f"{TITLE} - spectating")
+    frame = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    state = SpectatorState()
+    viewer = Viewer(state, frame)
+    totals = {"bytes": 0}
+    receiver = asyncio.ensure_future(_receive(reader, state, totals))
+
+    start = last_report = time.perf_counter()
+    frames = 0
+    draw_time = 0.0
+    running = True
+    while running and not receiver.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                running = False
+            elif event.type == pygame.VIDEORESIZE:
+                pygame.display.set_mode(event.size, pygame.RESIZABLE)
+        draw_start = time.perf_counter()
+        viewer.draw()
+        if not args.headless:
+            present_to_window(frame)
+        now = time.perf_counter()
+        draw_time += now - draw_start
+        frames += 1
+        if args.headless and now - last_report >= 1.0:
+            last_report = now
+            print(
+                f"tick {state.tick} wave {state.wave} enemies {len(state.enemies)} "
+                f"projectiles {len(state.projectiles)} towers {len(state.towers)} | "
+                f"{state.keyframes} keyframes {state.deltas} deltas {totals['bytes']} bytes | "
+                f"draw {draw_time / frames * 1000:.2f} ms"
+            )
+        if args.seconds and now - start >= args.seconds:
+            break
+        await asyncio.sleep(max(0.0, 1 / FPS - (time.perf_counter() - draw_start)))
+
+    receiver.cancel()
+    writer.close()
+    elapsed = max(1e-9, time.perf_counter() - start)
+    print(
+        f"{state.keyframes} keyframes, {state.deltas} deltas, {totals['bytes']} bytes "
+        f"({totals['bytes'] / elapsed / 1024:.1f} KiB/s) in {elapsed:.1f} s"
+    )
+    pygame.quit()
+    return 0
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Watch a streamed No Way Through match.")
+    parser.add_argument("--host", default=SPECTATOR_HOST)
+    parser.add_argument("--port", type=int, default=SPECTATOR_PORT)
+    parser.add_argument("--headless", action="store_true", help="no window; print stream stats")
+    parser.add_argument("--seconds", type=float, default=0.0, help="quit after this long (0: when the stream ends)")
+    args = parser.parse_args(argv)
+    return asyncio.run(watch(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,139 @@
+"""Standard load test: run endless mode headless and report where it breaks.
+
+Plays a level in endless mode (see world/endless.py) with the castle and
+player made invulnerable and a ring of towers along the enemy route, stepping
+the normal update + draw at a fixed 1/60 s per frame as fast as the machine
+allows. Every frame is timed; the report gives peak entity counts and the
+first wave whose frame time (1 s average) goes over the 16.6 ms budget.
+
+By default the run starts at the first generated wave and stops after wave
+10 has spawned; use --start-wave/--waves to look further out.
+
+Usage:
+    python stress_test.py [--level levels/castle.json] [--start-wave 6] [--waves 10] [--towers 8]
+    python stress_test.py --budget-wave 9   # exit 1 if over budget before wave 9
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+from entities.tower import Tower
+from game import Game
+from world.endless import ENDLESS_STATS_PATH
+
+TOWER_TYPES = ("goblin", "elf", "knight", "archer", "wizard", "firewarrior", "bloodmage")
+INVULNERABLE_HP = 10**9
+FRAME_DT = 1 / 60
+
+
+def _place_towers(game: Game, count: int) -> int:
+    """Spread `count` towers over buildable tiles next to the enemy route."""
+    tilemap = game.tilemap
+    grid = tilemap.grid
+    slots = [
+        (x, y)
+        for y in range(tilemap.height)
+        for x in range(tilemap.width)
+        if tilemap.is_buildable(x, y) and grid.neighbours[y * tilemap.width + x]
+    ]
+    if not slots or count <= 0:
+        return 0
+    stride = max(1, len(slots) // count)
+    placed = 0
+    for x, y in slots[::stride][:count]:
+        game.towers.append(Tower((x, y), TOWER_TYPES[placed % len(TOWER_TYPES)]))
+        tilemap.apply_tower_placement(x, y)
+        placed += 1
+    return placed
+
+
+def _select_level(game: Game, level: str | None) -> None:
+    if not level:
+        return
+    wanted = os.path.abspath(level)
+    for i, (path, _label) in enumerate(game.level_options):
+        if os.path.abspath(path) == wanted:
+            game.selected_level_index = i
+            return
+    raise SystemExit(f"Error: {level} is not in the level list")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run endless mode headless as a load test.")
+    parser.add_argument("--level", help="level file to play (default: the menu's first level)")
+    parser.add_argument("--start-wave", type=int, help="first wave (default: the first generated wave)")
+    parser.add_argument("--waves", type=int, default=10, help="stop once this wave has finished spawning")
+    parser.add_argument("--towers", type=int, default=8, help="towers placed along the route")
+    parser.add_argument("--max-frames", type=int, default=200_000, help="hard stop")
+    parser.add_argument("--budget-wave", type=int, help="exit 1 if frame time goes over budget before this wave")
+    parser.add_argument("-o", "--output", default=ENDLESS_STATS_PATH, help="JSON report path")
+    args = parser.parse_args(argv)
+
+    pygame.init()
+    game = Game()
+    while game.state == "loading":
+        game.handle_events()
+        game.update(FRAME_DT)
+        game.draw()
+
+    _select_level(game, args.level)
+    game.endless_mode = True
+    game._load_selected_level_and_play()
+    if game.state != "playing":
+        print(f"Error: {game.menu_message or 'could not start the level'}", file=sys.stderr)
+        return 1
+
+    game.castle_hp = game.castle_max_hp = INVULNERABLE_HP
+    game.player.health = game.player.max_health = INVULNERABLE_HP
+    towers = _place_towers(game, args.towers)
+    stats = game.endless_stats
+    wave_manager = game.wave_manager
+    start_wave = args.start_wave or wave_manager.max_waves + 1
+    if start_wave > 1:
+        wave_manager.start_wave(start_wave)
+
+    start = time.perf_counter()
+    for _frame in range(args.max_frames):
+        frame_start = time.perf_counter()
+        game.update(FRAME_DT)
+        draw_start = time.perf_counter()
+        game.draw()
+        frame_end = time.perf_counter()
+        game._record_frame(frame_end - frame_start, frame_end - draw_start)
+        if game.telemetry is not None:
+            game._record_telemetry(frame_end - frame_start)
+        if wave_manager.current_wave > args.waves or (
+            wave_manager.current_wave == args.waves and not wave_manager.spawning and not wave_manager.show_announcement
+        ):
+            break
+    elapsed = time.perf_counter() - start
+
+    summary = stats.summary()
+    summary["level"] = game.level_options[game.selected_level_index][0]
+    summary["towers"] = towers
+    summary["wall_time_s"] = round(elapsed, 2)
+    summary["present"] = game.presenter.stats.summary()
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(summary, file, indent=2)
+    print(json.dumps(summary, indent=2))
+
+    if game.telemetry is not None:
+        game.telemetry.close()
+    game.presenter.wait_idle()
+    pygame.quit()
+    first_slow = stats.first_slow_wave
+    if args.budget_wave is not None and first_slow is not None and first_slow < args.budget_wave:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""On-disk cache of processed sprite frames as raw RGBA buffers.
+
+After the first run, loaders can skip PNG decoding and all
+split/crop/normalize/scale work by memory-mapping the cached pixels and
+rebuilding surfaces with `pygame.image.frombuffer`. This is what the game
+uses instead of a prebuilt PNG sprite atlas: decoding the atlas pages alone
+(~100 ms) cost more than the per-file pipeline it replaced.
+
+Entries are keyed by a name, the processing parameters and the size/mtime of
+every source file, so editing an asset (or changing the params) simply misses
+the cache and the caller rebuilds + stores a fresh entry.
+"""
+import hashlib
+import mmap
+import os
+import struct
+
+import pygame
+
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "surfaces")
+
+_MAGIC = b"NWTS"
+_VERSION = 1
+# magic, version, group count
+_HEADER = struct.Struct("<4sHH")
+# name length, frame count
+_GROUP = struct.Struct("<HH")
+# width, height
+_FRAME = struct.Struct("<HH")
+
+_enabled = True
+
+
+def set_enabled(enabled: bool) -> None:
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def source_files(folder: str) -> list[str]:
+    """All files below `folder` (sorted), for use as cache sources."""
+    out: list[str] = []
+    for root, dirs, files in os.walk(folder):
+        dirs.sort()
+        for name in sorted(files):
+            out.append(os.path.join(root, name))
+    return out
+
+
+def _entry_path(name: str, params: tuple, sources: list[str]) -> str:
+    h = hashlib.sha1()
+    h.update(f"{_VERSION}|{name}|{params!r}\n".encode("utf-8"))
+    for path in sources:
+        try:
+            st = os.stat(path)
+            h.update(f"{os.path.abspath(path)}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+        except OSError:
+            h.update(f"{os.path.abspath(path)}|missing\n".encode("utf-8"))
+    safe_name = "".join(c if c.isalnum() or c in "-_" else "_" for c in name)
+    return os.path.join(CACHE_DIR, f"{safe_name}-{h.hexdigest()[:16]}.bin")
+
+
+def _to_surface(buf, size: tuple[int, int]) -> pygame.Surface:
+    surf = pygame.image.frombuffer(buf, size, "RGBA")
+    # frombuffer shares the mapped memory; make an owned (and, when a display
+    # exists, blit-optimized) copy so the map can be closed.
+    try:
+        return surf.convert_alpha()
+    except pygame.error:
+        return surf.copy()
+
+
+def load_groups(name: str, params: tuple, sources: list[str]) -> dict[str, list[pygame.Surface]] | None:
+    """Return the cached frame groups for this key, or None on a miss."""
+    if not _enabled:
+        return None
+    path = _entry_path(name, params, sources)
+    try:
+        with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                magic, version, group_count = _HEADER.unpack_from(mm, 0)
+                if magic != _MAGIC or version != _VERSION:
+                    return None
+                offset = _HEADER.size
+                groups: dict[str, list[pygame.Surface]] = {}
+                for _ in range(group_count):
+                    name_len, frame_count = _GROUP.unpack_from(mm, offset)
+                    offset += _GROUP.size
+                    group_name = bytes(mm[offset:offset + name_len]).decode("utf-8")
+                    offset += name_len
+                    frames: list[pygame.Surface] = []
+                    for _ in range(frame_count):
+                        w, h = _FRAME.unpack_from(mm, offset)
+                        offset += _FRAME.size
+                        n = w * h * 4
+                        frames.append(_to_surface(view[offset:offset + n], (w, h)))
+                        offset += n
+                    groups[group_name] = frames
+                return groups
+            finally:
+                view.release()
+    except (OSError, ValueError, struct.error, pygame.error):
+        return None
+
+
+def save_groups(name: str, params: tuple, sources: list[str], groups: dict[str, list[pygame.Surface]]) -> None:
+    """Store frame groups for this key (best-effort; failures are ignored)."""
+    if not _enabled:
+        return
+    path = _entry_path(name, params, sources)
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(_HEADER.pack(_MAGIC, _VERSION, len(groups)))
+            for group_name, frames in groups.items():
+                encoded = group_name.encode("utf-8")
+                file.write(_GROUP.pack(len(encoded), len(frames)))
+                file.write(encoded)
+                for f in frames:
+                    w, h = f.get_size()
+                    file.write(_FRAME.pack(w, h))
+                    file.write(pygame.image.tobytes(f, "RGBA"))
+        os.replace(tmp_path, path)
+    except (OSError, pygame.error, struct.error):
+        pass
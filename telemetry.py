@@ -0,0 +1,259 @@
+"""Performance telemetry: per-second frame-time histograms and game events.
+
+The game calls `Telemetry.frame` once per frame and `Telemetry.event` when
+something happens (level load, wave start, save, ...). Every second of
+frames becomes one record: a histogram of frame times over
+FRAME_BUCKETS_MS, the mean and worst frame, each frame over SPIKE_MS with
+its time, entity counts, and the hits/misses of the asset caches during
+that second (see `cache_stats`). A writer thread appends the records to
+TELEMETRY_PATH as JSON lines and rotates the file (telemetry.jsonl ->
+telemetry.jsonl.1 -> ...) past TELEMETRY_MAX_BYTES, so the game thread
+never touches the disk.
+
+Records (all carry "type", "session" and "t", seconds since the session
+started):
+
+    session  wall clock start, pid, platform, bucket edges, settings
+    second   state, frames, hist, mean_ms, max_ms, spikes [[t, ms], ...],
+             counts {kind: n}, caches {name: [hits, misses]}
+    event    "name" plus its fields: level_load, wave_start, game_over,
+             victory, save, gc (full collections, with their duration)
+
+Frame times are update + draw (the same span EndlessStats measures), not
+the interval including the frame cap's sleep. telemetry_report.py
+summarizes the files.
+"""
+import gc
+import json
+import os
+import sys
+import threading
+import time
+import uuid
+from bisect import bisect_left
+
+TELEMETRY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "telemetry", "telemetry.jsonl")
+TELEMETRY_MAX_BYTES = 4 * 1024 * 1024
+TELEMETRY_BACKUPS = 3
+
+# Upper bucket edges (ms); the last bucket holds everything slower.
+FRAME_BUCKETS_MS = (2, 4, 6, 8, 10, 12, 14, 16.7, 20, 25, 33.3, 50, 66.7, 100, 200)
+SPIKE_MS = 33.3  # frames slower than this are listed one by one
+MAX_SPIKES_PER_SECOND = 16
+
+
+class CacheStats:
+    """Hit/miss counters for one of the module-level asset caches."""
+
+    __slots__ = ("name", "hits", "misses")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+
+CACHES: dict[str, CacheStats] = {}
+
+
+def cache_stats(name: str) -> CacheStats:
+    """The counters for cache `name` (modules sharing a name share counters)."""
+    stats = CACHES.get(name)
+    if stats is None:
+        stats = CACHES[name] = CacheStats(name)
+    return stats
+
+
+class Telemetry:
+    """Aggregates frames into per-second records and writes them on a worker thread."""
+
+    def __init__(
+        self,
+        path: str = TELEMETRY_PATH,
+        *,
+        max_bytes: int = TELEMETRY_MAX_BYTES,
+        backups: int = TELEMETRY_BACKUPS,
+        settings: dict | None = None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.session = uuid.uuid4().hex[:12]
+        self.error = ""
+        self.start = time.perf_counter()
+        self._pending: list[dict] = []
+        self._busy = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+
+        self._second_start = 0.0
+        self._reset_second()
+        self._cache_totals = {name: (c.hits, c.misses) for name, c in CACHES.items()}
+        self._gc_start = 0.0
+        gc.callbacks.append(self._on_gc)
+        self._emit({
+            "type": "session",
+            "wall_time": time.time(),
+            "pid": os.getpid(),
+            "platform": sys.platform,
+            "python": sys.version.split()[0],
+            "buckets_ms": FRAME_BUCKETS_MS,
+            "spike_ms": SPIKE_MS,
+            "settings": settings or {},
+        })
+
+    def now(self) -> float:
+        return time.perf_counter() - self.start
+
+    def frame(self, frame_time: float, state: str, counts=None) -> None:
+        """Record one frame; `counts()` (entity counts) is only called once per second."""
+        t = self.now()
+        ms = frame_time * 1000
+        self._hist[bisect_left(FRAME_BUCKETS_MS, ms)] += 1
+        self._frames += 1
+        self._total_ms += ms
+        if ms > self._max_ms:
+            self._max_ms = ms
+        if ms > SPIKE_MS and len(self._spikes) < MAX_SPIKES_PER_SECOND:
+            self._spikes.append([round(t, 3), round(ms, 2)])
+        self._state = state
+        if t - self._second_start >= 1.0:
+            self._flush_second(t, counts() if counts is not None else {})
+
+    def event(self, name: str, **fields) -> None:
+        """Record a game event (safe from any thread)."""
+        record = {"type": "event", "name": name}
+        record.update(fields)
+        self._emit(record)
+
+    def wait_idle(self) -> None:
+        with self._cond:
+            while self._busy or self._pending:
+                self._cond.wait()
+
+    def close(self) -> None:
+        """Write the partial second and everything queued; stop the worker."""
+        if self._closed:
+            return
+        if self._frames:
+            self._flush_second(self.now(), {})
+        try:
+            gc.callbacks.remove(self._on_gc)
+        except ValueError:
+            pass
+        self.wait_idle()
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout=2.0)
+
+    # -- game thread -------------------------------------------------------
+    def _reset_second(self) -> None:
+        self._hist = [0] * (len(FRAME_BUCKETS_MS) + 1)
+        self._frames = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+        self._spikes: list[list[float]] = []
+        self._state = ""
+
+    def _flush_second(self, t: float, counts: dict) -> None:
+        caches = {}
+        for name, c in CACHES.items():
+            hits, misses = self._cache_totals.get(name, (0, 0))
+            if c.hits != hits or c.misses != misses:
+                caches[name] = [c.hits - hits, c.misses - misses]
+                self._cache_totals[name] = (c.hits, c.misses)
+        hist = self._hist
+        while hist and not hist[-1]:
+            hist.pop()
+        self._emit({
+            "type": "second",
+            "t": round(self._second_start, 3),
+            "state": self._state,
+            "frames": self._frames,
+            "hist": hist,
+            "mean_ms": round(self._total_ms / max(1, self._frames), 3),
+            "max_ms": round(self._max_ms, 3),
+            "spikes": self._spikes,
+            "counts": counts,
+            "caches": caches,
+        })
+        self._second_start = t
+        self._reset_second()
+
+    def _on_gc(self, phase: str, info: dict) -> None:
+        # Only full collections are slow enough to matter.
+        if info.get("generation") != 2:
+            return
+        if phase == "start":
+            self._gc_start = time.perf_counter()
+        else:
+            self.event(
+                "gc", generation=2, ms=round((time.perf_counter() - self._gc_start) * 1000, 3),
+                collected=info.get("collected", 0),
+            )
+
+    def _emit(self, record: dict) -> None:
+        record["session"] = self.session
+        record.setdefault("t", round(self.now(), 3))
+        with self._cond:
+            self._pending.append(record)
+            self._cond.notify_all()
+
+    # -- writer thread -----------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                records, self._pending = self._pending, []
+                self._busy = True
+            try:
+                self._write("".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records))
+                self.error = ""
+            except (OSError, TypeError, ValueError) as exc:
+                self.error = str(exc)
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    def _write(self, data: str) -> None:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(data)
+
+    def _rotate(self) -> None:
+        for i in range(self.backups - 1, 0, -1):
+            older = f"{self.path}.{i}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.path}.{i + 1}")
+        if self.backups > 0:
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            os.remove(self.path)
+
+
+def log_files(path: str = TELEMETRY_PATH) -> list[str]:
+    """The current log and its rotated backups, oldest first."""
+    backups = []
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    if os.path.isdir(directory):
+        for name in os.listdir(directory):
+            suffix = name[len(prefix):]
+            if name.startswith(prefix) and suffix.isdigit():
+                backups.append((int(suffix), os.path.join(directory, name)))
+    files = [p for _n, p in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
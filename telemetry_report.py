@@ -0,0 +1,325 @@
+"""Summarize telemetry logs (see telemetry.py).
+
+For each session: frame-time percentiles (overall, per game state and per
+wave, interpolated from the per-second histograms), seconds over the frame
+budget, peak entity counts and cache hit rates. It then correlates frame-time
+spikes (frames over the session's spike_ms) with what happened just before:
+for each event kind, how many of its occurrences were followed by a spike
+within --window seconds, against the chance of any window holding a spike.
+A second with asset-cache misses counts as a "cache_miss:<cache>" event
+followed by that second's spikes. Finally it lists the worst spikes and the
+event nearest before each.
+
+Usage:
+    python telemetry_report.py                 # newest session in the default log
+    python telemetry_report.py --all           # every session
+    python telemetry_report.py --session 3f2a9c1d0e11 --window 0.5
+    python telemetry_report.py logs/telemetry.jsonl* --json report.json
+"""
+import argparse
+import json
+import sys
+import time
+from bisect import bisect_right
+
+from telemetry import FRAME_BUCKETS_MS, TELEMETRY_PATH, log_files
+
+PERCENTILES = (50, 90, 95, 99)
+FRAME_BUDGET_MS = 1000 / 60
+WORST_SPIKES = 10
+
+
+def read_sessions(paths: list[str]) -> tuple[dict[str, list[dict]], int]:
+    """Records grouped by session (in file order) and the number of unreadable lines."""
+    sessions: dict[str, list[dict]] = {}
+    bad = 0
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                    session = record["session"]
+                except (ValueError, KeyError, TypeError):
+                    bad += 1  # e.g. a line cut short by a crash
+                    continue
+                sessions.setdefault(session, []).append(record)
+    return sessions, bad
+
+
+class FrameTimes:
+    """Merged frame-time histogram."""
+
+    def __init__(self, edges):
+        self.edges = list(edges)
+        self.counts = [0] * (len(self.edges) + 1)
+        self.frames = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def add(self, second: dict) -> None:
+        for i, n in enumerate(second.get("hist", ())):
+            self.counts[i] += n
+        frames = second.get("frames", 0)
+        self.frames += frames
+        self.total_ms += second.get("mean_ms", 0.0) * frames
+        self.max_ms = max(self.max_ms, second.get("max_ms", 0.0))
+
+    def percentile(self, q: float) -> float:
+        """Frame time below which q% of frames fall (linear within a bucket)."""
+        if not self.frames:
+            return 0.0
+        target = self.frames * q / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if n and seen + n >= target:
+                low = self.edges[i - 1] if i > 0 else 0.0
+                high = self.edges[i] if i < len(self.edges) else max(self.max_ms, low)
+                high = min(high, self.max_ms)
+                return low + (high - low) * (target - seen) / n
+            seen += n
+        return self.max_ms
+
+    def summary(self) -> dict:
+        out = {"frames": self.frames, "mean_ms": round(self.total_ms / max(1, self.frames), 2)}
+        for q in PERCENTILES:
+            out[f"p{q}_ms"] = round(self.percentile(q), 2)
+        out["max_ms"] = round(self.max_ms, 2)
+        return out
+
+
+def summarize(records: list[dict], window: float) -> dict:
+    session = next((r for r in records if r["type"] == "session"), {})
+    edges = session.get("buckets_ms", FRAME_BUCKETS_MS)
+    spike_ms = session.get("spike_ms", 0.0)
+    seconds = [r for r in records if r["type"] == "second"]
+    events = sorted((r for r in records if r["type"] == "event"), key=lambda r: r["t"])
+    event_times = [e["t"] for e in events]
+
+    overall = FrameTimes(edges)
+    by_state: dict[str, FrameTimes] = {}
+    by_wave: dict[int, FrameTimes] = {}
+    peaks: dict[str, int] = {}
+    caches: dict[str, list[int]] = {}
+    slow_seconds = 0
+    spikes: list[tuple[float, float, list[str]]] = []  # t, ms, caches that missed that second
+    missed_seconds: list[tuple[list[str], list]] = []  # (caches that missed, that second's spikes)
+    for second in seconds:
+        overall.add(second)
+        state = second.get("state", "")
+        by_state.setdefault(state, FrameTimes(edges)).add(second)
+        if state in ("playing", "paused"):
+            wave = _wave_at(events, event_times, second["t"])
+            if wave:
+                by_wave.setdefault(wave, FrameTimes(edges)).add(second)
+        if second.get("mean_ms", 0.0) > FRAME_BUDGET_MS:
+            slow_seconds += 1
+        for kind, n in second.get("counts", {}).items():
+            peaks[kind] = max(peaks.get(kind, 0), n)
+        missed = []
+        for name, (hits, misses) in second.get("caches", {}).items():
+            total = caches.setdefault(name, [0, 0])
+            total[0] += hits
+            total[1] += misses
+            if misses:
+                missed.append(name)
+        for t, ms in second.get("spikes", ()):
+            spikes.append((t, ms, missed))
+        if missed:
+            missed_seconds.append((missed, second.get("spikes", ())))
+
+    duration = max([r.get("t", 0.0) for r in records] or [0.0])
+    correlation = _correlate(events, event_times, spikes, missed_seconds, window, duration)
+    worst = []
+    for t, ms, missed in sorted(spikes, key=lambda s: -s[1])[:WORST_SPIKES]:
+        before = _events_before(events, event_times, t, window)
+        nearest = before[-1] if before else None
+        worst.append({
+            "t": t,
+            "ms": ms,
+            "after": nearest["name"] if nearest else None,
+            "after_ms": round((t - nearest["t"]) * 1000, 1) if nearest else None,
+            "cache_misses": missed,
+        })
+
+    return {
+        "session": session.get("session", records[0]["session"] if records else ""),
+        "started": session.get("wall_time"),
+        "platform": session.get("platform"),
+        "python": session.get("python"),
+        "settings": session.get("settings", {}),
+        "duration_s": round(duration, 1),
+        "frames": overall.summary(),
+        "by_state": {state: ft.summary() for state, ft in sorted(by_state.items())},
+        "by_wave": {wave: ft.summary() for wave, ft in sorted(by_wave.items())},
+        "slow_seconds": slow_seconds,
+        "peaks": peaks,
+        "caches": {
+            name: {"hits": hits, "misses": misses, "hit_rate": round(hits / max(1, hits + misses), 4)}
+            for name, (hits, misses) in sorted(caches.items())
+        },
+        "events": _event_counts(events),
+        "spike_ms": spike_ms,
+        "spikes": len(spikes),
+        "window_s": window,
+        "correlation": correlation,
+        "worst_spikes": worst,
+    }
+
+
+def _wave_at(events: list[dict], event_times: list[float], t: float) -> int:
+    """Wave being played at time t (0 before the first wave of a level)."""
+    for e in reversed(events[:bisect_right(event_times, t)]):
+        if e["name"] == "wave_start":
+            return e.get("wave", 0)
+        if e["name"] == "level_load":
+            return 0
+    return 0
+
+
+def _events_before(events: list[dict], event_times: list[float], t: float, window: float) -> list[dict]:
+    """Events in [t - window, t] (a spike's frame ends at t)."""
+    hi = bisect_right(event_times, t)
+    lo = bisect_right(event_times, t - window - 1e-9)
+    return events[lo:hi]
+
+
+def _event_counts(events: list[dict]) -> dict[str, int]:
+    counts: dict[str, int] = {}
+    for e in events:
+        counts[e["name"]] = counts.get(e["name"], 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def _correlate(events, event_times, spikes, missed_seconds, window: float, duration: float) -> dict:
+    """Per event kind: occurrences, how many a spike followed, and the worst of those spikes."""
+    ordered = sorted((t, ms) for t, ms, _missed in spikes)
+    spike_times = [t for t, _ms in ordered]
+    by_kind: dict[str, dict] = {}
+
+    def tally(name: str, spiked: list[float]) -> None:
+        kind = by_kind.setdefault(name, {"count": 0, "followed": 0, "worst_ms": 0.0})
+        kind["count"] += 1
+        if spiked:
+            kind["followed"] += 1
+            kind["worst_ms"] = max(kind["worst_ms"], *spiked)
+
+    for e in events:
+        lo = bisect_right(spike_times, e["t"] - 1e-9)
+        hi = bisect_right(spike_times, e["t"] + window)
+        tally(e["name"], [ms for _t, ms in ordered[lo:hi]])
+    # Cache misses are only known per second: blame that second's spikes.
+    for missed, second_spikes in missed_seconds:
+        for name in missed:
+            tally(f"cache_miss:{name}", [ms for _t, ms in second_spikes])
+    explained = sum(1 for t, _ms, missed in spikes if missed or _events_before(events, event_times, t, window))
+    for kind in by_kind.values():
+        kind["share"] = round(kind["followed"] / max(1, kind["count"]), 3)
+
+    # Chance that a random window of the same length holds a spike.
+    covered = 0.0
+    end = -1.0
+    for t in spike_times:
+        start = max(t - window, end)
+        covered += max(0.0, t - start)
+        end = t
+    baseline = round(min(1.0, covered / duration), 3) if duration > 0 else 0.0
+    return {
+        "baseline_share": baseline,
+        "by_event": dict(sorted(by_kind.items(), key=lambda kv: (-kv[1]["share"], kv[0]))),
+        "unexplained_spikes": len(spikes) - explained,
+    }
+
+
+def format_report(report: dict) -> str:
+    started = report["started"]
+    when = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(started)) if started else "?"
+    frames = report["frames"]
+    header = f"Session {report['session']}  {when}  {report['duration_s']} s  {frames['frames']} frames"
+    if report["platform"]:
+        header += f" ({report['platform']}, python {report['python']})"
+    lines = [
+        header,
+        f"  {'all':<14}{_percentile_line(frames)}",
+    ]
+    for state, ft in report["by_state"].items():
+        lines.append(f"  {state or '?':<14}{_percentile_line(ft)}")
+    for wave, ft in report["by_wave"].items():
+        lines.append(f"  {'wave ' + str(wave):<14}{_percentile_line(ft)}")
+    lines.append(f"  seconds over {FRAME_BUDGET_MS:.1f} ms (mean): {report['slow_seconds']}")
+    if report["peaks"]:
+        lines.append("  peaks: " + ", ".join(f"{k} {v}" for k, v in report["peaks"].items()))
+    if report["caches"]:
+        lines.append("  caches: " + ", ".join(
+            f"{name} {c['hit_rate'] * 100:.2f}% ({c['misses']} misses)" for name, c in report["caches"].items()
+        ))
+    if report["events"]:
+        lines.append("  events: " + ", ".join(f"{k} {v}" for k, v in report["events"].items()))
+
+    correlation = report["correlation"]
+    lines.append(
+        f"  spikes over {report['spike_ms']} ms: {report['spikes']}, "
+        f"{correlation['unexplained_spikes']} with no event in the {report['window_s']} s before"
+    )
+    if report["spikes"]:
+        lines.append(
+            f"    {'event':<22}{'count':>7}{'spiked':>8}{'share':>8}{'worst ms':>10}"
+            f"   (any {report['window_s']} s window: {correlation['baseline_share'] * 100:.1f}%)"
+        )
+        for name, kind in correlation["by_event"].items():
+            lines.append(
+                f"    {name:<22}{kind['count']:>7}{kind['followed']:>8}{kind['share'] * 100:>7.0f}%"
+                f"{kind['worst_ms']:>10.1f}"
+            )
+        lines.append("  worst spikes:")
+        for spike in report["worst_spikes"]:
+            cause = f"after {spike['after']} (+{spike['after_ms']} ms)" if spike["after"] else "no event before"
+            if spike["cache_misses"]:
+                cause += f", cache misses: {', '.join(spike['cache_misses'])}"
+            lines.append(f"    t={spike['t']:>9.3f} s  {spike['ms']:>7.1f} ms  {cause}")
+    return "\n".join(lines)
+
+
+def _percentile_line(ft: dict) -> str:
+    parts = "  ".join(f"p{q} {ft[f'p{q}_ms']:>6.2f}" for q in PERCENTILES)
+    return f"{parts}  max {ft['max_ms']:>7.2f}  mean {ft['mean_ms']:>6.2f} ms  ({ft['frames']} frames)"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize telemetry logs.")
+    parser.add_argument("paths", nargs="*", help=f"log files (default: {TELEMETRY_PATH} and its backups)")
+    parser.add_argument("--session", help="only this session id")
+    parser.add_argument("--all", action="store_true", help="every session (default: the newest)")
+    parser.add_argument("--window", type=float, default=0.5, help="seconds after an event a spike is blamed on it")
+    parser.add_argument("--json", help="also write the report(s) to this JSON file")
+    args = parser.parse_args(argv)
+
+    paths = args.paths or log_files(TELEMETRY_PATH)
+    if not paths:
+        print(f"Error: no telemetry logs at {TELEMETRY_PATH}", file=sys.stderr)
+        return 1
+    try:
+        sessions, bad = read_sessions(paths)
+    except OSError as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    if args.session:
+        sessions = {k: v for k, v in sessions.items() if k.startswith(args.session)}
+    elif not args.all and sessions:
+        newest = list(sessions)[-1]
+        sessions = {newest: sessions[newest]}
+    if not sessions:
+        print("Error: no matching sessions", file=sys.stderr)
+        return 1
+
+    reports = [summarize(records, args.window) for records in sessions.values()]
+    print("\n\n".join(format_report(r) for r in reports))
+    if bad:
+        print(f"({bad} unreadable lines skipped)")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(reports if len(reports) > 1 else reports[0], f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,19 @@
-from coins import CoinManager, handle_death
-from world.tilemap import TileMap
-from entities.enemy import Enemy
+from coins import CoinManager
+from world.ecs import World
+from world.events import CombatEvents
+from world.systems import movement_system, resolve_events
+from entities.enemy import spawn_enemy
 from settings import TILE_SIZE
 
 # setup
-tilemap = TileMap()
+world = World()
 cm = CoinManager()
 # enemy at tile (5,5)
 path = [(5*TILE_SIZE,5*TILE_SIZE),(6*TILE_SIZE,5*TILE_SIZE)]
-en = Enemy(path_points=path, health=0, speed=1.0, reward=30, wave_num=1)
+spawn_enemy(world, path_points=path, health=0, speed=1.0, reward=30, wave_num=1)
 # simulate death
-handle_death(en, cm, tilemap)
+events = CombatEvents()
+movement_system(world, 0.0, events)
+resolve_events(world, events, cm)
+cm.update(1.0)
 print('coins:', cm.coins)
@@ -0,0 +1,138 @@
+"""Minimal entity-component store with archetype-grouped component arrays.
+
+Entities with the same set of components live in one Archetype: one plain
+list per component, all indexed by the same row. Systems (world/systems.py)
+bind the columns they need to locals and walk rows in a single tight loop,
+instead of chasing attributes on one Python object per entity.
+
+Entity ids are ints and stay valid for the entity's whole life. `destroy`
+only marks an entity; `flush` removes every marked row in one pass per
+archetype (keeping the order of the survivors, so draw order and target
+tie-breaks don't shuffle), which makes deletion safe in the middle of a
+system loop and cheap when a whole wave dies at once.
+"""
+from itertools import compress
+
+
+class Archetype:
+    """Rows of entities that share exactly the same component names."""
+
+    def __init__(self, names: frozenset[str]):
+        self.names = names
+        self.columns: dict[str, list] = {name: [] for name in sorted(names)}
+        self.ids: list[int] = []
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def column(self, name: str) -> list:
+        return self.columns[name]
+
+    def _append(self, eid: int, components: dict) -> int:
+        for name, col in self.columns.items():
+            col.append(components[name])
+        self.ids.append(eid)
+        return len(self.ids) - 1
+
+    def _compact(self, keep: list[bool]) -> None:
+        for name, col in self.columns.items():
+            col[:] = compress(col, keep)
+        self.ids[:] = compress(self.ids, keep)
+
+
+class World:
+    def __init__(self):
+        self._next_id = 1
+        self._archetypes: dict[frozenset[str], Archetype] = {}
+        self._location: dict[int, tuple[Archetype, int]] = {}
+        self._doomed: set[int] = set()
+        self._queries: dict[tuple[str, ...], list[Archetype]] = {}
+
+    def __len__(self) -> int:
+        return len(self._location)
+
+    # ------------------------------------------------------------------
+    # Entities
+    # ------------------------------------------------------------------
+    def spawn(self, **components) -> int:
+        names = frozenset(components)
+        arch = self._archetypes.get(names)
+        if arch is None:
+            arch = Archetype(names)
+            self._archetypes[names] = arch
+            self._queries.clear()
+        eid = self._next_id
+        self._next_id += 1
+        self._location[eid] = (arch, arch._append(eid, components))
+        return eid
+
+    def destroy(self, eid: int) -> None:
+        """Mark an entity for removal at the next flush()."""
+        if eid in self._location:
+            self._doomed.add(eid)
+
+    def alive(self, eid: int) -> bool:
+        """True until the entity is destroyed (even before the flush)."""
+        return eid in self._location and eid not in self._doomed
+
+    def locate(self, eid: int) -> tuple[Archetype, int] | None:
+        """(archetype, row) of a live entity, or None."""
+        if eid in self._doomed:
+            return None
+        return self._location.get(eid)
+
+    def get(self, eid: int, name: str, default=None):
+        loc = self.locate(eid)
+        if loc is None:
+            return default
+        arch, row = loc
+        col = arch.columns.get(name)
+        return default if col is None else col[row]
+
+    def flush(self) -> int:
+        """Remove every destroyed entity. Returns how many were removed."""
+        if not self._doomed:
+            return 0
+        doomed = self._doomed
+        by_arch: dict[Archetype, int] = {}
+        for eid in doomed:
+            arch, row = self._location.pop(eid)
+            by_arch[arch] = min(row, by_arch.get(arch, row))
+
+        location = self._location
+        for arch, first in by_arch.items():
+            arch._compact([eid not in doomed for eid in arch.ids])
+            ids = arch.ids
+            for row in range(first, len(ids)):
+                location[ids[row]] = (arch, row)
+
+        removed = len(doomed)
+        self._doomed = set()
+        return removed
+
+    def clear(self) -> None:
+        for arch in self._archetypes.values():
+            arch._compact([False] * len(arch))
+        self._location.clear()
+        self._doomed.clear()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    def query(self, *names: str) -> list[Archetype]:
+        """Non-empty archetypes that have all of `names`."""
+        archs = self._queries.get(names)
+        if archs is None:
+            wanted = set(names)
+            archs = [arch for key, arch in self._archetypes.items() if wanted <= key]
+            self._queries[names] = archs
+        return [arch for arch in archs if arch.ids]
+
+    def count(self, *names: str) -> int:
+        """Live entities that have all of `names` (destroyed ones excluded)."""
+        total = 0
+        for arch in self.query(*names):
+            total += len(arch)
+            if self._doomed:
+                total -= sum(1 for eid in arch.ids if eid in self._doomed)
+        return total
@@ -0,0 +1,183 @@
+"""Endless mode: generated waves past the end of the wave script, plus stats.
+
+After the last scripted wave, `endless_wave` builds wave definitions in the
+same format (see world/wave_script.py) that mix every enemy type of every
+sprite set the script uses (assets/BOSSES AND ENEMIES/WAVE 1..5); a script
+with only boss waves gets lanes of bosses. Each wave
+past the script multiplies the enemy count by ENDLESS_COUNT_GROWTH and
+health by ENDLESS_HEALTH_GROWTH; the spawn rate grows with the count so a
+wave lasts about as long as the last scripted one.
+
+EndlessStats records peak entity counts and the first wave in which frame
+time went over the 60 FPS budget (averaged over one second, so a lone GC or
+asset-load hitch doesn't count; single-frame spikes are tallied separately).
+That makes an endless run double as the standard load test for the
+update/render pipeline (see stress_test.py).
+"""
+import json
+import math
+import os
+from collections import deque
+
+from world.wave_script import wave_art
+
+
+ENDLESS_COUNT_GROWTH = 1.25
+ENDLESS_HEALTH_GROWTH = 1.15
+ENDLESS_MIN_INTERVAL = 0.02
+FRAME_BUDGET = 1 / 60
+FRAME_WINDOW = 60  # frames in the rolling average checked against the budget
+ENDLESS_STATS_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "endless_stats.json"
+)
+
+
+def _roster(waves: list[dict]) -> tuple[list[tuple[int, str, dict]], dict[int, dict]]:
+    """Regular enemies as (art, type, stats) and boss stats per art.
+
+    Stats come from the last scripted wave using that sprite set.
+    """
+    regular: dict[tuple[int, str], dict] = {}
+    bosses: dict[int, dict] = {}
+    for wave_num, wave in enumerate(waves, start=1):
+        art = wave_art(wave, wave_num)
+        enemies = wave.get("enemies", {})
+        for group in wave.get("groups", []):
+            group_art = int(group.get("art", art))
+            for enemy_type in group.get("pattern") or [group["type"]]:
+                base = dict(enemies.get(enemy_type, {}))
+                for field in ("health", "speed", "reward"):
+                    if field in group:
+                        base[field] = group[field]
+                regular[(group_art, enemy_type)] = base
+        boss = wave.get("boss")
+        if boss:
+            base = dict(enemies.get(boss.get("type", "boss"), {}))
+            for field in ("health", "speed", "reward"):
+                if field in boss:
+                    base[field] = boss[field]
+            bosses[int(boss.get("art", art))] = base
+    return [(art, enemy_type, stats) for (art, enemy_type), stats in sorted(regular.items())], bosses
+
+
+def endless_wave(waves: list[dict], wave_num: int) -> dict:
+    """Wave definition for `wave_num` > len(waves), scaled from the script."""
+    step = wave_num - len(waves)
+    if step < 1:
+        raise ValueError(f"wave {wave_num} is a scripted wave")
+    last = waves[-1]
+    groups = last.get("groups", [])
+    base_count = sum(int(group.get("count", 1)) for group in groups) or 1
+    base_interval = min((float(group.get("interval", 1.0)) for group in groups), default=1.0) or 1.0
+
+    count = max(1, round(base_count * ENDLESS_COUNT_GROWTH ** step))
+    health_scale = ENDLESS_HEALTH_GROWTH ** step
+    regular, bosses = _roster(waves)
+    if not regular:
+        # A boss-only script grows its bosses instead; a script with no
+        # enemies at all gets the standard enemy with default stats.
+        regular = [(art, "boss", stats) for art, stats in sorted(bosses.items())]
+        regular = regular or [(wave_art(last, len(waves)), "standard", {})]
+
+    # One lane per (sprite set, type) so every kind keeps arriving in parallel.
+    per_group = math.ceil(count / len(regular))
+    interval = max(ENDLESS_MIN_INTERVAL, base_interval * len(regular) * base_count / count)
+    wave = {
+        "announcement": f"WAVE {wave_num} - ENDLESS!",
+        "groups": [
+            {
+                "type": enemy_type,
+                "art": art,
+                "lane": lane,
+                "count": per_group,
+                "delay": base_interval + lane * base_interval / len(regular),
+                "interval": interval,
+                "health": max(1, round(stats.get("health", 100) * health_scale)),
+                "speed": stats.get("speed", 1.0),
+                "reward": stats.get("reward", 0),
+            }
+            for lane, (art, enemy_type, stats) in enumerate(regular)
+        ],
+    }
+
+    if bosses:
+        arts = sorted(bosses)
+        art = arts[(step - 1) % len(arts)]
+        stats = bosses[art]
+        wave["boss"] = {
+            "type": "boss",
+            "art": art,
+            "delay": base_interval,
+            "health": max(1, round(stats.get("health", 350) * health_scale)),
+            "speed": stats.get("speed", 0.5),
+            "reward": stats.get("reward", 0),
+        }
+    return wave
+
+
+class EndlessStats:
+    """Peak entity counts and the first wave that went over the frame budget."""
+
+    def __init__(self, frame_budget: float = FRAME_BUDGET, window: int = FRAME_WINDOW):
+        self.frame_budget = frame_budget
+        self._window: deque[float] = deque(maxlen=window)
+        self._window_sum = 0.0
+        self.frames = 0
+        self.last_wave = 0
+        self.peaks: dict[str, int] = {}
+        self.peak_wave: dict[str, int] = {}  # wave where each peak was reached
+        self.worst_frame = 0.0
+        self.first_slow_wave: int | None = None
+        self.first_slow_average = 0.0
+        self.first_spike_wave: int | None = None
+        self.slow_frames_by_wave: dict[int, int] = {}
+        self.present: dict | None = None  # presenter.PresentStats.summary(), if known
+
+    def record(self, wave: int, frame_time: float, counts: dict[str, int]) -> None:
+        self.frames += 1
+        self.last_wave = max(self.last_wave, wave)
+        for name, value in counts.items():
+            if value > self.peaks.get(name, -1):
+                self.peaks[name] = value
+                self.peak_wave[name] = wave
+        self.worst_frame = max(self.worst_frame, frame_time)
+        if frame_time > self.frame_budget:
+            self.slow_frames_by_wave[wave] = self.slow_frames_by_wave.get(wave, 0) + 1
+            if self.first_spike_wave is None:
+                self.first_spike_wave = wave
+
+        window = self._window
+        if len(window) == window.maxlen:
+            self._window_sum -= window[0]
+        window.append(frame_time)
+        self._window_sum += frame_time
+        if self.first_slow_wave is None and len(window) == window.maxlen:
+            average = self._window_sum / len(window)
+            if average > self.frame_budget:
+                self.first_slow_wave = wave
+                self.first_slow_average = average
+
+    def summary(self) -> dict:
+        return {
+            "frames": self.frames,
+            "last_wave": self.last_wave,
+            "frame_budget_ms": round(self.frame_budget * 1000, 2),
+            "worst_frame_ms": round(self.worst_frame * 1000, 2),
+            "first_slow_wave": self.first_slow_wave,
+            "first_slow_average_ms": round(self.first_slow_average * 1000, 2) if self.first_slow_wave else None,
+            "first_spike_wave": self.first_spike_wave,
+            "slow_frames_by_wave": {str(wave): n for wave, n in sorted(self.slow_frames_by_wave.items())},
+            "peaks": dict(self.peaks),
+            "peak_wave": dict(self.peak_wave),
+            "present": self.present,
+        }
+
+    def save(self, path: str = ENDLESS_STATS_PATH) -> None:
+        tmp_path = path + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self.summary(), file, indent=2)
+            os.replace(tmp_path, path)
+        except OSError:
+            pass
@@ -0,0 +1,82 @@
+"""Combat events queued during a tick and resolved in one batched phase.
+
+Towers, projectiles and movement only *queue* what happened: a hit
+(damage, with optional slow/stun), an enemy that reached the castle, or an
+enemy that died outside combat. resolve_events (world/systems.py) then runs
+once per tick, in a fixed order:
+
+    damage     apply hits in queue order; an enemy that drops to 0 HP
+               becomes a kill, exactly once
+    kill       credit the killer and queue the coin drop
+    leak       enemies that reached the castle
+    reward     sum the killed enemies' rewards
+    coin drop  throw the coins
+    remove     destroy every killed/leaked entity in one flush
+
+Each tick's totals come back as a TickStats.
+"""
+
+
+class CombatEvents:
+    """Per-tick event queues (cleared by resolve_events)."""
+
+    def __init__(self):
+        # (target id, amount, source, slow_duration, stun_duration)
+        self.hits: list[tuple[int, float, str, float, float]] = []
+        self.leaks: list[int] = []  # enemy ids that reached the castle
+        self.deaths: list[int] = []  # enemy ids that died outside combat
+
+    def hit(self, target: int, amount: float, source: str = "", *, slow: float = 0.0, stun: float = 0.0) -> None:
+        self.hits.append((target, amount, source, slow, stun))
+
+    def leak(self, enemy: int) -> None:
+        self.leaks.append(enemy)
+
+    def death(self, enemy: int) -> None:
+        self.deaths.append(enemy)
+
+    def clear(self) -> None:
+        self.hits.clear()
+        self.leaks.clear()
+        self.deaths.clear()
+
+
+class TickStats:
+    """What one tick's events added up to."""
+
+    __slots__ = (
+        "hits",
+        "damage",
+        "overkill",
+        "kills",
+        "reward",
+        "coin_drops",
+        "leaks",
+        "boss_leaks",
+        "damage_by_source",
+        "kills_by_source",
+    )
+
+    def __init__(self):
+        self.hits = 0
+        self.damage = 0.0  # HP actually removed
+        self.overkill = 0.0  # damage past 0 HP (wasted)
+        self.kills = 0
+        self.reward = 0
+        self.coin_drops = 0
+        self.leaks = 0  # regular enemies that reached the castle
+        self.boss_leaks = 0
+        self.damage_by_source: dict[str, float] = {}
+        self.kills_by_source: dict[str, int] = {}
+
+    def add(self, other: "TickStats") -> None:
+        """Accumulate another tick (for per-wave or per-run totals)."""
+        for name in ("hits", "damage", "overkill", "kills", "reward", "coin_drops", "leaks", "boss_leaks"):
+            setattr(self, name, getattr(self, name) + getattr(other, name))
+        for source, amount in other.damage_by_source.items():
+            self.damage_by_source[source] = self.damage_by_source.get(source, 0.0) + amount
+        for source, n in other.kills_by_source.items():
+            self.kills_by_source[source] = self.kills_by_source.get(source, 0) + n
+
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
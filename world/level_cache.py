@@ -0,0 +1,54 @@
+"""Per-level derived data persisted next to the level file.
+
+TileMap derives a few things from the grid that are expensive to recompute
+on every load: the distance-to-path field, the decoration layout, the
+aesthetic shop/casino trails and the ordered enemy path. They are stored in
+`<level>.derived` (JSON) together with a key hashed from the grid and the
+tile/decor asset version, so editing either simply regenerates the file.
+"""
+import hashlib
+import json
+import os
+
+
+# Bump when the way TileMap derives this data changes.
+DERIVED_VERSION = 1
+
+
+def derived_path_for(level_path: str) -> str:
+    """`levels/foo.json` -> `levels/foo.derived` (not picked up as a level)."""
+    return os.path.splitext(level_path)[0] + ".derived"
+
+
+def derived_key(tiles: list[list[int]], assets_version: str) -> str:
+    h = hashlib.sha1()
+    h.update(f"{DERIVED_VERSION}|{assets_version}|{len(tiles)}\n".encode("utf-8"))
+    for row in tiles:
+        h.update(bytes(int(v) & 0xFF for v in row))
+        h.update(b"\n")
+    return h.hexdigest()
+
+
+def load_derived(path: str, key: str) -> dict | None:
+    """Return the stored data if it was written for `key`, else None."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            data = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("key") != key:
+        return None
+    return data
+
+
+def save_derived(path: str, key: str, data: dict) -> None:
+    """Write the data for `key` (best-effort; failures are ignored)."""
+    payload = dict(data)
+    payload["key"] = key
+    tmp_path = path + ".tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(payload, file, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except (OSError, TypeError, ValueError):
+        pass
@@ -0,0 +1,380 @@
+"""Optional: run the combat simulation in a child process.
+
+With SIM_IN_PROCESS (settings.py / `main.py --sim-process`) the enemies,
+projectiles, towers and wave manager of a level live in a child process;
+the game process keeps the player, shop, coins and HUD, handles input and
+renders. Rendering and simulation then use two cores instead of taking
+turns on one under the GIL.
+
+    game process                          child process
+    ------------                          -------------
+    commands queue  -- step(dt), tower -> wave manager + world/systems.py
+    results queue   <- tick stats, coin drops, wave, victory
+    shared memory   <- render state, double buffered
+
+Render state (enemy, projectile and tower draw fields) is written into one
+of two buffers in a `multiprocessing.shared_memory` block; the child always
+writes the buffer the game isn't pointed at, then flips the front index.
+Each buffer carries a sequence number that is odd while it's being written,
+so a read that raced a (second) write is detected and retried, and the game
+otherwise keeps drawing the previous frame. The game therefore draws state
+that is one step behind, and its own frame time no longer includes the
+simulation.
+"""
+import multiprocessing
+import os
+import queue
+import struct
+import time
+from multiprocessing import shared_memory
+
+from asset_manager import get_projectile_frames
+from entities.enemy import draw_enemy, enemy_look, enemy_sprite_draw_size, get_scaled_enemy_frames
+from entities.projectile import PROJECTILE_SPRITE_SIZE, draw_projectile
+from world.events import TickStats
+from world.systems import ENEMY, PROJECTILE, draw_enemy_marks
+
+MAX_ENEMIES = 4096
+MAX_PROJECTILES = 4096
+MAX_TOWERS = 1024
+
+ENEMY_TYPES = ("standard", "fast_weak", "slow_strong", "boss")
+DIRECTIONS = ("down", "up", "left", "right")
+SOURCES = ("", "goblin", "elf", "knight", "archer", "wizard", "firewarrior", "bloodmage")
+
+FLAG_SPAWNING = 1
+FLAG_ANNOUNCING = 2
+
+# front buffer index
+_HEADER = struct.Struct("<I")
+# seq (odd while writing), tick, wave, enemies, projectiles, towers, dropped
+# (enemies + projectiles over MAX_ENEMIES / MAX_PROJECTILES, not in the
+# frame), flags, announcement timer, sim seconds per step
+_FRAME = struct.Struct("<IIIIIIIBff")
+# x, y, health, max health, stun timer, type, sprite wave, direction, anim frame
+_ENEMY = struct.Struct("<fffffBBBH")
+# x, y, last dx, last dy, source, anim frame
+_PROJECTILE = struct.Struct("<ffffBH")
+# direction, attack timer, anim frame
+_TOWER = struct.Struct("<BfH")
+
+_BUFFER_SIZE = (
+    _FRAME.size + MAX_ENEMIES * _ENEMY.size + MAX_PROJECTILES * _PROJECTILE.size + MAX_TOWERS * _TOWER.size
+)
+_READ_RETRIES = 3
+
+
+def _code(table: tuple[str, ...], value: str) -> int:
+    try:
+        return table.index(value)
+    except ValueError:
+        return 0
+
+
+class SimFrame:
+    """One published snapshot of the child's render state."""
+
+    __slots__ = (
+        "tick", "wave", "flags", "announcement_timer", "step_cost", "enemies", "projectiles", "towers", "dropped",
+    )
+
+    def __init__(
+        self, tick=0, wave=0, flags=0, announcement_timer=0.0, step_cost=0.0, enemies=(), projectiles=(), towers=(),
+        dropped=0,
+    ):
+        self.tick = tick
+        self.wave = wave
+        self.flags = flags
+        self.announcement_timer = announcement_timer
+        self.step_cost = step_cost
+        self.enemies: list[tuple] = list(enemies)  # _ENEMY rows
+        self.projectiles: list[tuple] = list(projectiles)  # _PROJECTILE rows
+        self.towers: list[tuple] = list(towers)  # _TOWER rows, in placement order
+        self.dropped = dropped  # entities over the buffer caps, simulated but not drawn
+
+    @property
+    def spawning(self) -> bool:
+        return bool(self.flags & FLAG_SPAWNING)
+
+    @property
+    def announcing(self) -> bool:
+        return bool(self.flags & FLAG_ANNOUNCING)
+
+
+# ---------------------------------------------------------------------------
+# Game process side
+# ---------------------------------------------------------------------------
+class SimProcess:
+    """Handle on the child process simulating one level."""
+
+    def __init__(self, level_grid, level_path: str | None, waves: list[dict], endless: bool):
+        ctx = multiprocessing.get_context("spawn")
+        self._shm = shared_memory.SharedMemory(create=True, size=_HEADER.size + 2 * _BUFFER_SIZE)
+        self._commands = ctx.Queue()
+        self._results = ctx.Queue()
+        self._process = ctx.Process(
+            target=_child_main,
+            args=(self._shm.name, level_grid, level_path, waves, endless, self._commands, self._results),
+            name="simulation",
+            daemon=True,
+        )
+        self._process.start()
+        self.frame = SimFrame()
+
+    @property
+    def alive(self) -> bool:
+        return self._process.is_alive()
+
+    def step(self, dt: float) -> None:
+        self._commands.put(("step", dt))
+
+    def place_tower(self, tx: int, ty: int, tower_type: str) -> None:
+        self._commands.put(("tower", tx, ty, tower_type))
+
+    def results(self) -> list[tuple[TickStats, list[tuple], int, bool]]:
+        """Everything the child reported since the last call."""
+        out = []
+        while True:
+            try:
+                out.append(self._results.get_nowait())
+            except queue.Empty:
+                return out
+
+    def read_frame(self) -> SimFrame:
+        """Latest published render state (or the previous one after a torn read)."""
+        buf = self._shm.buf
+        for _ in range(_READ_RETRIES):
+            (front,) = _HEADER.unpack_from(buf, 0)
+            base = _HEADER.size + front * _BUFFER_SIZE
+            (
+                seq, tick, wave, n_enemies, n_projectiles, n_towers, dropped, flags, announcement_timer, step_cost,
+            ) = _FRAME.unpack_from(buf, base)
+            if seq & 1:
+                continue  # the child lapped us and is rewriting this buffer
+            if tick == self.frame.tick:
+                return self.frame
+            offset = base + _FRAME.size
+            end = offset + n_enemies * _ENEMY.size
+            enemies = bytes(buf[offset:end])
+            offset = base + _FRAME.size + MAX_ENEMIES * _ENEMY.size
+            projectiles = bytes(buf[offset:offset + n_projectiles * _PROJECTILE.size])
+            offset += MAX_PROJECTILES * _PROJECTILE.size
+            towers = bytes(buf[offset:offset + n_towers * _TOWER.size])
+            if _FRAME.unpack_from(buf, base)[0] != seq:
+                continue
+            self.frame = SimFrame(
+                tick, wave, flags, announcement_timer, step_cost,
+                _ENEMY.iter_unpack(enemies), _PROJECTILE.iter_unpack(projectiles), _TOWER.iter_unpack(towers),
+                dropped,
+            )
+            break
+        return self.frame
+
+    def close(self) -> None:
+        try:
+            self._commands.put(("stop",))
+            self._process.join(timeout=2.0)
+        except (OSError, ValueError):
+            pass
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join(timeout=1.0)
+        self._commands.close()
+        self._results.close()
+        self._shm.close()
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def render_frame(frame: SimFrame, surface, offset: tuple[int, int] = (0, 0)) -> None:
+    """Draw a SimFrame's enemies and projectiles (render_system's remote twin)."""
+    ox, oy = offset
+    for x, y, health, max_health, stun_timer, kind, art, direction, anim_frame in frame.enemies:
+        enemy_type = ENEMY_TYPES[kind]
+        color, radius = enemy_look(enemy_type)
+        frames = get_scaled_enemy_frames(art, enemy_type, enemy_sprite_draw_size(enemy_type))
+        cx = int(x) + ox
+        cy = int(y) + oy
+        draw_enemy(
+            surface, cx, cy, enemy_type, radius, color, frames, DIRECTIONS[direction], anim_frame,
+            health, max_health, stun_timer,
+        )
+        draw_enemy_marks(surface, cx, cy, enemy_type, radius, health, max_health)
+
+    for x, y, last_dx, last_dy, source, anim_frame in frame.projectiles:
+        frames = get_projectile_frames(SOURCES[source], projectile_size=PROJECTILE_SPRITE_SIZE)
+        draw_projectile(surface, int(x) + ox, int(y) + oy, frames, anim_frame, last_dx, last_dy)
+
+
+def apply_tower_states(frame: SimFrame, towers) -> None:
+    """Copy the child's tower facing/attack/animation state onto the game's towers."""
+    for tower, (direction, attack_timer, anim_frame) in zip(towers, frame.towers):
+        tower.direction = DIRECTIONS[direction]
+        tower.attack_timer = attack_timer
+        tower._anim_frame = anim_frame
+
+
+# ---------------------------------------------------------------------------
+# Child process side
+# ---------------------------------------------------------------------------
+class _CoinDrops:
+    """Stands in for the CoinManager: records drops for the game to replay."""
+
+    def __init__(self):
+        self.drops: list[tuple] = []
+
+    def add_animated_coin(self, *args) -> None:
+        self.drops.append(args)
+
+
+class _Simulation:
+    def __init__(self, shm, level_grid, level_path, waves, endless):
+        from game import Game
+        from world.ecs import World
+        from world.events import CombatEvents
+        from world.wave_manager import WaveManager
+
+        self.shm = shm
+        self.tilemap = Game._build_tilemap(level_grid, level_path)
+        self.world = World()
+        self.towers = []
+        self.events = CombatEvents()
+        self.wave_manager = WaveManager(self.tilemap, waves, endless=endless)
+        self.wave_manager.start_wave(1)
+        self.won = False
+        self.tick = 0
+        self.front = 0
+        self.step_cost = 0.0
+        self.stats = TickStats()
+        self.coins = _CoinDrops()
+
+    def place_tower(self, tx: int, ty: int, tower_type: str) -> None:
+        from entities.tower import Tower
+
+        self.towers.append(Tower((tx, ty), tower_type))
+        self.tilemap.apply_tower_placement(tx, ty)
+
+    def step(self, dt: float) -> None:
+        """The combat half of Game._step_playing."""
+        from world.systems import movement_system, resolve_events, targeting_system
+
+        wm = self.wave_manager
+        if wm.show_announcement or self.won:
+            wm.update(dt, self.world)
+            return
+        start = time.perf_counter()
+        wm.update(dt, self.world)
+        if wm.check_wave_complete(self.world):
+            if wm.has_next_wave():
+                wm.start_wave(wm.current_wave + 1)
+            else:
+                self.won = True
+        movement_system(self.world, dt, self.events)
+        targeting_system(self.world, self.towers, dt, self.events, self.tilemap)
+        self.stats.add(resolve_events(self.world, self.events, self.coins))
+        self.step_cost = time.perf_counter() - start
+
+    def report(self) -> tuple[TickStats, list[tuple], int, bool]:
+        stats, self.stats = self.stats, TickStats()
+        drops, self.coins.drops = self.coins.drops, []
+        return stats, drops, self.wave_manager.current_wave, self.won
+
+    def publish(self) -> None:
+        buf = self.shm.buf
+        back = 1 - self.front
+        base = _HEADER.size + back * _BUFFER_SIZE
+        seq = _FRAME.unpack_from(buf, base)[0] + 1  # odd: being written
+        struct.pack_into("<I", buf, base, seq)
+
+        offset = base + _FRAME.size
+        n_enemies = 0
+        dropped = 0
+        for arch in self.world.query(*ENEMY):
+            c = arch.columns
+            rows = zip(
+                c["pos_x"], c["pos_y"], c["health"], c["max_health"], c["stun_timer"], c["enemy_type"],
+                c["wave_num"], c["direction"], c["anim_frame"],
+            )
+            for x, y, health, max_health, stun, kind, art, direction, frame in rows:
+                if n_enemies == MAX_ENEMIES:
+                    dropped += 1  # still simulated, just not drawn; counted in the frame
+                    continue
+                _ENEMY.pack_into(
+                    buf, offset, x, y, health, max_health, stun, _code(ENEMY_TYPES, kind), art,
+                    _code(DIRECTIONS, direction), frame,
+                )
+                offset += _ENEMY.size
+                n_enemies += 1
+
+        offset = base + _FRAME.size + MAX_ENEMIES * _ENEMY.size
+        n_projectiles = 0
+        for arch in self.world.query(*PROJECTILE):
+            c = arch.columns
+            for x, y, dx, dy, source, frame in zip(
+                c["x"], c["y"], c["last_dx"], c["last_dy"], c["source_type"], c["anim_frame"]
+            ):
+                if n_projectiles == MAX_PROJECTILES:
+                    dropped += 1
+                    continue
+                _PROJECTILE.pack_into(buf, offset, x, y, dx, dy, _code(SOURCES, source), frame)
+                offset += _PROJECTILE.size
+                n_projectiles += 1
+
+        offset = base + _FRAME.size + MAX_ENEMIES * _ENEMY.size + MAX_PROJECTILES * _PROJECTILE.size
+        towers = self.towers[:MAX_TOWERS]
+        for tower in towers:
+            _TOWER.pack_into(
+                buf, offset, _code(DIRECTIONS, tower.direction), max(0.0, tower.attack_timer), tower._anim_frame
+            )
+            offset += _TOWER.size
+
+        wm = self.wave_manager
+        flags = (FLAG_SPAWNING if wm.spawning else 0) | (FLAG_ANNOUNCING if wm.show_announcement else 0)
+        self.tick += 1
+        _FRAME.pack_into(
+            buf, base, seq + 1, self.tick, wm.current_wave, n_enemies, n_projectiles, len(towers), dropped, flags,
+            wm.announcement_timer, self.step_cost,
+        )
+        _HEADER.pack_into(buf, 0, back)
+        self.front = back
+
+
+def _child_main(shm_name, level_grid, level_path, waves, endless, commands, results) -> None:
+    os.environ["SDL_VIDEODRIVER"] = "dummy"
+    os.environ["SDL_AUDIODRIVER"] = "dummy"
+    import pygame
+
+    pygame.display.init()
+    pygame.display.set_mode((1, 1))  # sprite loading converts surfaces
+
+    # The game process owns (and unlinks) the block; a spawned child shares
+    # its resource tracker, so attaching here doesn't register it twice.
+    shm = shared_memory.SharedMemory(name=shm_name)
+    sim = _Simulation(shm, level_grid, level_path, waves, endless)
+    sim.publish()
+    try:
+        while True:
+            batch = [commands.get()]
+            while True:
+                try:
+                    batch.append(commands.get_nowait())
+                except queue.Empty:
+                    break
+            stepped = False
+            for command in batch:
+                kind = command[0]
+                if kind == "step":
+                    sim.step(command[1])
+                    stepped = True
+                elif kind == "tower":
+                    sim.place_tower(*command[1:])
+                elif kind == "stop":
+                    return
+            if stepped:
+                sim.publish()
+                results.put(sim.report())
+    finally:
+        shm.close()
+        pygame.quit()
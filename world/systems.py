@@ -0,0 +1,331 @@
+"""Per-tick systems over the entity store (world/ecs.py).
+
+Enemies and projectiles are entities with archetype component arrays; the
+systems below are the only code that walks them. One playing tick runs:
+
+    movement_system   enemies along the path, projectiles toward targets
+    targeting_system  towers pick the nearest enemy and attack
+    resolve_events    damage -> kills -> rewards/coin drops, leaks, removal
+    render_system     draw enemies and projectiles
+
+The first two only queue CombatEvents (world/events.py); nothing changes
+health or removes an entity until resolve_events runs once at the end of
+the tick, so every kill is handled exactly once whatever order towers and
+projectiles ran in.
+"""
+import math
+
+import pygame
+
+from coins import drop_coins
+from entities.enemy import draw_enemy
+from entities.projectile import PROJECTILE_FRAME_TIME, draw_projectile, play_boss_hit_sfx
+from settings import BLACK, TILE_SIZE, WHITE
+from world.events import CombatEvents, TickStats
+
+# Component names that identify each kind of entity in queries.
+ENEMY = ("path_index", "health")
+PROJECTILE = ("target", "proj_speed")
+
+
+def enemy_count(world) -> int:
+    return world.count(*ENEMY)
+
+
+def movement_system(world, dt: float, events: CombatEvents) -> None:
+    _move_enemies(world, dt, events)
+    _move_projectiles(world, dt, events)
+
+
+def _move_enemies(world, dt: float, events: CombatEvents) -> None:
+    for arch in world.query(*ENEMY):
+        c = arch.columns
+        paths = c["path"]
+        path_index = c["path_index"]
+        pos_x = c["pos_x"]
+        pos_y = c["pos_y"]
+        speed = c["speed"]
+        base_speed = c["base_speed"]
+        finished = c["finished"]
+        health = c["health"]
+        slow_timer = c["slow_timer"]
+        stun_timer = c["stun_timer"]
+        direction = c["direction"]
+        anim_timer = c["anim_timer"]
+        anim_frame = c["anim_frame"]
+        frames = c["frames"]
+        tile_x = c["tile_x"]
+        tile_y = c["tile_y"]
+        ids = arch.ids
+
+        for i in range(len(arch)):
+            if finished[i]:
+                continue
+            path = paths[i]
+            last = len(path) - 1
+            if health[i] <= 0:
+                finished[i] = True
+                events.death(ids[i])
+                continue
+            if path_index[i] >= last:
+                # Reached the castle
+                finished[i] = True
+                events.leak(ids[i])
+                continue
+
+            # Don't move while stunned
+            if stun_timer[i] > 0:
+                stun_timer[i] -= dt
+                continue
+
+            if slow_timer[i] > 0:
+                slow_timer[i] -= dt
+                speed[i] = base_speed[i] * 0.6
+            else:
+                speed[i] = base_speed[i]
+
+            # Smooth continuous movement along the path (tiles/sec -> pixels/sec).
+            remaining = max(0.0, speed[i]) * TILE_SIZE * max(0.0, dt)
+            x = pos_x[i]
+            y = pos_y[i]
+            k = path_index[i]
+            heading = direction[i]
+            while remaining > 0.0 and k < last:
+                tx, ty = path[k + 1]
+                dx = float(tx) - x
+                dy = float(ty) - y
+                dist = math.hypot(dx, dy)
+
+                # Face where we're heading.
+                if abs(dx) > abs(dy):
+                    heading = "right" if dx > 0 else "left"
+                elif abs(dy) > 0:
+                    heading = "down" if dy > 0 else "up"
+
+                if dist <= 1e-6:
+                    k += 1
+                    continue
+                if dist <= remaining:
+                    x = float(tx)
+                    y = float(ty)
+                    k += 1
+                    remaining -= dist
+                else:
+                    step = remaining / dist
+                    x += dx * step
+                    y += dy * step
+                    remaining = 0.0
+            pos_x[i] = x
+            pos_y[i] = y
+            path_index[i] = k
+            direction[i] = heading
+            tile_x[i] = int(x // TILE_SIZE)
+            tile_y[i] = int(y // TILE_SIZE)
+
+            # Animation, slightly faster for faster enemies.
+            anim_timer[i] += dt
+            speed_factor = max(0.6, min(2.0, speed[i] / 3.0))
+            frame_time = max(0.06, 0.12 / speed_factor)
+            dir_frames = frames[i].get(heading)
+            if dir_frames and anim_timer[i] >= frame_time:
+                anim_timer[i] = 0.0
+                anim_frame[i] = (anim_frame[i] + 1) % len(dir_frames)
+
+
+def _move_projectiles(world, dt: float, events: CombatEvents) -> None:
+    for arch in world.query(*PROJECTILE):
+        c = arch.columns
+        ids = arch.ids
+        xs = c["x"]
+        ys = c["y"]
+        targets = c["target"]
+        speeds = c["proj_speed"]
+        damage = c["damage"]
+        slow = c["slow_duration"]
+        source = c["source_type"]
+        last_dx = c["last_dx"]
+        last_dy = c["last_dy"]
+        anim_timer = c["anim_timer"]
+        anim_frame = c["anim_frame"]
+        sprite = c["sprite"]
+
+        for i in range(len(arch)):
+            loc = world.locate(targets[i])
+            if loc is None or loc[0].columns["finished"][loc[1]]:
+                world.destroy(ids[i])
+                continue
+            target_arch, row = loc
+            tc = target_arch.columns
+            cx = int(tc["pos_x"][row])
+            cy = int(tc["pos_y"][row])
+            radius = tc["radius"][row]
+
+            dx = cx - xs[i]
+            dy = cy - ys[i]
+            dist = math.hypot(dx, dy)
+            if dist > 1e-6:
+                last_dx[i] = dx
+                last_dy[i] = dy
+
+            # Hit when close to the target's center or inside its square.
+            if dist < max(5, radius) or (-radius <= -dx < radius and -radius <= -dy < radius):
+                events.hit(targets[i], damage[i], source[i], slow=slow[i])
+                world.destroy(ids[i])
+                continue
+
+            xs[i] += (dx / dist) * speeds[i] * dt
+            ys[i] += (dy / dist) * speeds[i] * dt
+
+            frames = sprite[i]
+            if frames:
+                anim_timer[i] += dt
+                if anim_timer[i] >= PROJECTILE_FRAME_TIME:
+                    anim_timer[i] = 0.0
+                    anim_frame[i] = (anim_frame[i] + 1) % len(frames)
+
+
+def nearest_enemy(world, x: float, y: float, reach: float) -> int | None:
+    """Id of the closest enemy within `reach` pixels of (x, y), or None."""
+    best = None
+    best_d2 = reach * reach
+    found = False
+    for arch in world.query(*ENEMY):
+        c = arch.columns
+        pos_x = c["pos_x"]
+        pos_y = c["pos_y"]
+        finished = c["finished"]
+        for i in range(len(arch)):
+            if finished[i]:
+                continue
+            dx = int(pos_x[i]) - x
+            dy = int(pos_y[i]) - y
+            d2 = dx * dx + dy * dy
+            if d2 < best_d2 or (not found and d2 == best_d2):
+                best_d2 = d2
+                best = arch.ids[i]
+                found = True
+    return best
+
+
+def targeting_system(world, towers, dt: float, events: CombatEvents, tilemap=None) -> None:
+    for tower in towers:
+        cx, cy = tower.rect.center
+        target = nearest_enemy(world, cx, cy, tower.range)
+        tower.update(dt, world, target, events, tilemap)
+
+
+def resolve_events(world, events: CombatEvents, coin_manager) -> TickStats:
+    """Apply one tick's queued events (see world/events.py)."""
+    stats = TickStats()
+    kills: list[tuple[int, str]] = []
+
+    # Damage: hits land in queue order; the hit that takes an enemy to 0 HP
+    # makes it a kill (finished enemies - leaked or already dead - are skipped).
+    damage_by_source = stats.damage_by_source
+    for target, amount, source, slow, stun in events.hits:
+        loc = world.locate(target)
+        if loc is None:
+            continue
+        arch, row = loc
+        c = arch.columns
+        if c["finished"][row]:
+            continue
+        health = c["health"][row]
+        dealt = min(amount, health) if health > 0 else 0
+        stats.hits += 1
+        stats.damage += dealt
+        stats.overkill += amount - dealt
+        damage_by_source[source] = damage_by_source.get(source, 0.0) + dealt
+        c["health"][row] = health - amount
+        c["killed_by_tower"][row] = True
+        if c["enemy_type"][row] == "boss":
+            play_boss_hit_sfx()
+        if slow > 0:
+            c["slow_timer"][row] = slow
+        if stun > 0 and not c["has_been_stunned"][row]:
+            c["stun_timer"][row] = stun
+            c["has_been_stunned"][row] = True
+        if health - amount <= 0:
+            c["finished"][row] = True
+            kills.append((target, source))
+    kills.extend((enemy, "") for enemy in events.deaths)
+
+    # Kills -> rewards and coin drops
+    coin_drops: list[tuple[int, int, str]] = []
+    kills_by_source = stats.kills_by_source
+    for enemy, source in kills:
+        arch, row = world.locate(enemy)
+        c = arch.columns
+        stats.kills += 1
+        stats.reward += c["reward"][row]
+        if source:
+            kills_by_source[source] = kills_by_source.get(source, 0) + 1
+        coin_drops.append((c["tile_x"][row], c["tile_y"][row], c["enemy_type"][row]))
+        world.destroy(enemy)
+
+    # Leaks
+    for enemy in events.leaks:
+        if world.get(enemy, "enemy_type") == "boss":
+            stats.boss_leaks += 1
+        else:
+            stats.leaks += 1
+        world.destroy(enemy)
+
+    for tx, ty, enemy_type in coin_drops:
+        drop_coins(coin_manager, tx, ty, enemy_type)
+    stats.coin_drops = len(coin_drops)
+
+    # Removal: killed/leaked enemies and spent projectiles, in one pass.
+    world.flush()
+    events.clear()
+    return stats
+
+
+def draw_enemy_marks(surface, cx: int, cy: int, kind: str, radius: int, health: float, max_health: float) -> None:
+    """Boss health bar / slow_strong warning icon over an enemy at screen (cx, cy)."""
+    if kind == "boss":
+        # Full health bar above boss enemies
+        bar_x = cx - 30
+        bar_y = cy - radius - 20
+        pygame.draw.rect(surface, BLACK, (bar_x, bar_y, 60, 8))
+        if max_health > 0:
+            ratio = max(0, health / max_health)
+            color = (0, 255, 0) if ratio > 0.5 else (255, 255, 0) if ratio > 0.2 else (255, 0, 0)
+            pygame.draw.rect(surface, color, (bar_x, bar_y, 60 * ratio, 8))
+        pygame.draw.rect(surface, WHITE, (bar_x, bar_y, 60, 8), 2)
+    elif kind == "slow_strong":
+        # Small warning icon
+        pygame.draw.circle(surface, (200, 50, 200), (cx + 15, cy - 15), 5)
+        pygame.draw.circle(surface, (255, 255, 255), (cx + 15, cy - 15), 5, 1)
+
+
+def render_system(world, surface, offset: tuple[int, int] = (0, 0)) -> None:
+    ox, oy = offset
+    for arch in world.query(*ENEMY):
+        c = arch.columns
+        pos_x = c["pos_x"]
+        pos_y = c["pos_y"]
+        enemy_type = c["enemy_type"]
+        radius = c["radius"]
+        health = c["health"]
+        max_health = c["max_health"]
+        for i in range(len(arch)):
+            cx = int(pos_x[i]) + ox
+            cy = int(pos_y[i]) + oy
+            kind = enemy_type[i]
+            r = radius[i]
+            draw_enemy(
+                surface, cx, cy, kind, r, c["color"][i], c["frames"][i], c["direction"][i],
+                c["anim_frame"][i], health[i], max_health[i], c["stun_timer"][i],
+            )
+            draw_enemy_marks(surface, cx, cy, kind, r, health[i], max_health[i])
+
+    for arch in world.query(*PROJECTILE):
+        c = arch.columns
+        xs = c["x"]
+        ys = c["y"]
+        for i in range(len(arch)):
+            draw_projectile(
+                surface, int(xs[i]) + ox, int(ys[i]) + oy, c["sprite"][i],
+                c["anim_frame"][i], c["last_dx"][i], c["last_dy"][i],
+            )
@@ -0,0 +1,293 @@
+"""Compact uint8 mirror of a level grid with precomputed per-tile masks.
+
+TileMap keeps `tiles` (list of lists) as its public representation. TileGrid
+mirrors it as flat uint8 buffers: tile ids, a bit set of gameplay flags
+(path / blocked / buildable / edge / special) and an autotile bitmask of
+which orthogonal neighbours are core path. Point queries become one index
+into a bytearray; bulk work (distance fields, decor eligibility) runs as
+array operations when NumPy is installed and as plain Python otherwise.
+"""
+from collections import deque
+
+try:
+    import numpy as np
+except ImportError:  # optional: only speeds up bulk operations
+    np = None
+
+from settings import (
+    TILE_GRASS,
+    TILE_WALL,
+    TILE_PATH,
+    TILE_CASTLE,
+    TILE_START,
+    TILE_FINISH,
+    TILE_SHOP,
+    TILE_CASINO,
+)
+
+
+CORE_PATH_IDS = (TILE_PATH, TILE_START, TILE_FINISH, TILE_CASTLE)
+SPECIAL_IDS = (TILE_SHOP, TILE_CASINO, TILE_START, TILE_FINISH, TILE_CASTLE)
+
+# Per-tile flags.
+FLAG_PATH = 1  # core path (enemy route, start, finish, castle)
+FLAG_BLOCKED = 2  # wall
+FLAG_BUILDABLE = 4  # plain grass
+FLAG_EDGE = 8  # grass drawn as a path edge (exactly one core path neighbour)
+FLAG_SPECIAL = 16  # shop/casino/start/finish/castle
+
+# Autotile neighbour bits: set when that neighbour is core path.
+NEIGHBOUR_RIGHT = 1
+NEIGHBOUR_LEFT = 2
+NEIGHBOUR_DOWN = 4
+NEIGHBOUR_UP = 8
+
+_SINGLE_BITS = (NEIGHBOUR_RIGHT, NEIGHBOUR_LEFT, NEIGHBOUR_DOWN, NEIGHBOUR_UP)
+
+
+def _flags_for_id(tile_id: int) -> int:
+    flags = 0
+    if tile_id in CORE_PATH_IDS:
+        flags |= FLAG_PATH
+    if tile_id == TILE_WALL:
+        flags |= FLAG_BLOCKED
+    if tile_id == TILE_GRASS:
+        flags |= FLAG_BUILDABLE
+    if tile_id in SPECIAL_IDS:
+        flags |= FLAG_SPECIAL
+    return flags
+
+
+def grid_distance(sources, width: int, height: int, *, diagonal: bool = False) -> list[list[int]]:
+    """Multi-source BFS over a width x height grid from the given (x, y) tiles.
+
+    Returns per-tile Manhattan distance (or Chebyshev distance with
+    `diagonal=True`) to the nearest source; 9999 if there are none.
+    """
+    dist = [[9999 for _ in range(width)] for _ in range(height)]
+    q: deque[tuple[int, int]] = deque()
+    for x, y in sources:
+        if 0 <= x < width and 0 <= y < height and dist[y][x] != 0:
+            dist[y][x] = 0
+            q.append((x, y))
+
+    if diagonal:
+        steps = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+    else:
+        steps = ((1, 0), (-1, 0), (0, 1), (0, -1))
+    while q:
+        x, y = q.popleft()
+        d = dist[y][x] + 1
+        for dx, dy in steps:
+            nx = x + dx
+            ny = y + dy
+            if nx < 0 or ny < 0 or nx >= width or ny >= height:
+                continue
+            if d < dist[ny][nx]:
+                dist[ny][nx] = d
+                q.append((nx, ny))
+    return dist
+
+
+class TileGrid:
+    def __init__(self, tiles: list[list[int]], width: int, height: int):
+        self.width = int(width)
+        self.height = int(height)
+        n = self.width * self.height
+        self.ids = bytearray(n)
+        self.flags = bytearray(n)
+        self.neighbours = bytearray(n)
+        self.rebuild(tiles)
+
+    # ------------------------------------------------------------------
+    # Building / updating
+    # ------------------------------------------------------------------
+    def rebuild(self, tiles: list[list[int]]) -> None:
+        """Recompute every buffer from a list-of-lists grid."""
+        w = self.width
+        for y in range(self.height):
+            row = tiles[y][:w]
+            try:
+                self.ids[y * w:(y + 1) * w] = bytes(row)  # plain 0-255 ints: one C-level copy
+            except (TypeError, ValueError):
+                self.ids[y * w:(y + 1) * w] = bytes(int(v) & 0xFF for v in row)
+        if np is not None:
+            self._rebuild_masks_numpy()
+        else:
+            for i in range(len(self.ids)):
+                self.flags[i] = _flags_for_id(self.ids[i])
+            for y in range(self.height):
+                for x in range(w):
+                    self._update_neighbours(x, y)
+
+    def _rebuild_masks_numpy(self) -> None:
+        ids = self.as_array(self.ids)
+        flags = self.as_array(self.flags)
+        nb = self.as_array(self.neighbours)
+
+        core = np.isin(ids, CORE_PATH_IDS)
+        flags[...] = (
+            core * FLAG_PATH
+            | (ids == TILE_WALL) * FLAG_BLOCKED
+            | (ids == TILE_GRASS) * FLAG_BUILDABLE
+            | np.isin(ids, SPECIAL_IDS) * FLAG_SPECIAL
+        )
+
+        nb[...] = 0
+        nb[:, :-1] |= core[:, 1:] * np.uint8(NEIGHBOUR_RIGHT)
+        nb[:, 1:] |= core[:, :-1] * np.uint8(NEIGHBOUR_LEFT)
+        nb[:-1, :] |= core[1:, :] * np.uint8(NEIGHBOUR_DOWN)
+        nb[1:, :] |= core[:-1, :] * np.uint8(NEIGHBOUR_UP)
+
+        single = np.isin(nb, _SINGLE_BITS)
+        flags[(ids == TILE_GRASS) & single] |= FLAG_EDGE
+
+    def set_tile(self, x: int, y: int, tile_id: int) -> None:
+        """Change one tile and refresh its masks and its neighbours' masks."""
+        i = y * self.width + x
+        self.ids[i] = int(tile_id) & 0xFF
+        self.flags[i] = _flags_for_id(self.ids[i]) | (self.flags[i] & FLAG_EDGE)
+        for nx, ny in ((x, y), (x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                self._update_neighbours(nx, ny)
+
+    def set_tiles(self, indices, tile_ids) -> None:
+        """Bulk set_tile over flat indices; `tile_ids` is one id or one id per index."""
+        ids = self.ids
+        if isinstance(tile_ids, int):
+            tile_id = tile_ids & 0xFF
+            for i in indices:
+                ids[i] = tile_id
+        else:
+            for i, tile_id in zip(indices, tile_ids):
+                ids[i] = int(tile_id) & 0xFF
+        if np is not None and len(indices) * 8 > len(ids):
+            self._rebuild_masks_numpy()  # big edits: cheaper to redo everything
+            return
+        w = self.width
+        h = self.height
+        around = set()
+        for i in indices:
+            self.flags[i] = _flags_for_id(ids[i]) | (self.flags[i] & FLAG_EDGE)
+            x = i % w
+            y = i // w
+            around.add(i)
+            if x + 1 < w:
+                around.add(i + 1)
+            if x > 0:
+                around.add(i - 1)
+            if y + 1 < h:
+                around.add(i + w)
+            if y > 0:
+                around.add(i - w)
+        for i in around:
+            self._update_neighbours(i % w, i // w)
+
+    def _update_neighbours(self, x: int, y: int) -> None:
+        w = self.width
+        mask = 0
+        if x + 1 < w and self.flags[y * w + x + 1] & FLAG_PATH:
+            mask |= NEIGHBOUR_RIGHT
+        if x > 0 and self.flags[y * w + x - 1] & FLAG_PATH:
+            mask |= NEIGHBOUR_LEFT
+        if y + 1 < self.height and self.flags[(y + 1) * w + x] & FLAG_PATH:
+            mask |= NEIGHBOUR_DOWN
+        if y > 0 and self.flags[(y - 1) * w + x] & FLAG_PATH:
+            mask |= NEIGHBOUR_UP
+        i = y * w + x
+        self.neighbours[i] = mask
+        if self.ids[i] == TILE_GRASS and mask in _SINGLE_BITS:
+            self.flags[i] |= FLAG_EDGE
+        else:
+            self.flags[i] &= ~FLAG_EDGE & 0xFF
+
+    # ------------------------------------------------------------------
+    # Point queries
+    # ------------------------------------------------------------------
+    def in_bounds(self, x: int, y: int) -> bool:
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def has_flag(self, x: int, y: int, flag: int) -> bool:
+        """Flag test; out-of-bounds tiles have no flags."""
+        if x < 0 or y < 0 or x >= self.width or y >= self.height:
+            return False
+        return bool(self.flags[y * self.width + x] & flag)
+
+    def neighbour_mask(self, x: int, y: int) -> int:
+        return self.neighbours[y * self.width + x]
+
+    def region(self, x: int, y: int) -> list[int]:
+        """Flat indices of the 4-connected region of same-id tiles at (x, y) (scanline fill)."""
+        if not self.in_bounds(x, y):
+            return []
+        w = self.width
+        ids = self.ids
+        target = ids[y * w + x]
+        seen = bytearray(len(ids))
+        out: list[int] = []
+        stack = [(x, y)]
+        while stack:
+            x, y = stack.pop()
+            row = y * w
+            if seen[row + x]:
+                continue
+            lx = x
+            while lx > 0 and ids[row + lx - 1] == target and not seen[row + lx - 1]:
+                lx -= 1
+            rx = x
+            while rx < w - 1 and ids[row + rx + 1] == target and not seen[row + rx + 1]:
+                rx += 1
+            seen[row + lx:row + rx + 1] = b"\x01" * (rx - lx + 1)
+            out.extend(range(row + lx, row + rx + 1))
+            for ny in (y - 1, y + 1):
+                if not 0 <= ny < self.height:
+                    continue
+                nrow = ny * w
+                in_span = False
+                for nx in range(lx, rx + 1):
+                    if ids[nrow + nx] == target and not seen[nrow + nx]:
+                        if not in_span:
+                            stack.append((nx, ny))
+                            in_span = True
+                    else:
+                        in_span = False
+        return out
+
+    # ------------------------------------------------------------------
+    # Bulk operations
+    # ------------------------------------------------------------------
+    def as_array(self, buf: bytearray):
+        """Zero-copy (height, width) uint8 NumPy view of one of the buffers."""
+        return np.frombuffer(buf, dtype=np.uint8).reshape(self.height, self.width)
+
+    def tiles_with_flag(self, flag: int) -> list[tuple[int, int]]:
+        w = self.width
+        return [(i % w, i // w) for i, f in enumerate(self.flags) if f & flag]
+
+    def distance_to_flag(self, flag: int, *, diagonal: bool = False) -> list[list[int]]:
+        """Per-tile distance to the nearest tile with `flag` (see grid_distance)."""
+        if np is None:
+            return grid_distance(self.tiles_with_flag(flag), self.width, self.height, diagonal=diagonal)
+
+        # Grow the source mask one ring at a time; each ring is one step further.
+        reached = (self.as_array(self.flags) & flag) != 0
+        dist = np.full((self.height, self.width), 9999, dtype=np.int32)
+        dist[reached] = 0
+        frontier = reached.copy()
+        d = 0
+        while frontier.any():
+            d += 1
+            grown = np.zeros_like(frontier)
+            grown[:, 1:] |= frontier[:, :-1]
+            grown[:, :-1] |= frontier[:, 1:]
+            grown[1:, :] |= frontier[:-1, :]
+            grown[:-1, :] |= frontier[1:, :]
+            if diagonal:
+                grown[1:, 1:] |= frontier[:-1, :-1]
+                grown[1:, :-1] |= frontier[:-1, 1:]
+                grown[:-1, 1:] |= frontier[1:, :-1]
+                grown[:-1, :-1] |= frontier[1:, 1:]
+            frontier = grown & ~reached
+            dist[frontier] = d
+            reached |= frontier
+        return dist.tolist()
@@ -1,10 +1,423 @@
+import hashlib
+import math
 import os
+import threading
 import pygame
-from collections import deque
+from collections import OrderedDict, deque
 from settings import *
+from world.level_cache import derived_key, load_derived, save_derived
+from world.tile_grid import (
+    TileGrid,
+    grid_distance,
+    FLAG_PATH,
+    FLAG_BLOCKED,
+    FLAG_BUILDABLE,
+    FLAG_SPECIAL,
+    NEIGHBOUR_RIGHT,
+    NEIGHBOUR_LEFT,
+    NEIGHBOUR_DOWN,
+    NEIGHBOUR_UP,
+)
+
+
+_ASSETS_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets"))
+
+# Decoded images shared by every TileMap (key: absolute path).
+_IMAGE_CACHE: dict[str, pygame.Surface | None] = {}
+
+_TILE_FILENAMES = {
+    "grass": "grass.png",
+    "path_main": "PATH MAIN.png",
+    "edge_left": "PATH EDGE LEFT.png",
+    "edge_right": "PATH EDGE RIGHT.png",
+    "edge_up": "PATH EDGE UP.png",
+    "edge_down": "PATH EDGE DOWN.png",
+}
+
+# Ground rendering chunk size (tiles per side) and how many chunk surfaces
+# a TileMap keeps around (raised automatically if the view needs more).
+CHUNK_TILES = 16
+CHUNK_CACHE_LIMIT = 48
+
+_DECOR_FOLDERS = ("1 Shadow", "4 Stone", "5 Grass", "6 Flower", "7 Decor", "8 Camp", "9 Bush")
+
+
+def _load_image(path: str) -> pygame.Surface | None:
+    """Load (and convert) an image once; later calls reuse the decoded surface."""
+    if path in _IMAGE_CACHE:
+        return _IMAGE_CACHE[path]
+    try:
+        img = pygame.image.load(path).convert_alpha()
+    except Exception:
+        img = None
+    _IMAGE_CACHE[path] = img
+    return img
+
+
+def tilemap_asset_paths() -> list[str]:
+    """Return every image path a TileMap reads, for the preload manifest."""
+    paths = [os.path.join(_ASSETS_DIR, "tiles", f) for f in _TILE_FILENAMES.values()]
+    paths.append(os.path.join(_ASSETS_DIR, "CASTLE.png"))
+    paths.append(os.path.join(_ASSETS_DIR, "campfire-sheet.png"))
+    decor_root = os.path.join(_ASSETS_DIR, "decoration")
+    for folder in _DECOR_FOLDERS:
+        folder_path = os.path.join(decor_root, folder)
+        try:
+            names = os.listdir(folder_path)
+        except Exception:
+            continue
+        for name in names:
+            if name.lower().endswith(".png"):
+                paths.append(os.path.join(folder_path, name))
+    return paths
+
+
+class TileMapAssets:
+    """Level-independent TileMap art and the variants derived from it.
+
+    Tile surfaces, the scaled castle and its shadow, grass shade variants and
+    the decoration sprite groups only depend on the asset files, so a single
+    instance is shared by every live TileMap (see acquire_tilemap_assets).
+    """
+
+    def __init__(self):
+        self.tile_surfaces = self._load_tile_surfaces()
+        self.castle_surface = self._load_castle_surface()
+        self.version = self._compute_version()
+
+        # Visual-only variants and decor sprites are built by ensure_visuals().
+        self.castle_shadow_surface: pygame.Surface | None = None
+        self.deco_grass_path_variants: list[pygame.Surface] | None = None
+        self.grass_shades: dict[str, list[pygame.Surface] | None] = {}
+        self.decor: dict = {}
+        self.decor_sprites: list[pygame.Surface] = []
+        self._decor_sprite_ids: dict[int, int] = {}
+        self._visuals_ready = False
+        self._visuals_lock = threading.Lock()
+
+    def ensure_visuals(self) -> None:
+        """Build shade/trail variants, the castle shadow and decor sprites once."""
+        if self._visuals_ready:
+            return
+        with self._visuals_lock:
+            if self._visuals_ready:
+                return
+            self.castle_shadow_surface = self._build_castle_shadow(self.castle_surface)
+            self.deco_grass_path_variants = self._build_deco_grass_path_variants(self.tile_surfaces.get("grass"))
+            self.grass_shades = self._build_grass_shades(self.tile_surfaces)
+            self.decor = self._load_decor()
+            # Stable sprite ids so a decoration layout can be stored on disk.
+            self.decor_sprites = self._index_decor_sprites(self.decor)
+            self._decor_sprite_ids = {id(s): i for i, s in enumerate(self.decor_sprites)}
+            self._visuals_ready = True
+
+    def decor_sprite_id(self, surf: pygame.Surface | None) -> int:
+        """Index of `surf` in decor_sprites, or -1 (None / unknown sprite)."""
+        if surf is None:
+            return -1
+        return self._decor_sprite_ids.get(id(surf), -1)
+
+    def decor_sprite(self, sprite_id: int) -> pygame.Surface | None:
+        if 0 <= sprite_id < len(self.decor_sprites):
+            return self.decor_sprites[sprite_id]
+        return None
+
+    @staticmethod
+    def _index_decor_sprites(decor: dict) -> list[pygame.Surface]:
+        sprites: list[pygame.Surface] = []
+        seen: set[int] = set()
+
+        def add(surf) -> None:
+            if isinstance(surf, pygame.Surface) and id(surf) not in seen:
+                seen.add(id(surf))
+                sprites.append(surf)
+
+        for value in decor.values():
+            if isinstance(value, list):
+                for item in value:
+                    add(item[1] if isinstance(item, tuple) else item)
+            else:
+                add(value)
+        return sprites
+
+    @staticmethod
+    def _compute_version() -> str:
+        """Hash of the asset files (and their listing order) these surfaces come from."""
+        h = hashlib.sha1(f"{TILE_SIZE}\n".encode("utf-8"))
+        for path in tilemap_asset_paths():
+            try:
+                st = os.stat(path)
+                stamp = f"{st.st_size}|{st.st_mtime_ns}"
+            except OSError:
+                stamp = "missing"
+            rel = os.path.relpath(path, _ASSETS_DIR).replace(os.sep, "/")
+            h.update(f"{rel}|{stamp}\n".encode("utf-8"))
+        return h.hexdigest()
+
+    def _load_tile_surfaces(self):
+        """Load 32x32 tile images from assets/tiles.
+
+        Expected filenames (as provided):
+        - grass.png
+        - PATH MAIN.png
+        - PATH EDGE LEFT.png / RIGHT / UP / DOWN
+        """
+        base_dir = os.path.join(_ASSETS_DIR, "tiles")
+
+        surfaces = {}
+        for key, filename in _TILE_FILENAMES.items():
+            path = os.path.join(base_dir, filename)
+            try:
+                img = _load_image(path)
+                if img is None:
+                    surfaces[key] = None
+                    continue
+                if img.get_width() != TILE_SIZE or img.get_height() != TILE_SIZE:
+                    img = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
+                surfaces[key] = img
+            except Exception:
+                surfaces[key] = None
+
+        return surfaces
+
+    def _load_castle_surface(self) -> pygame.Surface | None:
+        """Load and scale the finish-point castle sprite (assets/CASTLE.png)."""
+        try:
+            img = _load_image(os.path.join(_ASSETS_DIR, "CASTLE.png"))
+            if img is None:
+                return None
+
+            # The source is extremely large; scale it to a few tiles so it fits the map.
+            # Keep square aspect (the source is square).
+            target_px = int(TILE_SIZE * 8)
+            if target_px <= 0:
+                return img
+            if img.get_width() != target_px or img.get_height() != target_px:
+                img = pygame.transform.smoothscale(img, (target_px, target_px))
+            return img
+        except Exception:
+            return None
+
+    def _build_castle_shadow(self, img: pygame.Surface | None) -> pygame.Surface | None:
+        """Create a cheap silhouette shadow to draw "behind" the castle."""
+        if img is None:
+            return None
+        try:
+            shadow = img.copy()
+            # Multiply RGB by 0 to make black; reduce alpha slightly.
+            shadow.fill((0, 0, 0, 170), special_flags=pygame.BLEND_RGBA_MULT)
+            return shadow
+        except Exception:
+            return None
+
+    def _build_deco_grass_path_variants(self, grass: pygame.Surface | None) -> list[pygame.Surface] | None:
+        """Create a few darker/lighter grass tiles for fading aesthetic paths."""
+        if grass is None:
+            return None
+        try:
+            variants: list[pygame.Surface] = []
+            # 0 = darkest (near trees), higher = lighter (towards main path)
+            factors = [0.72, 0.78, 0.84, 0.90, 0.96]
+            for f in factors:
+                img = grass.copy()
+                img.fill((int(255 * f), int(255 * f), int(255 * f), 255), special_flags=pygame.BLEND_RGBA_MULT)
+                # Slight noise-free overlay for readability
+                overlay = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
+                overlay.fill((0, 0, 0, 35))
+                img.blit(overlay, (0, 0))
+                variants.append(img)
+            return variants
+        except Exception:
+            return None
+
+    def _build_grass_shades(self, surfaces: dict) -> dict[str, list[pygame.Surface] | None]:
+        """Prebuild a small set of shaded variants for grass + grass edge tiles.
+
+        Returns a dict with keys matching _tile_surfaces (grass + edge_*), each value is a
+        list of surfaces for shade levels 0..N-1.
+        """
+        def shade_variants(img: pygame.Surface | None) -> list[pygame.Surface] | None:
+            if img is None:
+                return None
+            variants: list[pygame.Surface] = []
+
+            # 0 = normal, higher = darker. Keep subtle so it reads like atmosphere.
+            # Tuned for 32x32 tiles.
+            factors = [1.00, 0.92, 0.85, 0.78, 0.70]
+            for f in factors:
+                v = img.copy()
+                # Multiply RGB by factor (keep alpha)
+                v.fill((int(255 * f), int(255 * f), int(255 * f), 255), special_flags=pygame.BLEND_RGBA_MULT)
+                variants.append(v)
+            return variants
+
+        return {
+            "grass": shade_variants(surfaces.get("grass")),
+            "edge_left": shade_variants(surfaces.get("edge_left")),
+            "edge_right": shade_variants(surfaces.get("edge_right")),
+            "edge_up": shade_variants(surfaces.get("edge_up")),
+            "edge_down": shade_variants(surfaces.get("edge_down")),
+        }
+
+    def _load_pngs_from_dir(self, folder_path):
+        surfaces = []
+        try:
+            for name in os.listdir(folder_path):
+                if not name.lower().endswith(".png"):
+                    continue
+                path = os.path.join(folder_path, name)
+                img = _load_image(path)
+                if img is not None:
+                    surfaces.append(img)
+        except Exception:
+            return []
+        return surfaces
+
+    def _load_pngs_with_names_from_dir(self, folder_path):
+        items = []
+        try:
+            for name in os.listdir(folder_path):
+                if not name.lower().endswith(".png"):
+                    continue
+                path = os.path.join(folder_path, name)
+                img = _load_image(path)
+                if img is not None:
+                    items.append((name, img))
+        except Exception:
+            return []
+        return items
+
+    def _load_decor(self) -> dict:
+        """Load the decoration sprites and sort them into the groups placement uses."""
+        decor_root = os.path.join(_ASSETS_DIR, "decoration")
+
+        # Set-piece assets
+        campfire_img = None
+        try:
+            campfire_sheet = _load_image(os.path.join(_ASSETS_DIR, "campfire-sheet.png"))
+            # First frame of a 4-frame 64x64 strip (256x64)
+            if campfire_sheet.get_height() > 0:
+                fw = campfire_sheet.get_height()
+                campfire_img = campfire_sheet.subsurface(pygame.Rect(0, 0, fw, fw)).copy()
+        except Exception:
+            campfire_img = None
+
+        grass_patches = self._load_pngs_from_dir(os.path.join(decor_root, "5 Grass"))
+        flowers = self._load_pngs_from_dir(os.path.join(decor_root, "6 Flower"))
+        bushes = self._load_pngs_from_dir(os.path.join(decor_root, "9 Bush"))
+
+        stones = self._load_pngs_from_dir(os.path.join(decor_root, "4 Stone"))
+        stones_named = self._load_pngs_with_names_from_dir(os.path.join(decor_root, "4 Stone"))
+        camp = self._load_pngs_from_dir(os.path.join(decor_root, "8 Camp"))
+        camp_named = self._load_pngs_with_names_from_dir(os.path.join(decor_root, "8 Camp"))
+
+        decor_misc_folder = os.path.join(decor_root, "7 Decor")
+        decor_misc = self._load_pngs_with_names_from_dir(decor_misc_folder)
+
+        # Split misc decor into trees vs smaller props.
+        # IMPORTANT: treat files named like "Tree1.png" / "Tree2.png" as trees regardless of size.
+        trees: list[pygame.Surface] = []
+        tree1: list[pygame.Surface] = []
+        tree2: list[pygame.Surface] = []
+        logs: list[pygame.Surface] = []
+        lamps: list[pygame.Surface] = []
+        props: list[pygame.Surface] = []
+        for name, s in decor_misc:
+            if s is None:
+                continue
+            lower = name.lower()
+            if "log" in lower:
+                logs.append(s)
+                props.append(s)
+                continue
+            if lower.startswith("lamp"):
+                lamps.append(s)
+                props.append(s)
+                continue
+            if "tree" in lower:
+                if "tree1" in lower:
+                    tree1.append(s)
+                    trees.append(s)
+                elif "tree2" in lower:
+                    # Keep Tree2 separate: only allowed right next to the path.
+                    tree2.append(s)
+                else:
+                    trees.append(s)
+                continue
+
+            # Heuristic: taller sprites read as trees/large plants.
+            if s.get_height() >= int(TILE_SIZE * 2.6):
+                trees.append(s)
+            else:
+                props.append(s)
+
+        shadows = self._load_pngs_from_dir(os.path.join(decor_root, "1 Shadow"))
+
+        # Visual scale: make trees 20% larger.
+        if trees or tree2:
+            def _scale_120(images: list[pygame.Surface]) -> list[pygame.Surface]:
+                scaled = []
+                for img in images:
+                    try:
+                        w = max(1, int(img.get_width() * 1.2))
+                        h = max(1, int(img.get_height() * 1.2))
+                        scaled.append(pygame.transform.scale(img, (w, h)))
+                    except Exception:
+                        scaled.append(img)
+                return scaled
+
+            trees = _scale_120(trees) if trees else []
+            tree1 = _scale_120(tree1) if tree1 else []
+            tree2 = _scale_120(tree2) if tree2 else []
+
+        return {
+            "campfire_img": campfire_img,
+            "grass_patches": grass_patches,
+            "flowers": flowers,
+            "bushes": bushes,
+            "stones": stones,
+            "stones_named": stones_named,
+            "camp": camp,
+            "camp_named": camp_named,
+            "trees": trees,
+            "tree1": tree1,
+            "tree2": tree2,
+            "logs": logs,
+            "lamps": lamps,
+            "props": props,
+            "shadows": shadows,
+        }
+
+_SHARED_ASSETS: TileMapAssets | None = None
+_SHARED_ASSETS_REFS = 0
+_SHARED_ASSETS_LOCK = threading.Lock()
+
+
+def acquire_tilemap_assets() -> TileMapAssets:
+    """Return the shared TileMapAssets, building them on first use."""
+    global _SHARED_ASSETS, _SHARED_ASSETS_REFS
+    with _SHARED_ASSETS_LOCK:
+        if _SHARED_ASSETS is None:
+            _SHARED_ASSETS = TileMapAssets()
+        _SHARED_ASSETS_REFS += 1
+        return _SHARED_ASSETS
+
+
+def release_tilemap_assets() -> None:
+    """Drop one reference; the assets are freed when no TileMap uses them."""
+    global _SHARED_ASSETS, _SHARED_ASSETS_REFS
+    with _SHARED_ASSETS_LOCK:
+        if _SHARED_ASSETS_REFS <= 0:
+            return
+        _SHARED_ASSETS_REFS -= 1
+        if _SHARED_ASSETS_REFS == 0:
+            _SHARED_ASSETS = None
+
 
 class TileMap:
-    def __init__(self, tile_data=None):
+    def __init__(self, tile_data=None, *, derived_path: str | None = None):
+        """`derived_path`: optional file (see world/level_cache.py) used to
+        load/store the data derived from this grid instead of recomputing it."""
         if tile_data:
             self.tiles = tile_data
         else:
@@ -12,18 +425,37 @@ class TileMap:
                 [TILE_GRASS for _ in range(TILES_X)]
                 for _ in range(TILES_Y)
             ]
-
-        self._tile_surfaces = self._load_tile_surfaces()
-        self._castle_surface = self._load_castle_surface()
-        self._castle_shadow_surface = self._build_castle_shadow(self._castle_surface)
-        self._deco_grass_path_variants = self._build_deco_grass_path_variants(self._tile_surfaces.get("grass"))
+        # Any rectangular size works; the default map fills one screen.
+        self.height = len(self.tiles)
+        self.width = len(self.tiles[0]) if self.tiles else 0
+
+        # uint8 mirror of `tiles` with path/blocked/buildable/edge masks and an
+        # autotile neighbour bitmask; keep it in sync via grid.set_tile().
+        self.grid = TileGrid(self.tiles, self.width, self.height)
+
+        # Level-independent art is shared between TileMaps; call release() when done.
+        self._assets = acquire_tilemap_assets()
+        self._released = False
+        self._tile_surfaces = self._assets.tile_surfaces
+        self._castle_surface = self._assets.castle_surface
+        # Ordered enemy route (pixel centers); None = not computed yet.
+        self._path_points: list[tuple[int, int]] | None = None
+        self._first_tile_cache: dict[int, tuple[int, int] | None] = {}
+
+        # Visual-only layers (shading, decorations, aesthetic trails, castle
+        # shadow) are built on first draw, or in the background via
+        # prepare_visual_layers_async(). Gameplay queries never wait for them;
+        # until they exist the map draws with plain tiles and no decor.
+        self._derived_path = derived_path
+        self._visual_ready = False
+        self._visual_lock = threading.Lock()
+        self._visual_thread: threading.Thread | None = None
+        self._castle_shadow_surface: pygame.Surface | None = None
+        self._deco_grass_path_variants: list[pygame.Surface] | None = None
+        self._grass_shades: dict[str, list[pygame.Surface] | None] = {}
         self._aesthetic_path_levels: dict[tuple[int, int], int] = {}
-        # Precompute distance-to-path for visual grass shading (darker farther away)
-        self._dist_to_path = self._compute_distance_to_path()
-        self._grass_shades = self._build_grass_shades(self._tile_surfaces)
-        self._decor = self._generate_decorations()
-        # Needs decor to exist so we can start these trails from the nearby tree groves.
-        self._aesthetic_path_levels = self._compute_aesthetic_paths_from_decor()
+        self._dist_to_path: list[list[int]] = []
+        self._decor: dict = {"small": [], "trees": []}
 
         # Visual-only: extra contrast on tiles where a tower/troop was placed.
         # level 1: converted grass->path (light contrast)
@@ -31,6 +463,119 @@ class TileMap:
         self._tower_contrast_levels: dict[tuple[int, int], int] = {}
         self._tower_contrast_surfaces: dict[int, pygame.Surface] = {}
 
+        # Ground layer rendered per CHUNK_TILES x CHUNK_TILES chunk, built on
+        # demand near the view and evicted least-recently-used first.
+        self._chunk_cache: OrderedDict[tuple[int, int], pygame.Surface] = OrderedDict()
+        self._chunk_cache_visual = False
+        # Decor indices bucketed by the chunk of their anchor point.
+        self._decor_buckets: dict[tuple[int, int], tuple[list[int], list[int]]] = {}
+        self._decor_buckets_src: dict | None = None
+
+    def ensure_visual_layers(self) -> None:
+        """Build the visual-only layers now (no-op once built)."""
+        if self._visual_ready:
+            return
+        with self._visual_lock:
+            if self._visual_ready:
+                return
+            self._build_visual_layers()
+            self._visual_ready = True
+
+    def prepare_visual_layers_async(self) -> None:
+        """Start building the visual-only layers on a worker thread."""
+        if self._visual_ready or self._visual_thread is not None:
+            return
+        self._visual_thread = threading.Thread(target=self.ensure_visual_layers, name="tilemap-visuals", daemon=True)
+        self._visual_thread.start()
+
+    def _visual_layers_pending(self) -> bool:
+        """True while a background build is still running."""
+        thread = self._visual_thread
+        return not self._visual_ready and thread is not None and thread.is_alive()
+
+    def _build_visual_layers(self) -> None:
+        assets = self._assets
+        assets.ensure_visuals()
+        self._castle_shadow_surface = assets.castle_shadow_surface
+        self._deco_grass_path_variants = assets.deco_grass_path_variants
+        self._grass_shades = assets.grass_shades
+
+        derived_path = self._derived_path
+        key = derived_key(self.tiles, assets.version) if derived_path else ""
+        data = load_derived(derived_path, key) if derived_path else None
+        if data is not None and self._apply_derived(data):
+            return
+
+        # Precompute distance-to-path for visual grass shading (darker farther away)
+        self._dist_to_path = self._compute_distance_to_path()
+        self._decor = self._generate_decorations()
+        # Needs decor to exist so we can start these trails from the nearby tree groves.
+        self._aesthetic_path_levels = self._compute_aesthetic_paths_from_decor()
+        if self._path_points is None:
+            try:
+                self._path_points = self._compute_path_points()
+            except ValueError:
+                pass
+        exported = self._export_derived() if derived_path else None
+        if exported is not None:
+            save_derived(derived_path, key, exported)
+
+    def _export_derived(self) -> dict | None:
+        """Grid-derived data in a JSON-friendly form (sprites stored by id).
+
+        Returns None if the layout uses a sprite the asset index doesn't know.
+        """
+        sprite_id = self._assets.decor_sprite_id
+        decor_items = self._decor.get("small", []) + self._decor.get("trees", [])
+        if any(sprite_id(d.get("img")) < 0 for d in decor_items):
+            return None
+        return {
+            "dist_to_path": [d for row in self._dist_to_path for d in row],
+            "small": [
+                [sprite_id(d.get("img")), d.get("x", 0), d.get("y", 0)]
+                for d in self._decor.get("small", [])
+            ],
+            "trees": [
+                [sprite_id(t.get("img")), sprite_id(t.get("shadow")), t["base_x"], t["base_y"]]
+                for t in self._decor.get("trees", [])
+            ],
+            "aesthetic_paths": [[x, y, lvl] for (x, y), lvl in self._aesthetic_path_levels.items()],
+            "path_points": None if self._path_points is None else [list(p) for p in self._path_points],
+        }
+
+    def _apply_derived(self, data: dict) -> bool:
+        """Restore what _export_derived produced; False if it doesn't fit."""
+        sprite = self._assets.decor_sprite
+        try:
+            flat = data["dist_to_path"]
+            if len(flat) != self.width * self.height:
+                return False
+            dist = [flat[y * self.width:(y + 1) * self.width] for y in range(self.height)]
+            small = [{"img": sprite(i), "x": x, "y": y} for i, x, y in data["small"]]
+            trees = [
+                {"img": sprite(i), "shadow": sprite(si), "base_x": bx, "base_y": by}
+                for i, si, bx, by in data["trees"]
+            ]
+            levels = {(x, y): lvl for x, y, lvl in data["aesthetic_paths"]}
+            points = data["path_points"]
+            if points is not None:
+                points = [(px, py) for px, py in points]
+        except (KeyError, TypeError, ValueError):
+            return False
+        self._dist_to_path = dist
+        self._decor = {"small": small, "trees": trees}
+        self._aesthetic_path_levels = levels
+        if self._path_points is None:
+            self._path_points = points
+        return True
+
+    def release(self) -> None:
+        """Give back this map's reference to the shared assets (idempotent)."""
+        if self._released:
+            return
+        self._released = True
+        release_tilemap_assets()
+
     def _get_tower_contrast_surface(self, level: int) -> pygame.Surface:
         level = int(level)
         surf = self._tower_contrast_surfaces.get(level)
@@ -56,68 +601,28 @@ class TileMap:
         - If placed on a *visual path edge* grass tile (touching the core path):
           keep the tile as grass/edge, but add stronger contrast.
         """
-        if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
             return
 
         tile_id = self.tiles[ty][tx]
         if tile_id != TILE_GRASS:
             return
 
-        core_path_ids = {TILE_PATH, TILE_START, TILE_FINISH, TILE_CASTLE}
-
-        def is_core_path(x: int, y: int) -> bool:
-            if 0 <= x < TILES_X and 0 <= y < TILES_Y:
-                return self.tiles[y][x] in core_path_ids
-            return False
-
-        neighbors = (
-            is_core_path(tx + 1, ty),
-            is_core_path(tx - 1, ty),
-            is_core_path(tx, ty + 1),
-            is_core_path(tx, ty - 1),
-        )
-        touching = sum(1 for v in neighbors if v)
+        touching = bin(self.grid.neighbour_mask(tx, ty)).count("1")
 
         if touching == 1:
             # This grass tile is already drawn as an edge tile. Just boost contrast.
             self._tower_contrast_levels[(tx, ty)] = 2
+            self.invalidate_chunks_around(tx, ty)
             return
 
         # Plain grass tile: convert to path and add a bit of contrast.
         self.tiles[ty][tx] = TILE_PATH
+        self.grid.set_tile(tx, ty, TILE_PATH)
         self._tower_contrast_levels[(tx, ty)] = 1
-
-    def _build_castle_shadow(self, img: pygame.Surface | None) -> pygame.Surface | None:
-        """Create a cheap silhouette shadow to draw "behind" the castle."""
-        if img is None:
-            return None
-        try:
-            shadow = img.copy()
-            # Multiply RGB by 0 to make black; reduce alpha slightly.
-            shadow.fill((0, 0, 0, 170), special_flags=pygame.BLEND_RGBA_MULT)
-            return shadow
-        except Exception:
-            return None
-
-    def _build_deco_grass_path_variants(self, grass: pygame.Surface | None) -> list[pygame.Surface] | None:
-        """Create a few darker/lighter grass tiles for fading aesthetic paths."""
-        if grass is None:
-            return None
-        try:
-            variants: list[pygame.Surface] = []
-            # 0 = darkest (near trees), higher = lighter (towards main path)
-            factors = [0.72, 0.78, 0.84, 0.90, 0.96]
-            for f in factors:
-                img = grass.copy()
-                img.fill((int(255 * f), int(255 * f), int(255 * f), 255), special_flags=pygame.BLEND_RGBA_MULT)
-                # Slight noise-free overlay for readability
-                overlay = pygame.Surface((TILE_SIZE, TILE_SIZE), pygame.SRCALPHA)
-                overlay.fill((0, 0, 0, 35))
-                img.blit(overlay, (0, 0))
-                variants.append(img)
-            return variants
-        except Exception:
-            return None
+        self.invalidate_chunks_around(tx, ty)
+        # The path tile set changed; recompute the route on next request.
+        self._path_points = None
 
     def _compute_aesthetic_paths_from_decor(self) -> dict[tuple[int, int], int]:
         """Compute visual-only paths from shop/casino to the nearby forest.
@@ -139,7 +644,7 @@ class TileMap:
             return {}
 
         def in_bounds(x: int, y: int) -> bool:
-            return 0 <= x < TILES_X and 0 <= y < TILES_Y
+            return 0 <= x < self.width and 0 <= y < self.height
 
         def passable(x: int, y: int) -> bool:
             return self.tiles[y][x] != TILE_WALL
@@ -150,7 +655,7 @@ class TileMap:
             try:
                 tx = int(t.get("base_x", 0)) // TILE_SIZE
                 ty = int(t.get("base_y", 0)) // TILE_SIZE
-                if 0 <= tx < TILES_X and 0 <= ty < TILES_Y:
+                if 0 <= tx < self.width and 0 <= ty < self.height:
                     forest_tiles.add((tx, ty))
             except Exception:
                 continue
@@ -221,24 +726,6 @@ class TileMap:
 
         return out_levels
 
-    def _load_castle_surface(self) -> pygame.Surface | None:
-        """Load and scale the finish-point castle sprite (assets/CASTLE.png)."""
-        try:
-            assets_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets"))
-            path = os.path.join(assets_dir, "CASTLE.png")
-            img = pygame.image.load(path).convert_alpha()
-
-            # The source is extremely large; scale it to a few tiles so it fits the map.
-            # Keep square aspect (the source is square).
-            target_px = int(TILE_SIZE * 8)
-            if target_px <= 0:
-                return img
-            if img.get_width() != target_px or img.get_height() != target_px:
-                img = pygame.transform.smoothscale(img, (target_px, target_px))
-            return img
-        except Exception:
-            return None
-
     def _get_finish_castle_rect(self, *, offset: tuple[int, int] = (0, 0)) -> pygame.Rect | None:
         """Compute the on-screen rect for the finish castle sprite.
 
@@ -258,7 +745,7 @@ class TileMap:
         core_path_ids = {TILE_PATH, TILE_START, TILE_FINISH, TILE_CASTLE}
         neighbor = None
         for nx, ny in ((fx - 1, fy), (fx + 1, fy), (fx, fy - 1), (fx, fy + 1)):
-            if 0 <= nx < TILES_X and 0 <= ny < TILES_Y and self.tiles[ny][nx] in core_path_ids:
+            if 0 <= nx < self.width and 0 <= ny < self.height and self.tiles[ny][nx] in core_path_ids:
                 if (nx, ny) != (fx, fy):
                     neighbor = (nx, ny)
                     break
@@ -286,7 +773,7 @@ class TileMap:
         candidates.append(base_world.move(-pref_dx * shift, -pref_dy * shift))
         candidates.append(base_world.copy())
 
-        world_bounds = pygame.Rect(0, 0, TILES_X * TILE_SIZE, TILES_Y * TILE_SIZE)
+        world_bounds = pygame.Rect(0, 0, self.width * TILE_SIZE, self.height * TILE_SIZE)
 
         def visible_area(r: pygame.Rect) -> int:
             inter = r.clip(world_bounds)
@@ -321,89 +808,15 @@ class TileMap:
 
         Used only for visuals (grass shading), so it can be approximate but stable.
         """
-        core_path_ids = {TILE_PATH, TILE_START, TILE_FINISH, TILE_CASTLE}
-
-        dist = [[9999 for _ in range(TILES_X)] for _ in range(TILES_Y)]
-        q: deque[tuple[int, int]] = deque()
-
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
-                if self.tiles[y][x] in core_path_ids:
-                    dist[y][x] = 0
-                    q.append((x, y))
-
-        # Multi-source BFS on the grid
-        while q:
-            x, y = q.popleft()
-            d = dist[y][x] + 1
-            for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1)):
-                if nx < 0 or ny < 0 or nx >= TILES_X or ny >= TILES_Y:
-                    continue
-                if d < dist[ny][nx]:
-                    dist[ny][nx] = d
-                    q.append((nx, ny))
-
-        return dist
-
-    def _build_grass_shades(self, surfaces: dict) -> dict[str, list[pygame.Surface] | None]:
-        """Prebuild a small set of shaded variants for grass + grass edge tiles.
-
-        Returns a dict with keys matching _tile_surfaces (grass + edge_*), each value is a
-        list of surfaces for shade levels 0..N-1.
-        """
-        def shade_variants(img: pygame.Surface | None) -> list[pygame.Surface] | None:
-            if img is None:
-                return None
-            variants: list[pygame.Surface] = []
+        return self.grid.distance_to_flag(FLAG_PATH)
 
-            # 0 = normal, higher = darker. Keep subtle so it reads like atmosphere.
-            # Tuned for 32x32 tiles.
-            factors = [1.00, 0.92, 0.85, 0.78, 0.70]
-            for f in factors:
-                v = img.copy()
-                # Multiply RGB by factor (keep alpha)
-                v.fill((int(255 * f), int(255 * f), int(255 * f), 255), special_flags=pygame.BLEND_RGBA_MULT)
-                variants.append(v)
-            return variants
-
-        return {
-            "grass": shade_variants(surfaces.get("grass")),
-            "edge_left": shade_variants(surfaces.get("edge_left")),
-            "edge_right": shade_variants(surfaces.get("edge_right")),
-            "edge_up": shade_variants(surfaces.get("edge_up")),
-            "edge_down": shade_variants(surfaces.get("edge_down")),
-        }
-    def _load_pngs_from_dir(self, folder_path):
-        surfaces = []
-        try:
-            for name in os.listdir(folder_path):
-                if not name.lower().endswith(".png"):
-                    continue
-                path = os.path.join(folder_path, name)
-                try:
-                    img = pygame.image.load(path).convert_alpha()
-                    surfaces.append(img)
-                except Exception:
-                    continue
-        except Exception:
-            return []
-        return surfaces
-
-    def _load_pngs_with_names_from_dir(self, folder_path):
-        items = []
-        try:
-            for name in os.listdir(folder_path):
-                if not name.lower().endswith(".png"):
-                    continue
-                path = os.path.join(folder_path, name)
-                try:
-                    img = pygame.image.load(path).convert_alpha()
-                    items.append((name, img))
-                except Exception:
-                    continue
-        except Exception:
-            return []
-        return items
+    def _tiles_with_ids(self, tile_ids) -> list[tuple[int, int]]:
+        return [
+            (x, y)
+            for y in range(self.height)
+            for x in range(self.width)
+            if self.tiles[y][x] in tile_ids
+        ]
 
     def _generate_decorations(self):
         """Generate natural-looking, non-blocking decorative sprites.
@@ -414,9 +827,6 @@ class TileMap:
         Trees support a simple z-layer: when the player is "behind" a tree (above its base),
         the tree is drawn in the foreground.
         """
-        assets_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets"))
-        decor_root = os.path.join(assets_dir, "decoration")
-
         # Keep a clear area for the finish landmark (castle) so it stays visible.
         castle_keepout: pygame.Rect | None = None
         try:
@@ -427,111 +837,39 @@ class TileMap:
         except Exception:
             castle_keepout = None
 
-        # Set-piece assets
-        campfire_img = None
-        try:
-            campfire_sheet = pygame.image.load(os.path.join(assets_dir, "campfire-sheet.png")).convert_alpha()
-            # First frame of a 4-frame 64x64 strip (256x64)
-            if campfire_sheet.get_height() > 0:
-                fw = campfire_sheet.get_height()
-                campfire_img = campfire_sheet.subsurface(pygame.Rect(0, 0, fw, fw)).copy()
-        except Exception:
-            campfire_img = None
-
-        grass_patches = self._load_pngs_from_dir(os.path.join(decor_root, "5 Grass"))
-        flowers = self._load_pngs_from_dir(os.path.join(decor_root, "6 Flower"))
-        bushes = self._load_pngs_from_dir(os.path.join(decor_root, "9 Bush"))
-
-        stones = self._load_pngs_from_dir(os.path.join(decor_root, "4 Stone"))
-        stones_named = self._load_pngs_with_names_from_dir(os.path.join(decor_root, "4 Stone"))
-        camp = self._load_pngs_from_dir(os.path.join(decor_root, "8 Camp"))
-        camp_named = self._load_pngs_with_names_from_dir(os.path.join(decor_root, "8 Camp"))
-
-        decor_misc_folder = os.path.join(decor_root, "7 Decor")
-        decor_misc = self._load_pngs_with_names_from_dir(decor_misc_folder)
-
-        # Split misc decor into trees vs smaller props.
-        # IMPORTANT: treat files named like "Tree1.png" / "Tree2.png" as trees regardless of size.
-        trees: list[pygame.Surface] = []
-        tree1: list[pygame.Surface] = []
-        tree2: list[pygame.Surface] = []
-        logs: list[pygame.Surface] = []
-        lamps: list[pygame.Surface] = []
-        props: list[pygame.Surface] = []
-        for name, s in decor_misc:
-            if s is None:
-                continue
-            lower = name.lower()
-            if "log" in lower:
-                logs.append(s)
-                props.append(s)
-                continue
-            if lower.startswith("lamp"):
-                lamps.append(s)
-                props.append(s)
-                continue
-            if "tree" in lower:
-                if "tree1" in lower:
-                    tree1.append(s)
-                    trees.append(s)
-                elif "tree2" in lower:
-                    # Keep Tree2 separate: only allowed right next to the path.
-                    tree2.append(s)
-                else:
-                    trees.append(s)
-                continue
-
-            # Heuristic: taller sprites read as trees/large plants.
-            if s.get_height() >= int(TILE_SIZE * 2.6):
-                trees.append(s)
-            else:
-                props.append(s)
-
-        shadows = self._load_pngs_from_dir(os.path.join(decor_root, "1 Shadow"))
-
-        # Visual scale: make trees 20% larger.
-        if trees or tree2:
-            def _scale_120(images: list[pygame.Surface]) -> list[pygame.Surface]:
-                scaled = []
-                for img in images:
-                    try:
-                        w = max(1, int(img.get_width() * 1.2))
-                        h = max(1, int(img.get_height() * 1.2))
-                        scaled.append(pygame.transform.scale(img, (w, h)))
-                    except Exception:
-                        scaled.append(img)
-                return scaled
-
-            trees = _scale_120(trees) if trees else []
-            tree1 = _scale_120(tree1) if tree1 else []
-            tree2 = _scale_120(tree2) if tree2 else []
-
-        core_path_ids = {TILE_PATH, TILE_START, TILE_FINISH, TILE_CASTLE}
-
-        def is_core_path(tx, ty):
-            if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
-                return False
-            return self.tiles[ty][tx] in core_path_ids
+        # Level-independent decor sprites come from the shared asset cache.
+        decor_assets = self._assets.decor
+        campfire_img = decor_assets["campfire_img"]
+        grass_patches = decor_assets["grass_patches"]
+        flowers = decor_assets["flowers"]
+        bushes = decor_assets["bushes"]
+        stones = decor_assets["stones"]
+        stones_named = decor_assets["stones_named"]
+        camp = decor_assets["camp"]
+        camp_named = decor_assets["camp_named"]
+        trees = decor_assets["trees"]
+        tree1 = decor_assets["tree1"]
+        tree2 = decor_assets["tree2"]
+        logs = decor_assets["logs"]
+        lamps = decor_assets["lamps"]
+        props = decor_assets["props"]
+        shadows = decor_assets["shadows"]
+
+        # Placement eligibility comes from two distance masks computed once:
+        # Manhattan distance to the core path (the radius-r diamond test) and
+        # Chebyshev distance to special tiles (the radius-r square test).
+        path_dist = self._dist_to_path or self._compute_distance_to_path()
+        special_dist = self.grid.distance_to_flag(FLAG_SPECIAL, diagonal=True)
 
         def near_core_path(tx, ty, radius=1):
-            for dy in range(-radius, radius + 1):
-                for dx in range(-radius, radius + 1):
-                    if abs(dx) + abs(dy) > radius:
-                        continue
-                    if is_core_path(tx + dx, ty + dy):
-                        return True
-            return False
+            if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+                return False
+            return path_dist[ty][tx] <= radius
 
         def near_special(tx, ty, radius=1):
-            for dy in range(-radius, radius + 1):
-                for dx in range(-radius, radius + 1):
-                    nx = tx + dx
-                    ny = ty + dy
-                    if nx < 0 or ny < 0 or nx >= TILES_X or ny >= TILES_Y:
-                        continue
-                    if self.tiles[ny][nx] in (TILE_SHOP, TILE_CASINO, TILE_START, TILE_FINISH, TILE_CASTLE):
-                        return True
-            return False
+            if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
+                return False
+            return special_dist[ty][tx] <= radius
 
         # Keep a clear buffer around shop/casino so tall sprites (trees) don't overlap.
         SHOP_TREE_BUFFER = 3
@@ -541,13 +879,13 @@ class TileMap:
 
         small = []  # patches/flowers/bushes/rocks/props, always behind player
         tree_list = []  # trees with base_y for simple z-layer
-        tree_tiles = []
+        tree_tiles: set[tuple[int, int]] = set()
 
         # Make the decor look more "natural" by clustering trees/undergrowth in a few
         # forest zones instead of spreading them evenly.
         candidate_grass = []
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
+        for y in range(self.height):
+            for x in range(self.width):
                 if self.tiles[y][x] != TILE_GRASS:
                     continue
                 if near_core_path(x, y, radius=1):
@@ -565,16 +903,16 @@ class TileMap:
                 return rng.choice(region)
 
             # Always seed clusters in the areas the user cares about.
-            ul_region_pred = lambda tx, ty: tx < int(TILES_X * 0.35) and ty < int(TILES_Y * 0.35)
+            ul_region_pred = lambda tx, ty: tx < int(self.width * 0.35) and ty < int(self.height * 0.35)
             ul = pick_from_region(ul_region_pred)
             # Extra UL forest centers so it reads like a forest, not scattered trees.
             ul2 = pick_from_region(ul_region_pred)
             ul3 = pick_from_region(ul_region_pred)
             center = pick_from_region(
-                lambda tx, ty: abs(tx - (TILES_X // 2)) <= int(TILES_X * 0.18)
-                and abs(ty - (TILES_Y // 2)) <= int(TILES_Y * 0.18)
+                lambda tx, ty: abs(tx - (self.width // 2)) <= int(self.width * 0.18)
+                and abs(ty - (self.height // 2)) <= int(self.height * 0.18)
             )
-            lower = pick_from_region(lambda tx, ty: ty > int(TILES_Y * 0.65))
+            lower = pick_from_region(lambda tx, ty: ty > int(self.height * 0.65))
 
             for c in (ul, ul2, ul3, center, lower):
                 if c is not None:
@@ -589,22 +927,22 @@ class TileMap:
             boost = 1.0
 
             # upper-left
-            if tx < int(TILES_X * 0.35) and ty < int(TILES_Y * 0.35):
+            if tx < int(self.width * 0.35) and ty < int(self.height * 0.35):
                 boost *= 1.8
 
             # center
-            if abs(tx - (TILES_X // 2)) <= int(TILES_X * 0.18) and abs(ty - (TILES_Y // 2)) <= int(TILES_Y * 0.18):
+            if abs(tx - (self.width // 2)) <= int(self.width * 0.18) and abs(ty - (self.height // 2)) <= int(self.height * 0.18):
                 boost *= 1.6
 
             # lower part (lower third)
-            if ty > int(TILES_Y * 0.65):
+            if ty > int(self.height * 0.65):
                 boost *= 1.7
 
             return boost
 
         def ul_forest_strength(tx: int, ty: int) -> float:
             """0..1 strength for how deep into the upper-left forest core we are."""
-            if not (tx < int(TILES_X * 0.35) and ty < int(TILES_Y * 0.35)):
+            if not (tx < int(self.width * 0.35) and ty < int(self.height * 0.35)):
                 return 0.0
             if ul is None:
                 return 0.35
@@ -620,14 +958,13 @@ class TileMap:
                 return 0.35
             return 0.2
 
+        # Manhattan distance to the nearest forest center, for every tile.
+        forest_dist = grid_distance(forest_centers, self.width, self.height) if forest_centers else None
+
         def forest_factor(tx: int, ty: int) -> float:
-            if not forest_centers:
+            if forest_dist is None:
                 return 1.0
-            best = 999
-            for cx, cy in forest_centers:
-                d = abs(cx - tx) + abs(cy - ty)
-                if d < best:
-                    best = d
+            best = forest_dist[ty][tx]
             # Simple falloff (tile distance): tight clusters with soft edges.
             if best <= 2:
                 return 1.0
@@ -656,7 +993,7 @@ class TileMap:
                 break
 
         def _place_tree_at(tx: int, ty: int, *, prefer_tree1: bool = True):
-            if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
+            if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
                 return
             if self.tiles[ty][tx] != TILE_GRASS:
                 return
@@ -686,14 +1023,14 @@ class TileMap:
                 "base_x": base_x,
                 "base_y": base_y,
             })
-            tree_tiles.append((tx, ty))
+            tree_tiles.add((tx, ty))
 
         def _place_castle_forest_tree_at(tx: int, ty: int):
             """Place a tree intended to overlap the bottom of the castle.
 
             This bypasses the castle keepout so we can intentionally overlap.
             """
-            if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
+            if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
                 return
             if self.tiles[ty][tx] != TILE_GRASS:
                 return
@@ -726,7 +1063,7 @@ class TileMap:
         def _place_small_at(tx: int, ty: int, img: pygame.Surface, *, dx: int = 0, dy: int = 0, anchor_ground: bool = True):
             if img is None:
                 return
-            if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
+            if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
                 return
             if self.tiles[ty][tx] != TILE_GRASS:
                 return
@@ -743,8 +1080,8 @@ class TileMap:
                 py = ty * TILE_SIZE + dy
             small.append({"img": img, "x": px, "y": py})
 
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
+        for y in range(self.height):
+            for x in range(self.width):
                 if self.tiles[y][x] != TILE_GRASS:
                     continue
                 if near_core_path(x, y, radius=1):
@@ -794,9 +1131,15 @@ class TileMap:
                         min_dist = 1
                     else:
                         min_dist = 2
-                    for tx, ty in tree_tiles:
-                        if abs(tx - x) + abs(ty - y) <= min_dist:
-                            too_close = True
+                    # Look up the (small) diamond around this tile instead of
+                    # scanning every tree placed so far.
+                    for dy in range(-min_dist, min_dist + 1):
+                        span = min_dist - abs(dy)
+                        for dx in range(-span, span + 1):
+                            if (x + dx, y + dy) in tree_tiles:
+                                too_close = True
+                                break
+                        if too_close:
                             break
                     if not too_close:
                         # Replace Tree2 with Tree1 everywhere, except *right next to the path*.
@@ -825,7 +1168,7 @@ class TileMap:
                             "base_x": base_x,
                             "base_y": base_y,
                         })
-                        tree_tiles.append((x, y))
+                        tree_tiles.add((x, y))
                     continue
 
                 # Stones / rocks (a bit more common)
@@ -883,15 +1226,15 @@ class TileMap:
         # - Bottom-left: campfire + some logs + dense Tree1 forest
         # - Bottom-right: more Tree1 (with shadows) + stones and nature props
         # ------------------------------------------------------------------
-        bl_x0, bl_x1 = 0, max(1, int(TILES_X * 0.28))
-        bl_y0, bl_y1 = max(0, int(TILES_Y * 0.70)), TILES_Y - 1
-        br_x0, br_x1 = max(0, int(TILES_X * 0.72)), TILES_X - 1
-        br_y0, br_y1 = max(0, int(TILES_Y * 0.70)), TILES_Y - 1
+        bl_x0, bl_x1 = 0, max(1, int(self.width * 0.28))
+        bl_y0, bl_y1 = max(0, int(self.height * 0.70)), self.height - 1
+        br_x0, br_x1 = max(0, int(self.width * 0.72)), self.width - 1
+        br_y0, br_y1 = max(0, int(self.height * 0.70)), self.height - 1
 
         def _find_grass_in_box(x0: int, x1: int, y0: int, y1: int):
             for ty in range(y1, y0 - 1, -1):
                 for tx in range(x0, x1 + 1):
-                    if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
+                    if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
                         continue
                     if self.tiles[ty][tx] != TILE_GRASS:
                         continue
@@ -981,8 +1324,8 @@ class TileMap:
 
         # Collect grass tiles that border the path (but are not special tiles)
         path_edge_grass: list[tuple[int, int]] = []
-        for ty in range(TILES_Y):
-            for tx in range(TILES_X):
+        for ty in range(self.height):
+            for tx in range(self.width):
                 if adjacent_to_core_path(tx, ty) and not near_special(tx, ty, radius=1):
                     path_edge_grass.append((tx, ty))
 
@@ -1027,16 +1370,12 @@ class TileMap:
                 continue
 
         # Trees near shop/casino with shadows (but keep a clear 3-tile buffer)
-        special_tiles: list[tuple[int, int]] = []
-        for ty in range(TILES_Y):
-            for tx in range(TILES_X):
-                if self.tiles[ty][tx] in (TILE_SHOP, TILE_CASINO):
-                    special_tiles.append((tx, ty))
+        special_tiles = self._tiles_with_ids((TILE_SHOP, TILE_CASINO))
 
         for sx, sy in special_tiles:
             # Place trees OUTSIDE the buffer so they feel "near" but never overlap.
-            for ty in range(max(0, sy - (SHOP_TREE_BUFFER + 3)), min(TILES_Y, sy + (SHOP_TREE_BUFFER + 4))):
-                for tx in range(max(0, sx - (SHOP_TREE_BUFFER + 3)), min(TILES_X, sx + (SHOP_TREE_BUFFER + 4))):
+            for ty in range(max(0, sy - (SHOP_TREE_BUFFER + 3)), min(self.height, sy + (SHOP_TREE_BUFFER + 4))):
+                for tx in range(max(0, sx - (SHOP_TREE_BUFFER + 3)), min(self.width, sx + (SHOP_TREE_BUFFER + 4))):
                     if self.tiles[ty][tx] != TILE_GRASS:
                         continue
                     if near_core_path(tx, ty, radius=1):
@@ -1051,7 +1390,7 @@ class TileMap:
         # Camp 1 + campfire + logs set-piece somewhere near the path (but on grass)
         if camp_1 is not None and campfire_img is not None:
             # Prefer a path-adjacent grass tile in the lower half so the player sees it.
-            candidate = next(((tx, ty) for (tx, ty) in path_edge_grass if ty > int(TILES_Y * 0.55)), None)
+            candidate = next(((tx, ty) for (tx, ty) in path_edge_grass if ty > int(self.height * 0.55)), None)
             if candidate is not None:
                 cx, cy = candidate
                 _place_small_at(cx, cy, camp_1, dy=6, anchor_ground=True)
@@ -1073,10 +1412,10 @@ class TileMap:
 
         if castle_rect is not None:
             # Put it clearly in the upper-left of the screen relative to the castle.
-            ul_left_tx = max(0, min(TILES_X - 1, (castle_rect.left // TILE_SIZE) - 3))
-            ul_right_tx = min(TILES_X - 1, ul_left_tx + 7)
-            ul_top_ty = max(0, min(TILES_Y - 1, (castle_rect.top // TILE_SIZE) - 4))
-            ul_bottom_ty = min(TILES_Y - 1, ul_top_ty + 6)
+            ul_left_tx = max(0, min(self.width - 1, (castle_rect.left // TILE_SIZE) - 3))
+            ul_right_tx = min(self.width - 1, ul_left_tx + 7)
+            ul_top_ty = max(0, min(self.height - 1, (castle_rect.top // TILE_SIZE) - 4))
+            ul_bottom_ty = min(self.height - 1, ul_top_ty + 6)
 
             for ty in range(ul_top_ty, ul_bottom_ty + 1):
                 for tx in range(ul_left_tx, ul_right_tx + 1):
@@ -1094,8 +1433,12 @@ class TileMap:
 
     def draw_tree_foreground(self, surface, *, player_bottom: int, offset: tuple[int, int] = (0, 0)):
         """Draw trees that should appear in front of the player (player is behind the tree)."""
+        if not self._visual_layers_pending():
+            self.ensure_visual_layers()
         ox, oy = offset
-        for t in self._decor.get("trees", []):
+        trees = self._decor.get("trees", [])
+        for i in self._visible_decor(surface, ox, oy)[1]:
+            t = trees[i]
             base_y = int(t["base_y"])
             if player_bottom < base_y:
                 img = t["img"]
@@ -1122,68 +1465,38 @@ class TileMap:
             return 3
         return 4
 
-    def _load_tile_surfaces(self):
-        """Load 32x32 tile images from assets/tiles.
-
-        Expected filenames (as provided):
-        - grass.png
-        - PATH MAIN.png
-        - PATH EDGE LEFT.png / RIGHT / UP / DOWN
-        """
-        base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "assets", "tiles"))
-        names = {
-            "grass": "grass.png",
-            "path_main": "PATH MAIN.png",
-            "edge_left": "PATH EDGE LEFT.png",
-            "edge_right": "PATH EDGE RIGHT.png",
-            "edge_up": "PATH EDGE UP.png",
-            "edge_down": "PATH EDGE DOWN.png",
-        }
-
-        surfaces = {}
-        for key, filename in names.items():
-            path = os.path.join(base_dir, filename)
-            try:
-                img = pygame.image.load(path).convert_alpha()
-                if img.get_width() != TILE_SIZE or img.get_height() != TILE_SIZE:
-                    img = pygame.transform.scale(img, (TILE_SIZE, TILE_SIZE))
-                surfaces[key] = img
-            except Exception:
-                surfaces[key] = None
-
-        return surfaces
-
     def is_blocked(self, tx, ty):
-        if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
+        if tx < 0 or ty < 0 or tx >= self.width or ty >= self.height:
             return True
-        return self.tiles[ty][tx] == TILE_WALL
+        return self.grid.has_flag(tx, ty, FLAG_BLOCKED)
 
     def is_path(self, tx, ty):
-        tile = self.tiles[ty][tx]
-        return tile in (TILE_PATH, TILE_START, TILE_FINISH, TILE_CASTLE)
+        return self.grid.has_flag(tx, ty, FLAG_PATH)
     
 
     def is_buildable(self, x, y):
-        # Use TILES_X and TILES_Y instead of self.width / self.height
-        if x < 0 or y < 0 or x >= TILES_X or y >= TILES_Y:
-            return False
-        # Use self.tiles instead of self.grid
-        return self.tiles[y][x] == TILE_GRASS  # grass is buildable
+        return self.grid.has_flag(x, y, FLAG_BUILDABLE)  # grass is buildable
 
 
     def get_start_tile(self):
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
-                if self.tiles[y][x] == TILE_START:
-                    return (x, y)
-        return None
+        return self._find_first_tile(TILE_START)
 
     def _find_first_tile(self, tile_id: int):
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
+        # Start/finish/castle/shop/casino tiles never change after load, so
+        # their (row-major) first position is scanned once and remembered.
+        if tile_id in self._first_tile_cache:
+            return self._first_tile_cache[tile_id]
+        found = None
+        for y in range(self.height):
+            for x in range(self.width):
                 if self.tiles[y][x] == tile_id:
-                    return (x, y)
-        return None
+                    found = (x, y)
+                    break
+            if found is not None:
+                break
+        if tile_id not in (TILE_GRASS, TILE_PATH):
+            self._first_tile_cache[tile_id] = found
+        return found
 
     def get_shop_tile(self):
         return self._find_first_tile(TILE_SHOP)
@@ -1192,16 +1505,11 @@ class TileMap:
         return self._find_first_tile(TILE_CASINO)
 
     def get_finish_tile(self):
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
-                if self.tiles[y][x] == TILE_FINISH:
-                    return (x, y)
+        finish = self._find_first_tile(TILE_FINISH)
+        if finish is not None:
+            return finish
         # Fallback to castle if finish not explicitly set
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
-                if self.tiles[y][x] == TILE_CASTLE:
-                    return (x, y)
-        return None
+        return self._find_first_tile(TILE_CASTLE)
 
     def get_finish_center(self):
         finish = self.get_finish_tile()
@@ -1211,10 +1519,15 @@ class TileMap:
         return None
 
     def get_path_points(self):
+        if self._path_points is None:
+            self._path_points = self._compute_path_points()
+        return list(self._path_points)
+
+    def _compute_path_points(self):
         # Collect path-like tiles (PATH + FINISH; allow CASTLE as fallback)
         path_tiles = set()
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
+        for y in range(self.height):
+            for x in range(self.width):
                 tid = self.tiles[y][x]
                 if tid in (TILE_PATH, TILE_FINISH, TILE_CASTLE):
                     path_tiles.add((x, y))
@@ -1272,49 +1585,50 @@ class TileMap:
         return path_points
 
 
-    def draw(self, surface, *, player_bottom: int | None = None, offset: tuple[int, int] = (0, 0)):
-        ox, oy = offset
+    def _render_chunk(self, cx: int, cy: int) -> pygame.Surface:
+        """Render the ground layer (tiles, shading, trails, tower contrast) of one chunk."""
+        x0 = cx * CHUNK_TILES
+        y0 = cy * CHUNK_TILES
+        x1 = min(self.width, x0 + CHUNK_TILES)
+        y1 = min(self.height, y0 + CHUNK_TILES)
+        surface = pygame.Surface(((x1 - x0) * TILE_SIZE, (y1 - y0) * TILE_SIZE))
+        try:
+            surface = surface.convert()
+        except pygame.error:
+            pass
+        # The world surface is cleared to BG_COLOR before the map is drawn.
+        surface.fill(BG_COLOR)
+
         # Core path tiles (walkable). We will only widen visually by drawing
         # edge tiles onto adjacent grass, without changing the actual grid.
-        core_path_ids = {TILE_PATH, TILE_START, TILE_FINISH, TILE_CASTLE}
-
-        def is_core_path(tx, ty):
-            if tx < 0 or ty < 0 or tx >= TILES_X or ty >= TILES_Y:
-                return False
-            return self.tiles[ty][tx] in core_path_ids
+        # grid.neighbours holds which sides of each tile touch the core path.
+        neighbour_masks = self.grid.neighbours
 
         grass_img = self._tile_surfaces.get("grass")
         path_main_img = self._tile_surfaces.get("path_main")
 
-        for y in range(TILES_Y):
-            for x in range(TILES_X):
+        for y in range(y0, y1):
+            for x in range(x0, x1):
                 tile_id = self.tiles[y][x]
-                px = x * TILE_SIZE + ox
-                py = y * TILE_SIZE + oy
+                px = (x - x0) * TILE_SIZE
+                py = (y - y0) * TILE_SIZE
 
                 # Base tile rendering
                 if tile_id in (TILE_GRASS, TILE_SHOP, TILE_CASINO) and grass_img is not None:
                     shade_level = self._shade_level_for_tile(x, y)
                     # Visual widening: if a grass tile touches the core path, draw an edge tile.
-                    neighbors = {
-                        "right": is_core_path(x + 1, y),
-                        "left": is_core_path(x - 1, y),
-                        "down": is_core_path(x, y + 1),
-                        "up": is_core_path(x, y - 1),
-                    }
-                    touching = [k for k, v in neighbors.items() if v]
-
-                    if len(touching) == 1:
-                        side = touching[0]
+                    mask = neighbour_masks[y * self.width + x]
+
+                    if mask in (NEIGHBOUR_RIGHT, NEIGHBOUR_LEFT, NEIGHBOUR_DOWN, NEIGHBOUR_UP):
                         # Edge images are named by where the GRASS is.
                         # Example: if core path is on the right, we need grass on the left -> EDGE LEFT.
-                        if side == "right":
+                        if mask == NEIGHBOUR_RIGHT:
                             edge = self._tile_surfaces.get("edge_left")
                             shaded = (self._grass_shades.get("edge_left") or [])
-                        elif side == "left":
+                        elif mask == NEIGHBOUR_LEFT:
                             edge = self._tile_surfaces.get("edge_right")
                             shaded = (self._grass_shades.get("edge_right") or [])
-                        elif side == "down":
+                        elif mask == NEIGHBOUR_DOWN:
                             edge = self._tile_surfaces.get("edge_up")
                             shaded = (self._grass_shades.get("edge_up") or [])
                         else:  # up
@@ -1332,7 +1646,7 @@ class TileMap:
                                 surface.blit(shaded_grass[shade_level], (px, py))
                             else:
                                 surface.blit(grass_img, (px, py))
-                    elif len(touching) > 1 and path_main_img is not None:
+                    elif mask and path_main_img is not None:
                         # At corners/junctions, fill with main path to avoid incorrect edge orientation.
                         surface.blit(path_main_img, (px, py))
                     else:
@@ -1363,15 +1677,113 @@ class TileMap:
                     overlay = self._get_tower_contrast_surface(lvl)
                     surface.blit(overlay, (px, py))
 
+        return surface
+
+    def invalidate_chunks_around(self, tx: int, ty: int) -> None:
+        """Drop cached chunks whose ground look depends on tile (tx, ty)."""
+        for nx, ny in ((tx, ty), (tx + 1, ty), (tx - 1, ty), (tx, ty + 1), (tx, ty - 1)):
+            if 0 <= nx < self.width and 0 <= ny < self.height:
+                self._chunk_cache.pop((nx // CHUNK_TILES, ny // CHUNK_TILES), None)
+
+    def _chunk_range(self, surface, ox: float, oy: float, margin: int = 0) -> tuple[int, int, int, int]:
+        """Chunk columns/rows [cx0, cx1) x [cy0, cy1) covering the view (+ margin chunks)."""
+        chunk_px = CHUNK_TILES * TILE_SIZE
+        sw, sh = surface.get_size()
+        cols = (self.width + CHUNK_TILES - 1) // CHUNK_TILES
+        rows = (self.height + CHUNK_TILES - 1) // CHUNK_TILES
+        cx0 = max(0, int(-ox // chunk_px) - margin)
+        cy0 = max(0, int(-oy // chunk_px) - margin)
+        cx1 = min(cols, int((-ox + sw) // chunk_px) + 1 + margin)
+        cy1 = min(rows, int((-oy + sh) // chunk_px) + 1 + margin)
+        return cx0, cy0, cx1, cy1
+
+    def _get_chunk(self, cx: int, cy: int, limit: int) -> pygame.Surface:
+        cache = self._chunk_cache
+        surf = cache.get((cx, cy))
+        if surf is not None:
+            cache.move_to_end((cx, cy))
+            return surf
+        surf = self._render_chunk(cx, cy)
+        cache[(cx, cy)] = surf
+        while len(cache) > limit:
+            cache.popitem(last=False)
+        return surf
+
+    def _draw_ground(self, surface, ox: float, oy: float) -> None:
+        """Blit the cached ground chunks in view, building missing ones lazily."""
+        if self._chunk_cache_visual != self._visual_ready:
+            # Shading/trails just became available; rebuild with them.
+            self._chunk_cache.clear()
+            self._chunk_cache_visual = self._visual_ready
+
+        chunk_px = CHUNK_TILES * TILE_SIZE
+        cx0, cy0, cx1, cy1 = self._chunk_range(surface, ox, oy)
+        limit = max(CHUNK_CACHE_LIMIT, 2 * (cx1 - cx0 + 2) * (cy1 - cy0 + 2))
+        # Snap once per frame (blit truncates fractional positions) so every
+        # chunk, and every tile inside it, lands on the same pixel grid.
+        ix = math.floor(ox)
+        iy = math.floor(oy)
+        for cy in range(cy0, cy1):
+            for cx in range(cx0, cx1):
+                surface.blit(self._get_chunk(cx, cy, limit), (cx * chunk_px + ix, cy * chunk_px + iy))
+
+        # Streaming: pre-build at most one chunk per frame in the ring just
+        # outside the view, so the camera rarely has to wait for one.
+        rx0, ry0, rx1, ry1 = self._chunk_range(surface, ox, oy, margin=1)
+        for cy in range(ry0, ry1):
+            for cx in range(rx0, rx1):
+                if (cx, cy) not in self._chunk_cache:
+                    self._get_chunk(cx, cy, limit)
+                    return
+
+    def _visible_decor(self, surface, ox: float, oy: float) -> tuple[list[int], list[int]]:
+        """Indices (in draw order) of small decor / trees anchored near the view."""
+        if self._decor_buckets_src is not self._decor:
+            chunk_px = CHUNK_TILES * TILE_SIZE
+            buckets: dict[tuple[int, int], tuple[list[int], list[int]]] = {}
+            for i, d in enumerate(self._decor.get("small", [])):
+                key = (int(d.get("x", 0)) // chunk_px, int(d.get("y", 0)) // chunk_px)
+                buckets.setdefault(key, ([], []))[0].append(i)
+            for i, t in enumerate(self._decor.get("trees", [])):
+                key = (int(t["base_x"]) // chunk_px, int(t["base_y"]) // chunk_px)
+                buckets.setdefault(key, ([], []))[1].append(i)
+            self._decor_buckets = buckets
+            self._decor_buckets_src = self._decor
+
+        # Sprites reach at most one chunk away from their anchor.
+        cx0, cy0, cx1, cy1 = self._chunk_range(surface, ox, oy, margin=1)
+        small: list[int] = []
+        trees: list[int] = []
+        for key, (s_idx, t_idx) in self._decor_buckets.items():
+            if cx0 <= key[0] < cx1 and cy0 <= key[1] < cy1:
+                small.extend(s_idx)
+                trees.extend(t_idx)
+        small.sort()
+        trees.sort()
+        return small, trees
+
+    def draw(self, surface, *, player_bottom: int | None = None, offset: tuple[int, int] = (0, 0)):
+        # Build visual layers on first draw, unless a background build is still
+        # running; then this frame uses plain tiles instead of waiting on it.
+        if not self._visual_layers_pending():
+            self.ensure_visual_layers()
+        ox, oy = offset
+        self._draw_ground(surface, ox, oy)
+        small_idx, tree_idx = self._visible_decor(surface, ox, oy)
+        small_decor = self._decor.get("small", [])
+        trees = self._decor.get("trees", [])
+
         # Decorations (always behind player)
-        for d in self._decor.get("small", []):
+        for i in small_idx:
+            d = small_decor[i]
             img = d.get("img")
             if img is None:
                 continue
             surface.blit(img, (d.get("x", 0) + ox, d.get("y", 0) + oy))
 
         # Tree shadows (always on ground, behind player)
-        for t in self._decor.get("trees", []):
+        for i in tree_idx:
+            t = trees[i]
             shadow = t.get("shadow")
             if shadow is None:
                 # Fallback: ellipse shadow sized to the tree.
@@ -1410,7 +1822,8 @@ class TileMap:
             castle_base_y_world = int(castle_rect.bottom - oy)
 
         # Trees behind player (or all trees if player_bottom not provided): PART 1 (behind castle)
-        for t in self._decor.get("trees", []):
+        for i in tree_idx:
+            t = trees[i]
             base_y = int(t["base_y"])
             if player_bottom is not None and player_bottom < base_y:
                 continue
@@ -1429,7 +1842,8 @@ class TileMap:
             surface.blit(self._castle_surface, castle_rect.topleft)
 
         # Trees behind player: PART 2 (in front of castle)
-        for t in self._decor.get("trees", []):
+        for i in tree_idx:
+            t = trees[i]
             base_y = int(t["base_y"])
             if player_bottom is not None and player_bottom < base_y:
                 continue
@@ -1445,16 +1859,16 @@ class TileMap:
         # Grid overlay - only draw if SHOW_GRID is enabled
         import settings
         if settings.SHOW_GRID:
-            for x in range(TILES_X + 1):
+            for x in range(self.width + 1):
                 pygame.draw.line(
                     surface, (60, 60, 60),
                     (x * TILE_SIZE + ox, 0 + oy),
-                    (x * TILE_SIZE + ox, SCREEN_HEIGHT + oy), 1
+                    (x * TILE_SIZE + ox, self.height * TILE_SIZE + oy), 1
                 )
 
-            for y in range(TILES_Y + 1):
+            for y in range(self.height + 1):
                 pygame.draw.line(
                     surface, (60, 60, 60),
                     (0 + ox, y * TILE_SIZE + oy),
-                    (SCREEN_WIDTH + ox, y * TILE_SIZE + oy), 1
+                    (self.width * TILE_SIZE + ox, y * TILE_SIZE + oy), 1
                 )
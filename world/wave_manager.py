@@ -1,17 +1,32 @@
 import pygame
-from entities.enemy import Enemy
+from entities.enemy import spawn_enemy
+from world.endless import endless_wave
+from world.systems import enemy_count
+from world.wave_script import DEFAULT_WAVE_SCRIPT, compile_wave, load_wave_script, wave_art
 
 class WaveManager:
-    def __init__(self, tilemap):
+    def __init__(self, tilemap, waves: list[dict] | None = None, *, endless: bool = False):
         self.tilemap = tilemap
         self.path_points = tilemap.get_path_points()
 
+        # Wave definitions (see world/wave_script.py); default: waves/default.json.
+        if waves is None:
+            waves = load_wave_script(DEFAULT_WAVE_SCRIPT, fallback=None)
+            if waves is None:
+                raise ValueError(f"Invalid wave script: {DEFAULT_WAVE_SCRIPT}")
+        self.waves = waves
+        # Endless mode keeps generating waves after the script runs out.
+        self.endless = endless
+
         self.current_wave = 0
-        # Assets exist for waves 1-5.
-        self.max_waves = 5
+        self.max_waves = len(self.waves)
         self.wave_index = 0
-        self.spawn_timer = 0.0
-        self.spawn_delay = 1.8  # seconds between enemies
+
+        # Spawn timeline of the current wave, consumed with a cursor.
+        self.timeline = []
+        self.wave_time = 0.0
+        self._cursor = 0
+        self._art = 1
 
         self.enemies_to_spawn = 0
         self.spawning = False  # Are we currently spawning enemies?
@@ -26,49 +41,52 @@ class WaveManager:
     def start_wave(self, wave_num):
         self.current_wave = wave_num
         self.wave_index = wave_num - 1
-        
-        # Increase difficulty per wave and vary based on wave type
-        if wave_num == 1:
-            enemy_count = 20  # Wave 1: 10 standard enemies
+        if wave_num <= len(self.waves):
+            wave = self.waves[self.wave_index]
         else:
-            enemy_count = 25 + self.wave_index * 5  # Waves 2-5: 17, 22, 27, 32
-        
-        # Add 1 for the boss at the end
-        self.enemies_to_spawn = enemy_count + 1
-        self.spawn_timer = 0.0
-        self.spawning = True
+            wave = endless_wave(self.waves, wave_num)
+
+        # Compile the wave once; update() then only touches due events.
+        self.timeline = compile_wave(wave, wave_num)
+        self.wave_time = 0.0
+        self._cursor = 0
+        self._art = wave_art(wave, wave_num)
+
+        self.enemies_to_spawn = len(self.timeline)
+        self.spawning = self.enemies_to_spawn > 0
         self.wave_finished = False
         self.show_announcement = True
         self.announcement_timer = 0.0
         
         # Set announcement text
-        if wave_num == 1:
-            self.announcement_text = "WAVE 1 - GET READY!"
-        else:
-            self.announcement_text = f"WAVE {wave_num} - INCOMING!"
+        self.announcement_text = wave.get("announcement") or f"WAVE {wave_num} - INCOMING!"
 
-    def update(self, dt, enemies):
+    def update(self, dt, world):
         # Update announcement
         if self.show_announcement:
             self.announcement_timer += dt
             if self.announcement_timer >= self.announcement_duration:
                 self.show_announcement = False
         
-        # Spawn enemies
+        # Spawn every event that is due (several per tick at high spawn rates).
         if self.spawning:
+            self.wave_time += dt
+            timeline = self.timeline
+            i = self._cursor
+            while i < len(timeline) and timeline[i].time <= self.wave_time:
+                self.spawn_enemy(timeline[i], world)
+                i += 1
+            self._cursor = i
+            self.enemies_to_spawn = len(timeline) - i
             if self.enemies_to_spawn <= 0:
                 self.spawning = False
-                return
-
-            self.spawn_timer += dt
-            if self.spawn_timer >= self.spawn_delay:
-                self.spawn_timer = 0.0
-                self.spawn_enemy(enemies)
-                self.enemies_to_spawn -= 1
     
-    def check_wave_complete(self, enemies):
+    def has_next_wave(self):
+        return self.endless or self.current_wave < self.max_waves
+
+    def check_wave_complete(self, world):
         """Check if wave is complete: all enemies spawned, and either all died or reached castle"""
-        if not self.spawning and len(enemies) == 0:
+        if not self.spawning and enemy_count(world) == 0:
             self.wave_finished = True
             return True
         return False
@@ -78,79 +96,13 @@ class WaveManager:
         """Returns True if announcement is showing or wave is still spawning/active"""
         return self.show_announcement or self.spawning
 
-    def spawn_enemy(self, enemies):
-        # Check if this is the last enemy to spawn (the boss)
-        is_boss = (self.enemies_to_spawn == 1)
-        
-        if is_boss:
-            # Spawn boss enemy
-            # Boss gets progressively stronger with each wave
-            wave_num = self.current_wave
-            
-            # Base stats for boss
-            health = 500 + (wave_num - 1) * 300  # 500, 800, 1100, 1400, 1700
-            # Nerf specific bosses that are currently too tanky.
-            if wave_num == 1:
-                health = 350
-            elif wave_num == 4:
-                health = 1000
-            reward = 100 + (wave_num - 1) * 50  # 100, 150, 200, 250, 300
-            speed = 0.5  # Base speed
-            
-            # Last 2 waves (waves 4 and 5) have faster bosses
-            if wave_num >= 4:
-                speed = 1.2 + (wave_num - 4) * 0.3  # 1.2, 1.5
-            
-            enemies.append(
-                Enemy(
-                    path_points=self.path_points,
-                    health=health,
-                    speed=speed,
-                    reward=reward,
-                    enemy_type="boss",
-                    wave_num=self.current_wave,
-                )
-            )
-        elif self.current_wave == 1:
-            # Wave 1: Standard enemies
-            health = 100
-            speed = 1.0
-            reward = 10
-            enemy_type = "standard"
-            enemies.append(
-                Enemy(
-                    path_points=self.path_points,
-                    health=health,
-                    speed=speed,
-                    reward=reward,
-                    enemy_type=enemy_type,
-                    wave_num=self.current_wave,
-                )
-            )
-        else:
-            # Waves 2-5: Mix of fast weak and slow strong enemies
-            enemy_index = (len(enemies) - (self.enemies_to_spawn - 1)) % 3
-            
-            if enemy_index == 0:
-                # Fast weak enemies (1 out of 3)
-                health = 60 + self.wave_index * 10  # 70,80,90,100
-                speed = 2.0 + self.wave_index * 0.4  # 2.4,2.8,3.2,3.6 (faster)
-                reward = 15
-                enemy_type = "fast_weak"
-            else:
-                # Slow strong enemies (2 out of 3)
-                health = 150 + self.wave_index * 50  # 200,250,300,350
-                speed = 0.6 + self.wave_index * 0.1  # 0.7,0.8,0.9,1.0 (slower)
-                reward = 20
-                enemy_type = "slow_strong"
-            
-            enemies.append(
-                Enemy(
-                    path_points=self.path_points,
-                    health=health,
-                    speed=speed,
-                    reward=reward,
-                    enemy_type=enemy_type,
-                    wave_num=self.current_wave,
-                )
-            )
+    def spawn_enemy(self, event, world):
+        spawn_enemy(
+            world,
+            path_points=self.path_points,
+            health=event.health,
+            speed=event.speed,
+            reward=event.reward,
+            enemy_type=event.enemy_type,
+            wave_num=event.art or self._art,
+        )
@@ -0,0 +1,140 @@
+"""Data-driven wave definitions compiled into spawn timelines.
+
+A wave script is JSON (see waves/default.json):
+
+    {"version": 1, "waves": [
+        {"announcement": "WAVE 1 - GET READY!",
+         "enemies": {"standard": {"health": 100, "speed": 1.0, "reward": 10}, ...},
+         "groups": [{"pattern": ["standard"], "count": 20, "delay": 1.8, "interval": 1.8,
+                     "lane": 0, "health": ..., "speed": ..., "reward": ...}],
+         "boss": {"type": "boss", "delay": 1.8}},
+        ...]}
+
+Each group spawns `count` enemies `interval` seconds apart, cycling through
+`pattern` (enemy types whose stats come from `enemies`; a group may
+override health/speed/reward). Groups on the same `lane` run one after the
+other, each starting `delay` seconds after the previous one's last spawn;
+different lanes run in parallel from the start of the wave. The optional
+boss spawns `delay` seconds after the last regular spawn. `art` picks the
+enemy sprite set (assets/BOSSES AND ENEMIES/WAVE <art>) and defaults to the
+wave number; a group or the boss may set its own `art` to mix sets.
+
+`compile_wave` flattens a wave into a list of SpawnEvents sorted by time,
+which WaveManager walks with a cursor.
+"""
+import json
+import os
+from dataclasses import dataclass
+
+
+WAVES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "waves")
+DEFAULT_WAVE_SCRIPT = os.path.join(WAVES_DIR, "default.json")
+WAVE_SCRIPT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class SpawnEvent:
+    time: float  # seconds after the wave started
+    enemy_type: str
+    health: int | float
+    speed: float
+    reward: int
+    art: int | None = None  # sprite set; None = the wave's own
+
+
+def wave_script_path_for(level_path: str) -> str:
+    """`levels/foo.json` -> `levels/foo.waves.json` (optional per-level waves)."""
+    return os.path.splitext(level_path)[0] + ".waves.json"
+
+
+def _validate(script) -> list[dict]:
+    if not isinstance(script, dict) or script.get("version") != WAVE_SCRIPT_VERSION:
+        raise ValueError("unsupported wave script version")
+    waves = script.get("waves")
+    if not isinstance(waves, list) or not waves:
+        raise ValueError("wave script has no waves")
+    for wave_num, wave in enumerate(waves, start=1):
+        # Compiling checks every field the timeline needs.
+        compile_wave(wave, wave_num)
+    return waves
+
+
+def load_wave_script(path: str, *, fallback: list[dict] | None) -> list[dict] | None:
+    """Load and validate a wave script; returns `fallback` if missing/invalid."""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return _validate(json.load(file))
+    except (OSError, ValueError, TypeError, KeyError):
+        return fallback
+
+
+def wave_art(wave: dict, wave_num: int) -> int:
+    return int(wave.get("art", wave_num))
+
+
+def enemy_types_by_wave(waves: list[dict]) -> dict[int, tuple[str, ...]]:
+    """Enemy types used per sprite set, in first-use order (for preloading)."""
+    out: dict[int, list[str]] = {}
+    for wave_num, wave in enumerate(waves, start=1):
+        art = wave_art(wave, wave_num)
+        for group in wave.get("groups", []):
+            types = out.setdefault(int(group.get("art", art)), [])
+            for enemy_type in group.get("pattern") or [group["type"]]:
+                if enemy_type not in types:
+                    types.append(enemy_type)
+        boss = wave.get("boss")
+        if boss:
+            types = out.setdefault(int(boss.get("art", art)), [])
+            if boss.get("type", "boss") not in types:
+                types.append(boss.get("type", "boss"))
+    return {art: tuple(types) for art, types in sorted(out.items())}
+
+
+def _stats(wave: dict, group: dict, enemy_type: str) -> tuple[int | float, float, int]:
+    base = wave.get("enemies", {}).get(enemy_type, {})
+    health = group.get("health", base.get("health"))
+    speed = group.get("speed", base.get("speed"))
+    reward = group.get("reward", base.get("reward", 0))
+    if not isinstance(health, (int, float)) or not isinstance(speed, (int, float)):
+        raise ValueError(f"no stats for enemy type {enemy_type!r}")
+    # Health stays an int when the script gives one (it is shown in the UI).
+    return health, float(speed), int(reward)
+
+
+def compile_wave(wave: dict, wave_num: int) -> list[SpawnEvent]:
+    """Flatten one wave definition into spawn events sorted by time."""
+    events: list[tuple[float, int, SpawnEvent]] = []
+    lane_end: dict[int, float] = {}
+    last_time = 0.0
+
+    for group in wave.get("groups", []):
+        pattern = group.get("pattern") or [group["type"]]
+        count = int(group.get("count", 1))
+        interval = float(group.get("interval", 1.0))
+        lane = int(group.get("lane", 0))
+        if count < 0 or interval < 0:
+            raise ValueError(f"wave {wave_num}: negative count/interval")
+        stats = {enemy_type: _stats(wave, group, enemy_type) for enemy_type in set(pattern)}
+        art = int(group["art"]) if "art" in group else None
+
+        start = lane_end.get(lane, 0.0) + float(group.get("delay", interval))
+        t = start
+        for k in range(count):
+            t = start + k * interval
+            enemy_type = pattern[k % len(pattern)]
+            health, speed, reward = stats[enemy_type]
+            # The sequence number keeps same-time spawns in script order.
+            events.append((t, len(events), SpawnEvent(t, enemy_type, health, speed, reward, art)))
+            last_time = max(last_time, t)
+        lane_end[lane] = t
+
+    boss = wave.get("boss")
+    if boss:
+        enemy_type = boss.get("type", "boss")
+        health, speed, reward = _stats(wave, boss, enemy_type)
+        art = int(boss["art"]) if "art" in boss else None
+        t = last_time + float(boss.get("delay", 0.0))
+        events.append((t, len(events), SpawnEvent(t, enemy_type, health, speed, reward, art)))
+
+    events.sort(key=lambda item: (item[0], item[1]))
+    return [event for _t, _seq, event in events]